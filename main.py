@@ -12,7 +12,15 @@ from pydantic import ValidationError
 
 from src.infrastructure.persistence.event_store import EventStore
 from src.infrastructure.persistence.read_model_repository import ReadModelRepository
+from src.infrastructure.persistence.snapshot_store import SnapshotStore, EveryNEventsPolicy
+from src.infrastructure.persistence.idempotency_store import IdempotencyStore
+from src.infrastructure.persistence.checkpoint_store import ProjectionCheckpointStore
+from src.infrastructure.persistence.rollup_repository import StockRollupRepository
+from src.infrastructure.persistence.columnar_read_model import ColumnarReadModel, NUMPY_AVAILABLE
+from src.infrastructure.persistence.threshold_registry import ThresholdRegistry
+from src.infrastructure.persistence.low_stock_index import LowStockIndex
 from src.infrastructure.cache.in_memory_cache import InMemoryCache
+from src.infrastructure.cache.aggregate_cache import AggregateCache
 from src.infrastructure.messaging.event_bus import EventBus
 from src.infrastructure.resilience.circuit_breaker import CircuitBreaker
 
@@ -20,9 +28,17 @@ from src.application.commands.add_stock import AddStockHandler
 from src.application.commands.reserve_stock import ReserveStockHandler
 from src.application.commands.commit_reservation import CommitReservationHandler
 from src.application.commands.release_reservation import ReleaseReservationHandler
+from src.application.commands.set_stock_threshold import SetStockThresholdHandler
+from src.application.projections.inventory_projection import InventoryProjection
+from src.application.projections.projection_runner import ProjectionRunner
+from src.application.projections.rollup_projection import StockRollupProjection
 from src.application.queries.get_stock import GetStockHandler
 from src.application.queries.check_availability import CheckAvailabilityHandler
 from src.application.queries.get_product_inventory import GetProductInventoryHandler
+from src.application.queries.get_store_inventory import GetStoreInventoryHandler
+from src.application.queries.get_stock_rollup import GetStockRollupHandler
+from src.application.queries.get_stock_analytics import GetStockAnalyticsHandler
+from src.application.queries.get_low_stock import GetLowStockHandler
 from src.application.services.inventory_service import InventoryService
 
 from src.presentation.api.v1.endpoints import inventory, health
@@ -53,8 +69,21 @@ async def lifespan(app: FastAPI):
     
     # Initialize infrastructure
     event_store = EventStore()
-    read_model_repo = ReadModelRepository()
+    read_model_repo = ReadModelRepository(flush_interval=0.5, checkpoint_threshold=10000)
+    await read_model_repo.start()
+    rollup_repo = StockRollupRepository()
+    # Columnar copy of the read model for analytics, when numpy is installed
+    columnar = None
+    if NUMPY_AVAILABLE:
+        columnar = ColumnarReadModel()
+        columnar.load(await read_model_repo.get_all_inventory())
+    threshold_registry = ThresholdRegistry()
+    low_stock_index = LowStockIndex(threshold_registry)
+    low_stock_index.load(await read_model_repo.get_all_inventory())
+    snapshot_store = SnapshotStore(policy=EveryNEventsPolicy(every_n_events=100))
     cache = InMemoryCache(default_ttl=30)
+    aggregate_cache = AggregateCache(max_size=10000)
+    idempotency_store = IdempotencyStore(ttl_seconds=24 * 3600, max_entries=100_000)
     event_bus = EventBus()
     
     # Setup event handlers to invalidate cache
@@ -65,6 +94,7 @@ async def lifespan(app: FastAPI):
         # Invalidate cache
         cache_key = f"stock:{event.product_id}:{event.store_id}"
         await cache.delete(cache_key)
+        await cache.delete(f"store_inventory:{event.store_id}")
         logger.info("cache_invalidated", event_type="StockAdded")
     
     async def invalidate_cache_on_stock_reserved(event):
@@ -74,6 +104,7 @@ async def lifespan(app: FastAPI):
         # Invalidate cache
         cache_key = f"stock:{event.product_id}:{event.store_id}"
         await cache.delete(cache_key)
+        await cache.delete(f"store_inventory:{event.store_id}")
         logger.info("cache_invalidated", event_type="StockReserved")
     
     async def invalidate_cache_on_reservation_committed(event):
@@ -83,6 +114,7 @@ async def lifespan(app: FastAPI):
         # Invalidate cache
         cache_key = f"stock:{event.product_id}:{event.store_id}"
         await cache.delete(cache_key)
+        await cache.delete(f"store_inventory:{event.store_id}")
         logger.info("cache_invalidated", event_type="ReservationCommitted")
     
     async def invalidate_cache_on_reservation_released(event):
@@ -92,6 +124,7 @@ async def lifespan(app: FastAPI):
         # Invalidate cache
         cache_key = f"stock:{event.product_id}:{event.store_id}"
         await cache.delete(cache_key)
+        await cache.delete(f"store_inventory:{event.store_id}")
         logger.info("cache_invalidated", event_type="ReservationReleased")
     
     # Subscribe to events
@@ -103,16 +136,54 @@ async def lifespan(app: FastAPI):
     logger.info("event_handlers_registered", 
                handlers=["StockAdded", "StockReserved", "ReservationCommitted", "ReservationReleased"])
     
+    # Project committed events into the read model in the background;
+    # events reach the bus once projected
+    projection_runner = ProjectionRunner(
+        event_store,
+        [
+            InventoryProjection(read_model_repo, columnar, low_stock_index),
+            StockRollupProjection(rollup_repo),
+        ],
+        ProjectionCheckpointStore(),
+        event_bus,
+        batch_size=500,
+        poll_interval=1.0
+    )
+    await projection_runner.start()
+    app.state.projection_runner = projection_runner
+    
     # Initialize command handlers
-    add_stock_handler = AddStockHandler(event_store, read_model_repo, event_bus)
-    reserve_stock_handler = ReserveStockHandler(event_store, read_model_repo, event_bus)
-    commit_handler = CommitReservationHandler(event_store, read_model_repo, event_bus)
-    release_handler = ReleaseReservationHandler(event_store, read_model_repo, event_bus)
+    add_stock_handler = AddStockHandler(
+        event_store, read_model_repo, event_bus, snapshot_store, aggregate_cache,
+        idempotency_store, projection_runner
+    )
+    reserve_stock_handler = ReserveStockHandler(
+        event_store, read_model_repo, event_bus, snapshot_store, aggregate_cache,
+        idempotency_store, projection_runner
+    )
+    commit_handler = CommitReservationHandler(
+        event_store, read_model_repo, event_bus, snapshot_store, aggregate_cache,
+        idempotency_store, projection_runner
+    )
+    release_handler = ReleaseReservationHandler(
+        event_store, read_model_repo, event_bus, snapshot_store, aggregate_cache,
+        idempotency_store, projection_runner
+    )
+    
+    set_threshold_handler = SetStockThresholdHandler(
+        threshold_registry, low_stock_index, read_model_repo
+    )
     
     # Initialize query handlers
     get_stock_handler = GetStockHandler(read_model_repo, cache)
     check_availability_handler = CheckAvailabilityHandler(read_model_repo)
     get_product_inventory_handler = GetProductInventoryHandler(read_model_repo, cache)
+    get_store_inventory_handler = GetStoreInventoryHandler(read_model_repo, cache)
+    get_stock_rollup_handler = GetStockRollupHandler(rollup_repo)
+    stock_analytics_handler = (
+        GetStockAnalyticsHandler(columnar) if columnar is not None else None
+    )
+    low_stock_handler = GetLowStockHandler(low_stock_index)
     
     # Initialize service
     inventory_service = InventoryService(
@@ -122,7 +193,12 @@ async def lifespan(app: FastAPI):
         release_handler,
         get_stock_handler,
         check_availability_handler,
-        get_product_inventory_handler
+        get_product_inventory_handler,
+        get_store_inventory_handler,
+        get_stock_rollup_handler,
+        stock_analytics_handler,
+        set_threshold_handler,
+        low_stock_handler
     )
     
     # Set service in endpoint module
@@ -130,6 +206,10 @@ async def lifespan(app: FastAPI):
     
     logger.info("application_started")
     yield
+    await projection_runner.stop()
+    await read_model_repo.stop()
+    await rollup_repo.stop()
+    await event_store.close()
     logger.info("application_shutdown")
 
 
@@ -214,6 +214,9 @@ async def initialize_sample_data():
         
         inventory_data[product["name"]] = product_inventory
     
+    # Persist the in-memory read model
+    await read_model_repo.checkpoint()
+    
     print()
     print("=" * 70)
     print("✅ INICIALIZAÇÃO COMPLETA!")
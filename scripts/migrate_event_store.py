@@ -0,0 +1,58 @@
+"""
+Migrate an event store directory to the append-only JSON Lines format.
+
+Every legacy ``<aggregate>.json`` array file is rewritten once as a
+``<aggregate>.jsonl`` segment (one event per line). The conversion runs
+aggregate by aggregate, so it can be re-run safely after an interruption.
+
+With ``--shard-depth`` segments are also moved into hash-prefixed
+subdirectories (e.g. ``ab/cd/<aggregate>.jsonl``). Relocation is online:
+a running store with the same shard depth keeps serving every stream.
+
+Usage:
+    python scripts/migrate_event_store.py [--path ./data/events] [--shard-depth 2]
+"""
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.infrastructure.persistence.event_store import EventStore
+
+
+async def migrate(storage_path: str, shard_depth: int = 0) -> None:
+    """Convert legacy event files under storage_path and apply the shard layout."""
+    event_store = EventStore(storage_path, shard_depth=shard_depth)
+    
+    print(f"Migrating legacy event files in {storage_path}...")
+    migrated = await event_store.migrate_legacy_files()
+    print(f"  ✓ {migrated} aggregate(s) converted to JSON Lines segments")
+    
+    if shard_depth:
+        moved = await event_store.relocate_streams()
+        print(f"  ✓ {moved} stream(s) moved into a {shard_depth}-level shard layout")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--path",
+        default="./data/events",
+        help="Event store directory (default: ./data/events)",
+    )
+    parser.add_argument(
+        "--shard-depth",
+        type=int,
+        default=0,
+        help="Hash-prefix directory levels for segments (default: 0, flat)",
+    )
+    args = parser.parse_args()
+    asyncio.run(migrate(args.path, args.shard_depth))
+
+
+if __name__ == "__main__":
+    main()
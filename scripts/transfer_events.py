@@ -0,0 +1,119 @@
+"""
+Stream events out of and into an event store.
+
+``export`` pages through the global log and writes every event as NDJSON
+(``--format json``) or binary codec records (``--format binary``) in
+bounded memory. ``import`` reads such a stream back and appends it to a
+store in batches, one append per aggregate run, without replaying
+commands. The target can be either store implementation, so this also
+moves data between the file and SQLite backends.
+
+Usage:
+    python scripts/transfer_events.py export --output events.ndjson [--path ./data/events]
+    python scripts/transfer_events.py import --input events.ndjson --backend sqlite --path ./data/events.db
+"""
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.infrastructure.persistence.codecs import get_codec
+from src.infrastructure.persistence.event_store import EventStore
+from src.infrastructure.persistence.event_transfer import export_events, import_events
+from src.infrastructure.persistence.sqlite_event_store import SqliteEventStore
+
+
+def open_store(backend: str, path: str, store_codec: str, bulk: bool = False):
+    """Open the event store to read from or write to."""
+    if backend == "sqlite":
+        return SqliteEventStore(path)
+    # Bulk imports coalesce their fsyncs through group commit
+    return EventStore(path, codec=get_codec(store_codec), group_commit=bulk)
+
+
+def report(action: str, count: int, started: float) -> None:
+    """Print event count and throughput."""
+    elapsed = time.perf_counter() - started
+    rate = count / elapsed if elapsed > 0 else 0.0
+    print(f"  ✓ {action} {count} event(s) in {elapsed:.1f}s ({rate:,.0f} events/s)", file=sys.stderr)
+
+
+async def run_export(args: argparse.Namespace) -> None:
+    """Export the global log of a store."""
+    event_store = open_store(args.backend, args.path, args.store_codec)
+    output = sys.stdout.buffer if args.output == "-" else open(args.output, "wb")
+    started = time.perf_counter()
+    try:
+        count = await export_events(event_store, output, get_codec(args.format), args.batch_size)
+    finally:
+        if output is not sys.stdout.buffer:
+            output.close()
+        await event_store.close()
+    report("exported", count, started)
+
+
+async def run_import(args: argparse.Namespace) -> None:
+    """Import an export stream into a store."""
+    event_store = open_store(args.backend, args.path, args.store_codec, bulk=True)
+    source = sys.stdin.buffer if args.input == "-" else open(args.input, "rb")
+    started = time.perf_counter()
+    try:
+        count = await import_events(event_store, source, get_codec(args.format), args.batch_size)
+    finally:
+        if source is not sys.stdin.buffer:
+            source.close()
+        await event_store.close()
+    report("imported", count, started)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    
+    for name, stream_arg, stream_help in (
+        ("export", "--output", "File to write ('-' for stdout)"),
+        ("import", "--input", "File to read ('-' for stdin)"),
+    ):
+        subparser = subparsers.add_parser(name)
+        subparser.add_argument(stream_arg, required=True, help=stream_help)
+        subparser.add_argument(
+            "--format",
+            choices=["json", "binary"],
+            default="json",
+            help="Stream format (default: json, i.e. NDJSON)",
+        )
+        subparser.add_argument(
+            "--backend",
+            choices=["files", "sqlite"],
+            default="files",
+            help="Event store implementation (default: files)",
+        )
+        subparser.add_argument(
+            "--path",
+            default="./data/events",
+            help="Event store directory or SQLite database (default: ./data/events)",
+        )
+        subparser.add_argument(
+            "--store-codec",
+            choices=["json", "binary"],
+            default="json",
+            help="Record format of a files backend (default: json)",
+        )
+        subparser.add_argument(
+            "--batch-size",
+            type=int,
+            default=5000,
+            help="Events per read/append batch (default: 5000)",
+        )
+    
+    args = parser.parse_args()
+    asyncio.run(run_export(args) if args.command == "export" else run_import(args))
+
+
+if __name__ == "__main__":
+    main()
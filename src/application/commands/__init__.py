@@ -3,6 +3,7 @@ from .add_stock import AddStockCommand, AddStockHandler
 from .reserve_stock import ReserveStockCommand, ReserveStockHandler
 from .commit_reservation import CommitReservationCommand, CommitReservationHandler
 from .release_reservation import ReleaseReservationCommand, ReleaseReservationHandler
+from .set_stock_threshold import SetStockThresholdCommand, SetStockThresholdHandler
 
 __all__ = [
     "AddStockCommand",
@@ -13,4 +14,6 @@ __all__ = [
     "CommitReservationHandler",
     "ReleaseReservationCommand",
     "ReleaseReservationHandler",
+    "SetStockThresholdCommand",
+    "SetStockThresholdHandler",
 ]
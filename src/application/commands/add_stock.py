@@ -1,12 +1,20 @@
 """Add Stock command and handler"""
-from dataclasses import dataclass
+import hashlib
+import json
+from dataclasses import asdict, dataclass
+from typing import Any, Awaitable, Callable, List, Optional
 from uuid import UUID
 
 from ...domain.entities.inventory import Inventory
 from ...domain.value_objects.stock_quantity import StockQuantity
+from ...domain.exceptions.inventory_exceptions import ConcurrencyError
+from ...infrastructure.cache.aggregate_cache import AggregateCache
 from ...infrastructure.persistence.event_store import EventStore
+from ...infrastructure.persistence.idempotency_store import IdempotencyStore
 from ...infrastructure.persistence.read_model_repository import ReadModelRepository
+from ...infrastructure.persistence.snapshot_store import SnapshotStore
 from ...infrastructure.messaging.event_bus import EventBus
+from ..projections.projection_runner import ProjectionRunner
 
 
 @dataclass
@@ -16,6 +24,7 @@ class AddStockCommand:
     store_id: UUID
     quantity: int
     reason: str
+    idempotency_key: Optional[str] = None
 
 
 class AddStockHandler:
@@ -25,11 +34,19 @@ class AddStockHandler:
         self,
         event_store: EventStore,
         read_model_repo: ReadModelRepository,
-        event_bus: EventBus
+        event_bus: EventBus,
+        snapshot_store: Optional[SnapshotStore] = None,
+        aggregate_cache: Optional[AggregateCache] = None,
+        idempotency_store: Optional[IdempotencyStore] = None,
+        projection_runner: Optional[ProjectionRunner] = None
     ):
         self.event_store = event_store
         self.read_model_repo = read_model_repo
         self.event_bus = event_bus
+        self.snapshot_store = snapshot_store
+        self.aggregate_cache = aggregate_cache
+        self.idempotency_store = idempotency_store
+        self.projection_runner = projection_runner
     
     async def handle(self, command: AddStockCommand) -> None:
         """
@@ -38,52 +55,151 @@ class AddStockHandler:
         Args:
             command: AddStockCommand instance
         """
-        # Load aggregate
+        await self._run_idempotent(command, lambda: self._add_stock(command))
+    
+    async def _add_stock(self, command: AddStockCommand) -> None:
+        """Execute add stock command"""
+        # Load aggregate (reconstructed or created)
         aggregate_id = f"{command.product_id}:{command.store_id}"
-        events = await self.event_store.load_events(aggregate_id)
-        
-        # Reconstruct or create inventory
-        if events:
-            inventory = self._rebuild_from_events(events, command.product_id, command.store_id)
-        else:
-            inventory = Inventory(
-                product_id=command.product_id,
-                store_id=command.store_id
-            )
+        inventory = await self._load_inventory(
+            aggregate_id, command.product_id, command.store_id
+        )
         
         # Execute domain logic
         inventory.add_stock(command.quantity, command.reason)
         
         # Save events
-        new_events = inventory.clear_events()
-        await self.event_store.append_events(
-            aggregate_id,
-            new_events,
-            inventory.version - len(new_events)
-        )
+        new_events = await self._save_events(aggregate_id, inventory)
+        
+        # Update read model and notify subscribers
+        await self._project(inventory, new_events)
+    
+    async def _project(self, inventory: Inventory, new_events: List) -> None:
+        """
+        Propagate appended events to the read side.
+        
+        With a projection runner the read model and event subscribers
+        are fed from the event store in the background, so the runner is
+        only woken up; otherwise both are updated inline.
+        """
+        if self.projection_runner is not None:
+            self.projection_runner.notify()
+            return
         
         # Update read model
-        self.read_model_repo.update_stock(
-            command.product_id,
-            command.store_id,
+        await self.read_model_repo.update_stock(
+            inventory.product_id,
+            inventory.store_id,
             inventory.available.value,
-            inventory.reserved.value
+            inventory.reserved.value,
+            inventory.version
         )
         
         # Publish events
         for event in new_events:
             await self.event_bus.publish(event)
     
+    async def _run_idempotent(
+        self, 
+        command: Any, 
+        operation: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """
+        Execute a command at most once per idempotency key.
+        
+        A retried command (same key and payload) returns the recorded
+        result without loading the aggregate.
+        
+        Raises:
+            IdempotencyKeyReusedError: If the key was used with another payload
+        """
+        key = command.idempotency_key
+        if key is None or self.idempotency_store is None:
+            return await operation()
+        
+        payload = asdict(command)
+        del payload['idempotency_key']
+        fingerprint = hashlib.sha1(
+            json.dumps(payload, sort_keys=True, default=str).encode("utf-8")
+        ).hexdigest()
+        return await self.idempotency_store.execute(
+            f"{type(command).__name__}:{key}", fingerprint, operation
+        )
+    
+    async def _load_inventory(
+        self, 
+        aggregate_id: str, 
+        product_id: UUID, 
+        store_id: UUID
+    ) -> Inventory:
+        """
+        Load an inventory aggregate.
+        
+        Reuses a cached live aggregate when it is still at the event
+        store's current version. Otherwise starts from the latest snapshot
+        when one exists and replays only the events appended after it.
+        """
+        if self.aggregate_cache is not None:
+            cached = self.aggregate_cache.take(aggregate_id)
+            if cached is not None and cached.version == (
+                await self.event_store.get_current_version(aggregate_id)
+            ):
+                return cached
+        
+        snapshot = None
+        if self.snapshot_store is not None:
+            snapshot = await self.snapshot_store.load(aggregate_id)
+        
+        if snapshot is not None:
+            events = await self.event_store.load_events(
+                aggregate_id, from_version=snapshot.version
+            )
+            return self._rebuild_from_events(
+                events, product_id, store_id, snapshot.to_inventory()
+            )
+        
+        events = await self.event_store.load_events(aggregate_id)
+        return self._rebuild_from_events(events, product_id, store_id)
+    
+    async def _save_events(self, aggregate_id: str, inventory: Inventory) -> List:
+        """
+        Append the aggregate's pending events and snapshot it if due.
+        
+        Returns:
+            The events that were appended
+        
+        Raises:
+            ConcurrencyError: If another writer appended first
+        """
+        new_events = inventory.clear_events()
+        previous_version = inventory.version - len(new_events)
+        try:
+            await self.event_store.append_events(aggregate_id, new_events, previous_version)
+        except ConcurrencyError:
+            if self.aggregate_cache is not None:
+                self.aggregate_cache.invalidate(aggregate_id)
+            raise
+        
+        if self.snapshot_store is not None:
+            await self.snapshot_store.maybe_save(inventory, previous_version)
+        
+        if self.aggregate_cache is not None:
+            self.aggregate_cache.put(aggregate_id, inventory)
+        
+        return new_events
+    
     def _rebuild_from_events(
         self, 
         events: list, 
         product_id: UUID, 
-        store_id: UUID
+        store_id: UUID,
+        inventory: Optional[Inventory] = None
     ) -> Inventory:
         """Rebuild inventory from events (event sourcing)"""
         from ...domain.entities.inventory import Reservation
         
-        inventory = Inventory(product_id=product_id, store_id=store_id)
+        if inventory is None:
+            inventory = Inventory(product_id=product_id, store_id=store_id)
         
         for event in events:
             if event.event_type == "StockAdded":
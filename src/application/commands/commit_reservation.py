@@ -1,5 +1,6 @@
 """Commit Reservation command and handler"""
 from dataclasses import dataclass
+from typing import Optional
 from uuid import UUID
 
 from .add_stock import AddStockHandler
@@ -12,6 +13,7 @@ class CommitReservationCommand:
     store_id: UUID
     reservation_id: UUID
     order_id: UUID
+    idempotency_key: Optional[str] = None
 
 
 class CommitReservationHandler(AddStockHandler):
@@ -19,30 +21,20 @@ class CommitReservationHandler(AddStockHandler):
     
     async def handle(self, command: CommitReservationCommand) -> None:
         """Handle commit reservation command"""
+        await self._run_idempotent(command, lambda: self._commit_reservation(command))
+    
+    async def _commit_reservation(self, command: CommitReservationCommand) -> None:
+        """Execute commit reservation command"""
         aggregate_id = f"{command.product_id}:{command.store_id}"
-        events = await self.event_store.load_events(aggregate_id)
-        
-        inventory = self._rebuild_from_events(events, command.product_id, command.store_id)
+        inventory = await self._load_inventory(
+            aggregate_id, command.product_id, command.store_id
+        )
         
         # Commit reservation
         inventory.commit_reservation(command.reservation_id, command.order_id)
         
         # Save events
-        new_events = inventory.clear_events()
-        await self.event_store.append_events(
-            aggregate_id,
-            new_events,
-            inventory.version - len(new_events)
-        )
-        
-        # Update read model
-        self.read_model_repo.update_stock(
-            command.product_id,
-            command.store_id,
-            inventory.available.value,
-            inventory.reserved.value
-        )
+        new_events = await self._save_events(aggregate_id, inventory)
         
-        # Publish events
-        for event in new_events:
-            await self.event_bus.publish(event)
+        # Update read model and notify subscribers
+        await self._project(inventory, new_events)
@@ -1,5 +1,6 @@
 """Release Reservation command and handler"""
 from dataclasses import dataclass
+from typing import Optional
 from uuid import UUID
 
 from .add_stock import AddStockHandler
@@ -12,6 +13,7 @@ class ReleaseReservationCommand:
     store_id: UUID
     reservation_id: UUID
     reason: str
+    idempotency_key: Optional[str] = None
 
 
 class ReleaseReservationHandler(AddStockHandler):
@@ -19,30 +21,20 @@ class ReleaseReservationHandler(AddStockHandler):
     
     async def handle(self, command: ReleaseReservationCommand) -> None:
         """Handle release reservation command"""
+        await self._run_idempotent(command, lambda: self._release_reservation(command))
+    
+    async def _release_reservation(self, command: ReleaseReservationCommand) -> None:
+        """Execute release reservation command"""
         aggregate_id = f"{command.product_id}:{command.store_id}"
-        events = await self.event_store.load_events(aggregate_id)
-        
-        inventory = self._rebuild_from_events(events, command.product_id, command.store_id)
+        inventory = await self._load_inventory(
+            aggregate_id, command.product_id, command.store_id
+        )
         
         # Release reservation
         inventory.release_reservation(command.reservation_id, command.reason)
         
         # Save events
-        new_events = inventory.clear_events()
-        await self.event_store.append_events(
-            aggregate_id,
-            new_events,
-            inventory.version - len(new_events)
-        )
-        
-        # Update read model
-        self.read_model_repo.update_stock(
-            command.product_id,
-            command.store_id,
-            inventory.available.value,
-            inventory.reserved.value
-        )
+        new_events = await self._save_events(aggregate_id, inventory)
         
-        # Publish events
-        for event in new_events:
-            await self.event_bus.publish(event)
+        # Update read model and notify subscribers
+        await self._project(inventory, new_events)
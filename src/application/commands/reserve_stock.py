@@ -15,6 +15,7 @@ class ReserveStockCommand:
     quantity: int
     customer_id: UUID
     ttl_minutes: Optional[int] = 30
+    idempotency_key: Optional[str] = None
 
 
 class ReserveStockHandler(AddStockHandler):
@@ -22,14 +23,16 @@ class ReserveStockHandler(AddStockHandler):
     
     async def handle(self, command: ReserveStockCommand) -> UUID:
         """Handle reserve stock command"""
+        result = await self._run_idempotent(command, lambda: self._reserve_stock(command))
+        # Replayed results come back from the index as strings
+        return UUID(str(result))
+    
+    async def _reserve_stock(self, command: ReserveStockCommand) -> UUID:
+        """Execute reserve stock command"""
         aggregate_id = f"{command.product_id}:{command.store_id}"
-        events = await self.event_store.load_events(aggregate_id)
-        
-        if events:
-            inventory = self._rebuild_from_events(events, command.product_id, command.store_id)
-        else:
-            from ...domain.entities.inventory import Inventory
-            inventory = Inventory(product_id=command.product_id, store_id=command.store_id)
+        inventory = await self._load_inventory(
+            aggregate_id, command.product_id, command.store_id
+        )
         
         # Calculate expiration
         expires_at = None
@@ -44,23 +47,9 @@ class ReserveStockHandler(AddStockHandler):
         )
         
         # Save events
-        new_events = inventory.clear_events()
-        await self.event_store.append_events(
-            aggregate_id,
-            new_events,
-            inventory.version - len(new_events)
-        )
-        
-        # Update read model
-        self.read_model_repo.update_stock(
-            command.product_id,
-            command.store_id,
-            inventory.available.value,
-            inventory.reserved.value
-        )
+        new_events = await self._save_events(aggregate_id, inventory)
         
-        # Publish events
-        for event in new_events:
-            await self.event_bus.publish(event)
+        # Update read model and notify subscribers
+        await self._project(inventory, new_events)
         
         return reservation_id
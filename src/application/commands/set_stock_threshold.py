@@ -0,0 +1,52 @@
+"""Set Stock Threshold command and handler"""
+from dataclasses import dataclass
+from typing import Optional
+from uuid import UUID
+
+from ...infrastructure.persistence.low_stock_index import LowStockIndex
+from ...infrastructure.persistence.read_model_repository import ReadModelRepository
+from ...infrastructure.persistence.threshold_registry import ThresholdRegistry
+
+
+@dataclass
+class SetStockThresholdCommand:
+    """Command to set or remove the low-stock threshold of a product or store"""
+    scope: str
+    key: UUID
+    threshold: Optional[int]
+
+
+class SetStockThresholdHandler:
+    """Handler for SetStockThresholdCommand"""
+    
+    def __init__(
+        self,
+        registry: ThresholdRegistry,
+        low_stock_index: LowStockIndex,
+        read_model_repo: ReadModelRepository
+    ):
+        self.registry = registry
+        self.low_stock_index = low_stock_index
+        self.read_model_repo = read_model_repo
+    
+    async def handle(self, command: SetStockThresholdCommand) -> None:
+        """
+        Handle set stock threshold command.
+        
+        Thresholds are configuration rather than inventory facts, so they
+        are not event sourced. The affected cells are re-checked against
+        the new threshold through the read model's product or store index.
+        
+        Raises:
+            ValueError: If the scope is unknown
+        """
+        if command.scope == "product":
+            await self.registry.set_product_threshold(command.key, command.threshold)
+            entries = await self.read_model_repo.get_product_inventory(command.key)
+        elif command.scope == "store":
+            await self.registry.set_store_threshold(command.key, command.threshold)
+            entries = await self.read_model_repo.get_store_inventory(command.key)
+        else:
+            raise ValueError(f"Unknown threshold scope: {command.scope}")
+        
+        self.low_stock_index.reevaluate(entries)
@@ -0,0 +1,15 @@
+"""Projections maintaining read models from the event log"""
+from .base import Projection
+from .inventory_projection import InventoryProjection
+from .projection_runner import ProjectionRunner
+from .rollup_projection import StockRollupProjection
+from .rebuild import RebuildReport, rebuild_read_model
+
+__all__ = [
+    "Projection",
+    "InventoryProjection",
+    "ProjectionRunner",
+    "StockRollupProjection",
+    "RebuildReport",
+    "rebuild_read_model",
+]
@@ -0,0 +1,32 @@
+"""Base class for projections"""
+from typing import List
+
+from ...infrastructure.persistence.event_store import RecordedEvent
+
+
+class Projection:
+    """
+    A read model maintained from the global event log.
+    
+    Projections receive committed events in position order, in batches,
+    and are applied at least once: after a crash the events following
+    the last checkpoint are delivered again, so ``apply`` must tolerate
+    events it has already seen.
+    """
+    
+    name: str = ""
+    
+    async def apply(self, events: List[RecordedEvent]) -> None:
+        """
+        Apply a batch of committed events.
+        
+        Args:
+            events: Events in global position order
+        """
+        raise NotImplementedError
+    
+    async def flush(self) -> None:
+        """Make applied events durable before the checkpoint moves past them"""
+    
+    async def reset(self) -> None:
+        """Discard all state before a replay from the start of the log"""
@@ -0,0 +1,140 @@
+"""Projection of stock levels per product and store"""
+from typing import Dict, List, Optional
+
+from ...domain.events.base import DomainEvent
+from ...infrastructure.persistence.columnar_read_model import ColumnarReadModel
+from ...infrastructure.persistence.event_store import RecordedEvent
+from ...infrastructure.persistence.low_stock_index import LowStockIndex
+from ...infrastructure.persistence.read_model_repository import ReadModelRepository
+from .base import Projection
+
+
+def new_stock_entry(event: DomainEvent) -> Dict:
+    """Create the empty stock entry of an event's product and store"""
+    return {
+        'product_id': event.product_id,
+        'store_id': event.store_id,
+        'available': 0,
+        'reserved': 0,
+        'version': 0,
+    }
+
+
+def apply_stock_event(entry: Dict, event: DomainEvent) -> None:
+    """Apply one event's effect on a stock entry"""
+    if event.event_type == "StockAdded":
+        entry['available'] += event.quantity
+    elif event.event_type == "StockReserved":
+        entry['available'] -= event.quantity
+        entry['reserved'] += event.quantity
+    elif event.event_type == "ReservationCommitted":
+        entry['reserved'] -= event.quantity
+    elif event.event_type == "ReservationReleased":
+        entry['reserved'] -= event.quantity
+        entry['available'] += event.quantity
+    elif event.event_type == "StockAdjusted":
+        entry['available'] = event.new_quantity
+    entry['version'] = event.version
+
+
+class InventoryProjection(Projection):
+    """
+    Maintains the inventory read model from inventory events.
+    
+    Each entry records the aggregate version it reflects, and events at
+    or below that version are skipped, so redelivered events are not
+    counted twice. A batch reads each touched entry once and writes it
+    once, however many of its events the batch holds.
+    
+    Written entries are mirrored into an optional columnar model and
+    checked against an optional low-stock index; both must be loaded
+    from the read model before the runner starts.
+    """
+    
+    name = "inventory"
+    
+    def __init__(
+        self,
+        read_model_repo: ReadModelRepository,
+        columnar: Optional[ColumnarReadModel] = None,
+        low_stock_index: Optional[LowStockIndex] = None
+    ):
+        """
+        Initialize projection.
+        
+        Args:
+            read_model_repo: Read model to maintain
+            columnar: Columnar copy of the read model to keep in step
+            low_stock_index: Index of cells below their threshold
+        """
+        self.read_model_repo = read_model_repo
+        self.columnar = columnar
+        self.low_stock_index = low_stock_index
+    
+    async def apply(self, events: List[RecordedEvent]) -> None:
+        """Fold a batch of events into the affected entries"""
+        cells: Dict[str, Dict] = {}
+        # Aggregate -> position of its last applied event
+        changed: Dict[str, int] = {}
+        for recorded in events:
+            event = recorded.event
+            cell = cells.get(event.aggregate_id)
+            if cell is None:
+                cell = await self._load_cell(event)
+                cells[event.aggregate_id] = cell
+            
+            if event.version <= cell['version']:
+                continue
+            apply_stock_event(cell, event)
+            changed[event.aggregate_id] = recorded.position
+        
+        # In position order, so the low-stock feed stays sorted
+        for aggregate_id, position in sorted(changed.items(), key=lambda item: item[1]):
+            cell = cells[aggregate_id]
+            await self.read_model_repo.update_stock(
+                cell['product_id'],
+                cell['store_id'],
+                cell['available'],
+                cell['reserved'],
+                cell['version']
+            )
+            if self.columnar is not None:
+                self.columnar.upsert(
+                    cell['product_id'],
+                    cell['store_id'],
+                    cell['available'],
+                    cell['reserved'],
+                    cell['version']
+                )
+            if self.low_stock_index is not None:
+                self.low_stock_index.update(
+                    cell['product_id'],
+                    cell['store_id'],
+                    cell['available'],
+                    position
+                )
+    
+    async def _load_cell(self, event: DomainEvent) -> Dict:
+        """Read the current entry of an event's product and store"""
+        entry = await self.read_model_repo.get_stock(event.product_id, event.store_id)
+        if entry is None:
+            return new_stock_entry(event)
+        return {
+            'product_id': entry['product_id'],
+            'store_id': entry['store_id'],
+            'available': entry['available'],
+            'reserved': entry['reserved'],
+            'version': entry.get('version', 0),
+        }
+    
+    async def flush(self) -> None:
+        """Persist the read model's pending updates"""
+        await self.read_model_repo.flush()
+    
+    async def reset(self) -> None:
+        """Empty the read model"""
+        await self.read_model_repo.clear()
+        if self.columnar is not None:
+            self.columnar.clear()
+        if self.low_stock_index is not None:
+            self.low_stock_index.clear()
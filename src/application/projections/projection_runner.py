@@ -0,0 +1,173 @@
+"""Background runner feeding projections from the global event log"""
+import asyncio
+import logging
+from typing import Any, Dict, List, Optional
+
+from ...infrastructure.messaging.event_bus import EventBus
+from ...infrastructure.persistence.checkpoint_store import ProjectionCheckpointStore
+from .base import Projection
+
+
+logger = logging.getLogger(__name__)
+
+
+class ProjectionRunner:
+    """
+    Applies committed events to projections asynchronously.
+    
+    Command handlers only append to the event store (and may call
+    ``notify`` to cut the polling delay). The runner pages through
+    ``read_all`` from the lowest checkpoint, hands each projection the
+    events past its own position, flushes it, and only then records the
+    new position, so every event is applied at least once:
+    - After a restart, projections catch up from their checkpoints
+    - A projection without a checkpoint is reset and replayed from the
+      start of the log
+    - Once a batch is projected, its events are published to the event
+      bus, so subscribers (e.g. cache invalidation) never run ahead of
+      the read model
+    """
+    
+    def __init__(
+        self,
+        event_store,
+        projections: List[Projection],
+        checkpoint_store: ProjectionCheckpointStore,
+        event_bus: Optional[EventBus] = None,
+        batch_size: int = 500,
+        poll_interval: float = 1.0
+    ):
+        """
+        Initialize projection runner.
+        
+        Args:
+            event_store: Any store exposing ``read_all``
+            projections: Projections to maintain (unique names)
+            checkpoint_store: Persistent projection positions
+            event_bus: Receives events once they are projected
+            batch_size: Events read per batch
+            poll_interval: Seconds between polls when not notified
+        """
+        self.event_store = event_store
+        self.projections = projections
+        self.checkpoint_store = checkpoint_store
+        self.event_bus = event_bus
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        
+        self._positions: Optional[Dict[str, int]] = None
+        self._run_lock = asyncio.Lock()
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self.events_processed = 0
+        self.batches_processed = 0
+    
+    @property
+    def position(self) -> int:
+        """Global position every projection has reached"""
+        if not self._positions:
+            return 0
+        return min(self._positions.values())
+    
+    async def start(self) -> None:
+        """Load checkpoints and start the background loop"""
+        await self._load_positions()
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+    
+    async def stop(self) -> None:
+        """Stop the background loop after projecting what is committed"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.catch_up()
+    
+    def notify(self) -> None:
+        """Wake the loop up because new events were appended"""
+        self._wakeup.set()
+    
+    async def catch_up(self) -> int:
+        """
+        Project batches until the end of the log.
+        
+        Returns:
+            Number of events read
+        """
+        processed = 0
+        while True:
+            count = await self.run_once()
+            processed += count
+            if count < self.batch_size:
+                return processed
+    
+    async def run_once(self) -> int:
+        """
+        Project the next batch of events.
+        
+        Returns:
+            Number of events read (0 when caught up)
+        """
+        async with self._run_lock:
+            await self._load_positions()
+            batch = await self.event_store.read_all(
+                from_position=self.position, batch_size=self.batch_size
+            )
+            if not batch:
+                return 0
+            
+            last_position = batch[-1].position
+            for projection in self.projections:
+                projected = self._positions[projection.name]
+                pending = [r for r in batch if r.position > projected]
+                if not pending:
+                    continue
+                await projection.apply(pending)
+                await projection.flush()
+                self._positions[projection.name] = last_position
+            await self.checkpoint_store.save(self._positions)
+            
+            if self.event_bus is not None:
+                for recorded in batch:
+                    await self.event_bus.publish(recorded.event)
+            
+            self.events_processed += len(batch)
+            self.batches_processed += 1
+            return len(batch)
+    
+    async def _load_positions(self) -> None:
+        """Read checkpoints on first use, resetting projections that lack one"""
+        if self._positions is not None:
+            return
+        saved = await self.checkpoint_store.load()
+        positions = {}
+        for projection in self.projections:
+            if projection.name not in saved:
+                await projection.reset()
+            positions[projection.name] = saved.get(projection.name, 0)
+        self._positions = positions
+    
+    async def _run(self) -> None:
+        """Project continuously, sleeping when caught up"""
+        while True:
+            self._wakeup.clear()
+            try:
+                await self.catch_up()
+            except Exception as e:
+                logger.error(f"Projection batch failed: {e}")
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get projection statistics"""
+        return {
+            'positions': dict(self._positions or {}),
+            'events_processed': self.events_processed,
+            'batches_processed': self.batches_processed,
+            'running': self._task is not None,
+        }
@@ -0,0 +1,140 @@
+"""Parallel full rebuild of the inventory read model"""
+import asyncio
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple, Type
+
+from ...infrastructure.persistence.checkpoint_store import ProjectionCheckpointStore
+from ...infrastructure.persistence.codecs import EventCodec
+from ...infrastructure.persistence.event_store import EventStore
+from .inventory_projection import InventoryProjection, apply_stock_event, new_stock_entry
+
+
+@dataclass
+class RebuildReport:
+    """Outcome and throughput of a rebuild"""
+    aggregates: int
+    events: int
+    partitions: int
+    workers: int
+    elapsed_seconds: float
+    position: int
+    
+    @property
+    def aggregates_per_second(self) -> float:
+        """Aggregates folded per second"""
+        return self.aggregates / self.elapsed_seconds if self.elapsed_seconds > 0 else 0.0
+    
+    @property
+    def events_per_second(self) -> float:
+        """Events folded per second"""
+        return self.events / self.elapsed_seconds if self.elapsed_seconds > 0 else 0.0
+
+
+def fold_segments(
+    codec_class: Type[EventCodec],
+    segment_paths: List[str]
+) -> Tuple[List[Dict], int]:
+    """
+    Compute the final stock entry of each segment's aggregate.
+    
+    Runs in a worker process: segments are read whole and decoded with a
+    codec of the store's class, without opening the store itself.
+    
+    Args:
+        codec_class: Codec class the segments were written with
+        segment_paths: Segment files, one aggregate each
+    
+    Returns:
+        Tuple of (stock entries, number of events folded)
+    """
+    codec = codec_class()
+    entries = []
+    events = 0
+    for segment_path in segment_paths:
+        try:
+            with open(segment_path, 'rb') as f:
+                content = f.read()
+        except FileNotFoundError:
+            continue
+        
+        entry = None
+        for _, event in codec.decode_all(content):
+            if entry is None:
+                entry = new_stock_entry(event)
+            apply_stock_event(entry, event)
+            events += 1
+        if entry is not None:
+            entries.append(entry)
+    return entries, events
+
+
+async def rebuild_read_model(
+    event_store: EventStore,
+    read_model_repo,
+    checkpoint_store: Optional[ProjectionCheckpointStore] = None,
+    workers: Optional[int] = None,
+    partition_size: int = 1000
+) -> RebuildReport:
+    """
+    Recompute the inventory read model from the event store.
+    
+    Segment files are partitioned across a process pool, so folding
+    streams uses every core; the main process only merges the results
+    and writes them with a single ``replace_all``. The global position
+    is read first and recorded as the inventory projection's
+    checkpoint, so a projection runner resumes after the rebuild.
+    Events appended while it runs are either folded or replayed, and
+    entry versions keep replays from counting them twice.
+    
+    Legacy single-file streams are not read: migrate them first
+    (``scripts/migrate_event_store.py``).
+    
+    Args:
+        event_store: File event store to read
+        read_model_repo: Read model to replace (either implementation)
+        checkpoint_store: Projection checkpoints to move to the rebuilt position
+        workers: Worker processes (default: CPU count)
+        partition_size: Segments per worker task
+    
+    Returns:
+        Rebuild report with throughput figures
+    """
+    started = time.perf_counter()
+    workers = workers or os.cpu_count() or 1
+    position = await event_store.get_global_position()
+    
+    loop = asyncio.get_running_loop()
+    segment_paths = await loop.run_in_executor(
+        None, lambda: [str(path) for path in event_store.iter_segment_paths()]
+    )
+    partitions = [
+        segment_paths[start:start + partition_size]
+        for start in range(0, len(segment_paths), partition_size)
+    ]
+    
+    codec_class = type(event_store.codec)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        results = await asyncio.gather(*(
+            loop.run_in_executor(pool, fold_segments, codec_class, partition)
+            for partition in partitions
+        ))
+    
+    entries = [entry for partition_entries, _ in results for entry in partition_entries]
+    await read_model_repo.replace_all(entries)
+    
+    if checkpoint_store is not None:
+        positions = await checkpoint_store.load()
+        positions[InventoryProjection.name] = position
+        await checkpoint_store.save(positions)
+    
+    return RebuildReport(
+        aggregates=len(entries),
+        events=sum(events for _, events in results),
+        partitions=len(partitions),
+        workers=workers,
+        elapsed_seconds=time.perf_counter() - started,
+        position=position,
+    )
@@ -2,6 +2,14 @@
 from .get_stock import GetStockQuery, GetStockHandler
 from .check_availability import CheckAvailabilityQuery, CheckAvailabilityHandler
 from .get_product_inventory import GetProductInventoryQuery, GetProductInventoryHandler
+from .get_store_inventory import GetStoreInventoryQuery, GetStoreInventoryHandler
+from .get_stock_rollup import GetStockRollupQuery, GetStockRollupHandler
+from .get_stock_analytics import (
+    GetLowStockCellsQuery,
+    GetTopReservedProductsQuery,
+    GetStockAnalyticsHandler,
+)
+from .get_low_stock import GetBelowThresholdQuery, GetLowStockAlertsQuery, GetLowStockHandler
 
 __all__ = [
     "GetStockQuery",
@@ -10,4 +18,14 @@ __all__ = [
     "CheckAvailabilityHandler",
     "GetProductInventoryQuery",
     "GetProductInventoryHandler",
+    "GetStoreInventoryQuery",
+    "GetStoreInventoryHandler",
+    "GetStockRollupQuery",
+    "GetStockRollupHandler",
+    "GetLowStockCellsQuery",
+    "GetTopReservedProductsQuery",
+    "GetStockAnalyticsHandler",
+    "GetBelowThresholdQuery",
+    "GetLowStockAlertsQuery",
+    "GetLowStockHandler",
 ]
@@ -29,7 +29,7 @@ class CheckAvailabilityHandler:
     
     async def handle(self, query: CheckAvailabilityQuery) -> AvailabilityResult:
         """Handle check availability query"""
-        stock = self.read_model_repo.get_stock(query.product_id, query.store_id)
+        stock = await self.read_model_repo.get_stock(query.product_id, query.store_id)
         
         if not stock:
             return AvailabilityResult(
@@ -0,0 +1,33 @@
+"""Low stock queries and handler"""
+from dataclasses import dataclass
+from typing import Dict, List
+
+from ...infrastructure.persistence.low_stock_index import LowStockIndex
+
+
+@dataclass
+class GetBelowThresholdQuery:
+    """Query to get the cells furthest below their low-stock threshold"""
+    limit: int = 100
+
+
+@dataclass
+class GetLowStockAlertsQuery:
+    """Query to get the cells that crossed their threshold after a position"""
+    since: int = 0
+    limit: int = 1000
+
+
+class GetLowStockHandler:
+    """Handler for low-stock index and alert feed queries"""
+    
+    def __init__(self, low_stock_index: LowStockIndex):
+        self.low_stock_index = low_stock_index
+    
+    async def handle_below_threshold(self, query: GetBelowThresholdQuery) -> List[Dict]:
+        """Handle below threshold query"""
+        return await self.low_stock_index.get_below_threshold(query.limit)
+    
+    async def handle_alerts(self, query: GetLowStockAlertsQuery) -> List[Dict]:
+        """Handle low stock alerts query"""
+        return await self.low_stock_index.get_alerts_since(query.since, query.limit)
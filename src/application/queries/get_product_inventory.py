@@ -1,6 +1,6 @@
 """Get Product Inventory query and handler"""
 from dataclasses import dataclass
-from typing import List, Dict
+from typing import List, Dict, Optional
 from uuid import UUID
 
 from ...infrastructure.persistence.read_model_repository import ReadModelRepository
@@ -11,6 +11,7 @@ from ...infrastructure.cache.in_memory_cache import InMemoryCache
 class GetProductInventoryQuery:
     """Query to get inventory for a product across all stores"""
     product_id: UUID
+    min_available: Optional[int] = None
 
 
 class GetProductInventoryHandler:
@@ -26,6 +27,12 @@ class GetProductInventoryHandler:
     
     async def handle(self, query: GetProductInventoryQuery) -> List[Dict]:
         """Handle get product inventory query"""
+        # Range queries go straight to the read model's index
+        if query.min_available is not None:
+            return await self.read_model_repo.get_stores_with_available(
+                query.product_id, query.min_available
+            )
+        
         cache_key = f"product_inventory:{query.product_id}"
         
         # Try cache first
@@ -34,7 +41,7 @@ class GetProductInventoryHandler:
             return cached
         
         # Query read model
-        inventory = self.read_model_repo.get_product_inventory(query.product_id)
+        inventory = await self.read_model_repo.get_product_inventory(query.product_id)
         
         # Cache result
         if inventory:
@@ -35,7 +35,7 @@ class GetStockHandler:
             return cached
         
         # Query read model
-        stock = self.read_model_repo.get_stock(query.product_id, query.store_id)
+        stock = await self.read_model_repo.get_stock(query.product_id, query.store_id)
         
         # Cache result
         if stock:
@@ -0,0 +1,33 @@
+"""Stock analytics queries and handler"""
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from ...infrastructure.persistence.columnar_read_model import ColumnarReadModel
+
+
+@dataclass
+class GetLowStockCellsQuery:
+    """Query to get product/store cells with available stock below a threshold"""
+    threshold: int
+    limit: Optional[int] = None
+
+
+@dataclass
+class GetTopReservedProductsQuery:
+    """Query to get the products with the most stock reserved"""
+    limit: int = 100
+
+
+class GetStockAnalyticsHandler:
+    """Handler for catalog-wide analytical queries on the columnar read model"""
+    
+    def __init__(self, columnar: ColumnarReadModel):
+        self.columnar = columnar
+    
+    async def handle_low_stock(self, query: GetLowStockCellsQuery) -> List[Dict]:
+        """Handle low stock cells query"""
+        return await self.columnar.cells_below(query.threshold, query.limit)
+    
+    async def handle_top_reserved(self, query: GetTopReservedProductsQuery) -> List[Dict]:
+        """Handle top reserved products query"""
+        return await self.columnar.top_products_by_reserved(query.limit)
@@ -0,0 +1,38 @@
+"""Get Stock Rollup query and handler"""
+from dataclasses import dataclass
+from typing import Dict, Optional
+from uuid import UUID
+
+from ...infrastructure.persistence.rollup_repository import StockRollupRepository
+
+
+@dataclass
+class GetStockRollupQuery:
+    """Query to get stock totals of a store, a product or the whole network"""
+    scope: str
+    key: Optional[UUID] = None
+
+
+class GetStockRollupHandler:
+    """Handler for GetStockRollupQuery"""
+    
+    def __init__(self, rollup_repo: StockRollupRepository):
+        self.rollup_repo = rollup_repo
+    
+    async def handle(self, query: GetStockRollupQuery) -> Optional[Dict[str, int]]:
+        """
+        Handle get stock rollup query.
+        
+        Rollups are materialized, so this is a single lookup and is
+        not cached.
+        
+        Raises:
+            ValueError: If the scope is unknown
+        """
+        if query.scope == "store":
+            return await self.rollup_repo.get_store_rollup(query.key)
+        if query.scope == "product":
+            return await self.rollup_repo.get_product_rollup(query.key)
+        if query.scope == "network":
+            return await self.rollup_repo.get_network_rollup()
+        raise ValueError(f"Unknown rollup scope: {query.scope}")
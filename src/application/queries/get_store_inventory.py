@@ -0,0 +1,43 @@
+"""Get Store Inventory query and handler"""
+from dataclasses import dataclass
+from typing import List, Dict
+from uuid import UUID
+
+from ...infrastructure.persistence.read_model_repository import ReadModelRepository
+from ...infrastructure.cache.in_memory_cache import InMemoryCache
+
+
+@dataclass
+class GetStoreInventoryQuery:
+    """Query to get inventory for every product at a store"""
+    store_id: UUID
+
+
+class GetStoreInventoryHandler:
+    """Handler for GetStoreInventoryQuery"""
+    
+    def __init__(
+        self,
+        read_model_repo: ReadModelRepository,
+        cache: InMemoryCache
+    ):
+        self.read_model_repo = read_model_repo
+        self.cache = cache
+    
+    async def handle(self, query: GetStoreInventoryQuery) -> List[Dict]:
+        """Handle get store inventory query"""
+        cache_key = f"store_inventory:{query.store_id}"
+        
+        # Try cache first
+        cached = await self.cache.get(cache_key)
+        if cached:
+            return cached
+        
+        # Query read model
+        inventory = await self.read_model_repo.get_store_inventory(query.store_id)
+        
+        # Cache result
+        if inventory:
+            await self.cache.set(cache_key, inventory)
+        
+        return inventory
@@ -6,9 +6,18 @@ from ..commands.add_stock import AddStockCommand, AddStockHandler
 from ..commands.reserve_stock import ReserveStockCommand, ReserveStockHandler
 from ..commands.commit_reservation import CommitReservationCommand, CommitReservationHandler
 from ..commands.release_reservation import ReleaseReservationCommand, ReleaseReservationHandler
+from ..commands.set_stock_threshold import SetStockThresholdCommand, SetStockThresholdHandler
 from ..queries.get_stock import GetStockQuery, GetStockHandler
 from ..queries.check_availability import CheckAvailabilityQuery, CheckAvailabilityHandler, AvailabilityResult
 from ..queries.get_product_inventory import GetProductInventoryQuery, GetProductInventoryHandler
+from ..queries.get_store_inventory import GetStoreInventoryQuery, GetStoreInventoryHandler
+from ..queries.get_stock_rollup import GetStockRollupQuery, GetStockRollupHandler
+from ..queries.get_stock_analytics import (
+    GetLowStockCellsQuery,
+    GetTopReservedProductsQuery,
+    GetStockAnalyticsHandler,
+)
+from ..queries.get_low_stock import GetBelowThresholdQuery, GetLowStockAlertsQuery, GetLowStockHandler
 
 
 class InventoryService:
@@ -25,7 +34,12 @@ class InventoryService:
         release_handler: ReleaseReservationHandler,
         get_stock_handler: GetStockHandler,
         check_availability_handler: CheckAvailabilityHandler,
-        get_product_inventory_handler: GetProductInventoryHandler
+        get_product_inventory_handler: GetProductInventoryHandler,
+        get_store_inventory_handler: Optional[GetStoreInventoryHandler] = None,
+        get_stock_rollup_handler: Optional[GetStockRollupHandler] = None,
+        stock_analytics_handler: Optional[GetStockAnalyticsHandler] = None,
+        set_threshold_handler: Optional[SetStockThresholdHandler] = None,
+        low_stock_handler: Optional[GetLowStockHandler] = None
     ):
         self.add_stock_handler = add_stock_handler
         self.reserve_stock_handler = reserve_stock_handler
@@ -34,6 +48,11 @@ class InventoryService:
         self.get_stock_handler = get_stock_handler
         self.check_availability_handler = check_availability_handler
         self.get_product_inventory_handler = get_product_inventory_handler
+        self.get_store_inventory_handler = get_store_inventory_handler
+        self.get_stock_rollup_handler = get_stock_rollup_handler
+        self.stock_analytics_handler = stock_analytics_handler
+        self.set_threshold_handler = set_threshold_handler
+        self.low_stock_handler = low_stock_handler
     
     # Commands
     async def add_stock(
@@ -41,10 +60,11 @@ class InventoryService:
         product_id: UUID,
         store_id: UUID,
         quantity: int,
-        reason: str
+        reason: str,
+        idempotency_key: Optional[str] = None
     ) -> None:
         """Add stock"""
-        command = AddStockCommand(product_id, store_id, quantity, reason)
+        command = AddStockCommand(product_id, store_id, quantity, reason, idempotency_key)
         await self.add_stock_handler.handle(command)
     
     async def reserve_stock(
@@ -53,11 +73,12 @@ class InventoryService:
         store_id: UUID,
         quantity: int,
         customer_id: UUID,
-        ttl_minutes: Optional[int] = 30
+        ttl_minutes: Optional[int] = 30,
+        idempotency_key: Optional[str] = None
     ) -> UUID:
         """Reserve stock"""
         command = ReserveStockCommand(
-            product_id, store_id, quantity, customer_id, ttl_minutes
+            product_id, store_id, quantity, customer_id, ttl_minutes, idempotency_key
         )
         return await self.reserve_stock_handler.handle(command)
     
@@ -66,11 +87,12 @@ class InventoryService:
         product_id: UUID,
         store_id: UUID,
         reservation_id: UUID,
-        order_id: UUID
+        order_id: UUID,
+        idempotency_key: Optional[str] = None
     ) -> None:
         """Commit reservation"""
         command = CommitReservationCommand(
-            product_id, store_id, reservation_id, order_id
+            product_id, store_id, reservation_id, order_id, idempotency_key
         )
         await self.commit_handler.handle(command)
     
@@ -79,14 +101,25 @@ class InventoryService:
         product_id: UUID,
         store_id: UUID,
         reservation_id: UUID,
-        reason: str
+        reason: str,
+        idempotency_key: Optional[str] = None
     ) -> None:
         """Release reservation"""
         command = ReleaseReservationCommand(
-            product_id, store_id, reservation_id, reason
+            product_id, store_id, reservation_id, reason, idempotency_key
         )
         await self.release_handler.handle(command)
     
+    async def set_product_threshold(self, product_id: UUID, threshold: Optional[int]) -> None:
+        """Set or remove the low-stock threshold of a product"""
+        command = SetStockThresholdCommand("product", product_id, threshold)
+        await self.set_threshold_handler.handle(command)
+    
+    async def set_store_threshold(self, store_id: UUID, threshold: Optional[int]) -> None:
+        """Set or remove the low-stock threshold of a store"""
+        command = SetStockThresholdCommand("store", store_id, threshold)
+        await self.set_threshold_handler.handle(command)
+    
     # Queries
     async def get_stock(
         self,
@@ -109,8 +142,61 @@ class InventoryService:
     
     async def get_product_inventory(
         self,
-        product_id: UUID
+        product_id: UUID,
+        min_available: Optional[int] = None
     ) -> List[Dict]:
         """Get product inventory across all stores"""
-        query = GetProductInventoryQuery(product_id)
+        query = GetProductInventoryQuery(product_id, min_available)
         return await self.get_product_inventory_handler.handle(query)
+    
+    async def get_store_inventory(
+        self,
+        store_id: UUID
+    ) -> List[Dict]:
+        """Get inventory for every product at a store"""
+        query = GetStoreInventoryQuery(store_id)
+        return await self.get_store_inventory_handler.handle(query)
+    
+    async def get_store_rollup(self, store_id: UUID) -> Optional[Dict]:
+        """Get stock totals of a store across all products"""
+        query = GetStockRollupQuery("store", store_id)
+        return await self.get_stock_rollup_handler.handle(query)
+    
+    async def get_product_rollup(self, product_id: UUID) -> Optional[Dict]:
+        """Get stock totals of a product across all stores"""
+        query = GetStockRollupQuery("product", product_id)
+        return await self.get_stock_rollup_handler.handle(query)
+    
+    async def get_network_rollup(self) -> Dict:
+        """Get stock totals across the whole network"""
+        query = GetStockRollupQuery("network")
+        return await self.get_stock_rollup_handler.handle(query)
+    
+    @property
+    def analytics_enabled(self) -> bool:
+        """Whether the columnar read model (numpy) is available"""
+        return self.stock_analytics_handler is not None
+    
+    async def get_low_stock_cells(
+        self,
+        threshold: int,
+        limit: Optional[int] = None
+    ) -> List[Dict]:
+        """Get cells with available stock below a threshold"""
+        query = GetLowStockCellsQuery(threshold, limit)
+        return await self.stock_analytics_handler.handle_low_stock(query)
+    
+    async def get_top_reserved_products(self, limit: int = 100) -> List[Dict]:
+        """Get the products with the most stock reserved"""
+        query = GetTopReservedProductsQuery(limit)
+        return await self.stock_analytics_handler.handle_top_reserved(query)
+    
+    async def get_below_threshold(self, limit: int = 100) -> List[Dict]:
+        """Get the cells furthest below their low-stock threshold"""
+        query = GetBelowThresholdQuery(limit)
+        return await self.low_stock_handler.handle_below_threshold(query)
+    
+    async def get_low_stock_alerts(self, since: int = 0, limit: int = 1000) -> List[Dict]:
+        """Get the cells that crossed their threshold after a position"""
+        query = GetLowStockAlertsQuery(since, limit)
+        return await self.low_stock_handler.handle_alerts(query)
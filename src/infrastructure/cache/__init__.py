@@ -1,4 +1,5 @@
 """Cache implementations"""
 from .in_memory_cache import InMemoryCache
+from .aggregate_cache import AggregateCache
 
-__all__ = ["InMemoryCache"]
+__all__ = ["InMemoryCache", "AggregateCache"]
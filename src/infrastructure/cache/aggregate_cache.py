@@ -0,0 +1,136 @@
+"""Bounded in-memory cache of live aggregates for the command side"""
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+from ...domain.entities.inventory import Inventory
+
+
+class AggregateCache:
+    """
+    LRU cache of rebuilt Inventory aggregates keyed by aggregate id.
+    
+    Entries are checked out with ``take`` and returned with ``put`` once
+    their new events are safely appended, so two concurrent commands never
+    mutate the same instance. Callers must still validate a taken
+    aggregate against the event store version before using it.
+    
+    Features:
+    - LRU eviction by entry count
+    - Weight-based eviction (one unit per aggregate plus one per open
+      reservation) to bound memory
+    - Explicit ``trim`` for memory-pressure handling
+    """
+    
+    def __init__(self, max_size: int = 10000, max_weight: Optional[int] = None):
+        """
+        Initialize cache.
+        
+        Args:
+            max_size: Maximum number of cached aggregates
+            max_weight: Optional bound on total weight (aggregates plus
+                open reservations)
+        """
+        self.max_size = max_size
+        self.max_weight = max_weight
+        self._entries: "OrderedDict[str, Inventory]" = OrderedDict()
+        self._weights: Dict[str, int] = {}
+        self._total_weight = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    @staticmethod
+    def _weight(inventory: Inventory) -> int:
+        """Approximate memory weight of an aggregate"""
+        return 1 + len(inventory.reservations)
+    
+    def take(self, aggregate_id: str) -> Optional[Inventory]:
+        """
+        Remove and return a cached aggregate.
+        
+        Args:
+            aggregate_id: Aggregate identifier
+        
+        Returns:
+            Cached aggregate or None if not cached
+        """
+        inventory = self._entries.pop(aggregate_id, None)
+        if inventory is None:
+            self.misses += 1
+            return None
+        
+        self._total_weight -= self._weights.pop(aggregate_id)
+        self.hits += 1
+        return inventory
+    
+    def put(self, aggregate_id: str, inventory: Inventory) -> None:
+        """
+        Store an aggregate as the most recently used entry.
+        
+        Args:
+            aggregate_id: Aggregate identifier
+            inventory: Aggregate whose events are all persisted
+        """
+        self.invalidate(aggregate_id)
+        
+        weight = self._weight(inventory)
+        self._entries[aggregate_id] = inventory
+        self._weights[aggregate_id] = weight
+        self._total_weight += weight
+        
+        while len(self._entries) > self.max_size or (
+            self.max_weight is not None
+            and self._total_weight > self.max_weight
+            and len(self._entries) > 1
+        ):
+            self._evict_lru()
+    
+    def invalidate(self, aggregate_id: str) -> None:
+        """
+        Drop an aggregate from the cache.
+        
+        Args:
+            aggregate_id: Aggregate identifier
+        """
+        if self._entries.pop(aggregate_id, None) is not None:
+            self._total_weight -= self._weights.pop(aggregate_id)
+    
+    def trim(self, target_size: int) -> int:
+        """
+        Evict least recently used entries, e.g. under memory pressure.
+        
+        Args:
+            target_size: Number of entries to keep
+        
+        Returns:
+            Number of entries evicted
+        """
+        evicted = 0
+        while len(self._entries) > max(target_size, 0):
+            self._evict_lru()
+            evicted += 1
+        return evicted
+    
+    def clear(self) -> None:
+        """Clear all entries"""
+        self._entries.clear()
+        self._weights.clear()
+        self._total_weight = 0
+    
+    def _evict_lru(self) -> None:
+        """Evict least recently used entry"""
+        aggregate_id, _ = self._entries.popitem(last=False)
+        self._total_weight -= self._weights.pop(aggregate_id)
+        self.evictions += 1
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics"""
+        return {
+            'size': len(self._entries),
+            'max_size': self.max_size,
+            'weight': self._total_weight,
+            'max_weight': self.max_weight,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+        }
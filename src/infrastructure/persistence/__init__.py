@@ -1,5 +1,36 @@
 """Persistence implementations"""
-from .event_store import EventStore
+from .codecs import EventCodec, JsonEventCodec, BinaryEventCodec, EventRegistry
+from .event_store import EventStore, RecordedEvent
+from .sqlite_event_store import SqliteEventStore
 from .read_model_repository import ReadModelRepository
+from .sqlite_read_model_repository import SqliteReadModelRepository
+from .rollup_repository import StockRollupRepository
+from .columnar_read_model import ColumnarReadModel, NUMPY_AVAILABLE
+from .threshold_registry import ThresholdRegistry
+from .low_stock_index import LowStockIndex
+from .snapshot_store import SnapshotStore, InventorySnapshot, EveryNEventsPolicy
+from .idempotency_store import IdempotencyStore, IdempotencyKeyReusedError
+from .checkpoint_store import ProjectionCheckpointStore
 
-__all__ = ["EventStore", "ReadModelRepository"]
+__all__ = [
+    "EventCodec",
+    "JsonEventCodec",
+    "BinaryEventCodec",
+    "EventRegistry",
+    "EventStore",
+    "RecordedEvent",
+    "SqliteEventStore",
+    "ReadModelRepository",
+    "SqliteReadModelRepository",
+    "StockRollupRepository",
+    "ColumnarReadModel",
+    "NUMPY_AVAILABLE",
+    "ThresholdRegistry",
+    "LowStockIndex",
+    "SnapshotStore",
+    "InventorySnapshot",
+    "EveryNEventsPolicy",
+    "IdempotencyStore",
+    "IdempotencyKeyReusedError",
+    "ProjectionCheckpointStore",
+]
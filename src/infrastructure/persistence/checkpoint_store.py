@@ -0,0 +1,52 @@
+"""Persistent positions of projections in the global event log"""
+import json
+import os
+from pathlib import Path
+from typing import Dict
+
+import aiofiles
+
+
+class ProjectionCheckpointStore:
+    """
+    Durable map of projection name to last applied global position.
+    
+    The whole map is one small JSON file, replaced atomically on every
+    save, so a crash leaves either the old or the new positions.
+    """
+    
+    def __init__(self, storage_path: str = "data/projections/checkpoints.json"):
+        """
+        Initialize checkpoint store.
+        
+        Args:
+            storage_path: JSON file holding the positions
+        """
+        self.storage_path = Path(storage_path)
+        self.storage_path.parent.mkdir(parents=True, exist_ok=True)
+    
+    async def load(self) -> Dict[str, int]:
+        """
+        Load every recorded position.
+        
+        Returns:
+            Mapping of projection name to global position
+        """
+        if not self.storage_path.exists():
+            return {}
+        async with aiofiles.open(self.storage_path, 'r') as f:
+            return json.loads(await f.read())
+    
+    async def save(self, positions: Dict[str, int]) -> None:
+        """
+        Replace the recorded positions.
+        
+        Args:
+            positions: Mapping of projection name to global position
+        """
+        tmp_path = self.storage_path.with_name(f"{self.storage_path.name}.{os.getpid()}.tmp")
+        async with aiofiles.open(tmp_path, 'w') as f:
+            await f.write(json.dumps(positions, sort_keys=True))
+            await f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.storage_path)
@@ -0,0 +1,455 @@
+"""Event codecs: how events are laid out in segment and log files"""
+import dataclasses
+import json
+import struct
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Tuple, Type, get_type_hints
+from uuid import UUID
+
+from ...domain.events.base import DomainEvent
+from ...domain.events.inventory_events import (
+    StockAdded,
+    StockReserved,
+    ReservationCommitted,
+    ReservationReleased,
+    StockAdjusted,
+)
+
+
+# Field kinds understood by the codecs
+UUID_FIELD = "uuid"
+DATETIME_FIELD = "datetime"
+INT_FIELD = "int"
+STR_FIELD = "str"
+
+_KIND_BY_TYPE = {
+    UUID: UUID_FIELD,
+    datetime: DATETIME_FIELD,
+    int: INT_FIELD,
+    str: STR_FIELD,
+}
+
+
+@dataclass(frozen=True)
+class EventLayout:
+    """Fixed field layout of a registered event class"""
+    type_id: int
+    event_class: Type[DomainEvent]
+    fields: Tuple[Tuple[str, str], ...]
+    
+    @property
+    def event_type(self) -> str:
+        """Get the event type name"""
+        return self.event_class.__name__
+
+
+class EventRegistry:
+    """
+    Registry of event classes and their field layouts.
+    
+    Type ids are part of the binary format and must never be reused for
+    a different class.
+    """
+    
+    def __init__(self):
+        self._by_id: Dict[int, EventLayout] = {}
+        self._by_name: Dict[str, EventLayout] = {}
+    
+    def register(self, event_class: Type[DomainEvent], type_id: int) -> EventLayout:
+        """
+        Register an event class, deriving its layout from its type hints.
+        
+        Args:
+            event_class: Dataclass event type
+            type_id: Stable identifier stored in binary records (1-255)
+        
+        Returns:
+            The registered layout
+        """
+        if not 0 < type_id < 256:
+            raise ValueError(f"type_id must be in 1..255: {type_id}")
+        if type_id in self._by_id:
+            raise ValueError(f"type_id {type_id} already registered")
+        
+        hints = get_type_hints(event_class)
+        fields = []
+        for f in dataclasses.fields(event_class):
+            kind = _KIND_BY_TYPE.get(hints[f.name])
+            if kind is None:
+                raise TypeError(
+                    f"Unsupported type for {event_class.__name__}.{f.name}: "
+                    f"{hints[f.name]}"
+                )
+            fields.append((f.name, kind))
+        
+        layout = EventLayout(type_id, event_class, tuple(fields))
+        self._by_id[type_id] = layout
+        self._by_name[layout.event_type] = layout
+        return layout
+    
+    def by_id(self, type_id: int) -> EventLayout:
+        """Get layout by binary type id"""
+        layout = self._by_id.get(type_id)
+        if layout is None:
+            raise ValueError(f"Unknown event type id: {type_id}")
+        return layout
+    
+    def by_name(self, event_type: str) -> EventLayout:
+        """Get layout by event type name"""
+        layout = self._by_name.get(event_type)
+        if layout is None:
+            raise ValueError(f"Unknown event type: {event_type}")
+        return layout
+    
+    def __iter__(self) -> Iterator[EventLayout]:
+        return iter(self._by_id.values())
+
+
+default_registry = EventRegistry()
+default_registry.register(StockAdded, 1)
+default_registry.register(StockReserved, 2)
+default_registry.register(ReservationCommitted, 3)
+default_registry.register(ReservationReleased, 4)
+default_registry.register(StockAdjusted, 5)
+
+
+class _UUIDInterner:
+    """
+    Bounded cache of parsed UUIDs.
+    
+    Product, store, customer and reservation ids repeat across the events
+    of a stream, and parsing the string form dominates JSON decode time.
+    UUIDs are immutable, so decoded events can share instances.
+    """
+    
+    def __init__(self, max_size: int = 65536):
+        self.max_size = max_size
+        self._cache: Dict[str, UUID] = {}
+        self.get = self._cache.get
+    
+    def parse(self, value: str) -> UUID:
+        """Parse a UUID string and remember the result"""
+        if len(self._cache) >= self.max_size:
+            self._cache.clear()
+        uuid = self._cache[value] = UUID(value)
+        return uuid
+
+
+def compile_json_decoder(
+    layout: EventLayout, 
+    interner: Optional[_UUIDInterner] = None
+) -> Callable[[dict], DomainEvent]:
+    """
+    Generate a decoder for the JSON dictionary form of one event class.
+    
+    The generated function is a single constructor call with every
+    field's conversion written out inline, e.g. for ``StockAdded``::
+    
+        def decode_StockAdded(d):
+            return event_class(
+                event_id=None if (v := d['event_id']) is None else UUID(v),
+                aggregate_id=d['aggregate_id'],
+                product_id=None if (v := d['product_id']) is None else (
+                    uuid_get(v) or parse_uuid(v)),
+                ...
+            )
+    
+    ``event_id`` is unique per event, so it bypasses the UUID interner.
+    The decoder raises KeyError when a field is missing; callers fall back
+    to the generic decoder, which applies the dataclass defaults.
+    """
+    interner = interner or _UUIDInterner()
+    converters = {
+        UUID_FIELD: "None if (v := d[{key!r}]) is None else (uuid_get(v) or parse_uuid(v))",
+        DATETIME_FIELD: "None if (v := d[{key!r}]) is None else fromisoformat(v)",
+        INT_FIELD: "d[{key!r}]",
+        STR_FIELD: "d[{key!r}]",
+    }
+    arguments = ",\n".join(
+        f"        {name}=" + (
+            "None if (v := d['event_id']) is None else UUID(v)"
+            if name == 'event_id' else converters[kind].format(key=name)
+        )
+        for name, kind in layout.fields
+    )
+    function_name = f"decode_{layout.event_type}"
+    source = (
+        f"def {function_name}(d):\n"
+        f"    return event_class(\n{arguments}\n    )\n"
+    )
+    
+    namespace = {
+        'event_class': layout.event_class,
+        'UUID': UUID,
+        'uuid_get': interner.get,
+        'parse_uuid': interner.parse,
+        'fromisoformat': datetime.fromisoformat,
+    }
+    exec(compile(source, f"<json decoder {layout.event_type}>", "exec"), namespace)
+    return namespace[function_name]
+
+
+class EventCodec:
+    """
+    Encodes events as self-delimiting records.
+    
+    A record may carry a global log position. Segments are sequences of
+    records, so codecs also know how to split a byte range into records
+    and to tell whether an offset is a record boundary.
+    """
+    
+    name: str = ""
+    suffix: str = ""
+    
+    def __init__(self, registry: Optional[EventRegistry] = None):
+        self.registry = registry or default_registry
+    
+    def encode(self, event: DomainEvent, position: Optional[int] = None) -> bytes:
+        """Encode an event as one complete record"""
+        raise NotImplementedError
+    
+    def decode(self, record: bytes) -> Tuple[Optional[int], DomainEvent]:
+        """Decode one record into (position or None, event)"""
+        raise NotImplementedError
+    
+    def iter_records(self, content: bytes) -> Iterator[Tuple[int, bytes]]:
+        """Yield (offset, record) for each complete record in ``content``"""
+        raise NotImplementedError
+    
+    def is_record_start(self, file_path: Path, offset: int) -> bool:
+        """Check that ``offset`` in a segment is the start of a record"""
+        raise NotImplementedError
+    
+    def decode_all(self, content: bytes) -> List[Tuple[Optional[int], DomainEvent]]:
+        """Decode every complete record in ``content``"""
+        return [self.decode(record) for _, record in self.iter_records(content)]
+    
+    def record_offsets(self, content: bytes, base: int = 0) -> List[int]:
+        """Get the offset of every complete record in ``content``"""
+        return [base + offset for offset, _ in self.iter_records(content)]
+
+
+class JsonEventCodec(EventCodec):
+    """One compact JSON object per line (JSON Lines)"""
+    
+    name = "json"
+    suffix = ".jsonl"
+    
+    def __init__(self, registry: Optional[EventRegistry] = None):
+        super().__init__(registry)
+        interner = _UUIDInterner()
+        self._decoders: Dict[str, Callable[[dict], DomainEvent]] = {
+            layout.event_type: compile_json_decoder(layout, interner)
+            for layout in self.registry
+        }
+    
+    def encode(self, event: DomainEvent, position: Optional[int] = None) -> bytes:
+        event_dict = event.to_dict()
+        if position is not None:
+            event_dict = {'position': position, **event_dict}
+        return self.encode_dict(event_dict)
+    
+    @staticmethod
+    def encode_dict(event_dict: dict) -> bytes:
+        """Encode an already serialized event dictionary"""
+        return (json.dumps(event_dict, separators=(",", ":")) + "\n").encode("utf-8")
+    
+    def decode(self, record: bytes) -> Tuple[Optional[int], DomainEvent]:
+        event_dict = json.loads(record)
+        position = event_dict.pop('position', None)
+        return position, self.from_dict(event_dict)
+    
+    def from_dict(self, event_dict: dict) -> DomainEvent:
+        """Deserialize event from its dictionary form (input is not modified)"""
+        decoder = self._decoders.get(event_dict['event_type'])
+        if decoder is not None:
+            try:
+                return decoder(event_dict)
+            except KeyError:
+                pass
+        return self._from_partial_dict(event_dict)
+    
+    def _from_partial_dict(self, event_dict: dict) -> DomainEvent:
+        """Deserialize an event dict that may omit fields"""
+        layout = self.registry.by_name(event_dict['event_type'])
+        
+        kwargs = {}
+        for name, kind in layout.fields:
+            if name not in event_dict:
+                continue
+            value = event_dict[name]
+            if value is not None:
+                if kind == UUID_FIELD:
+                    value = UUID(value)
+                elif kind == DATETIME_FIELD:
+                    value = datetime.fromisoformat(value)
+            kwargs[name] = value
+        
+        return layout.event_class(**kwargs)
+    
+    def iter_records(self, content: bytes) -> Iterator[Tuple[int, bytes]]:
+        offset = 0
+        for line in content.splitlines(keepends=True):
+            # A line without its newline is a torn (uncommitted) write
+            if line.endswith(b"\n") and line.strip():
+                yield offset, line
+            offset += len(line)
+    
+    def is_record_start(self, file_path: Path, offset: int) -> bool:
+        if offset == 0:
+            return True
+        with open(file_path, 'rb') as f:
+            f.seek(offset - 1)
+            return f.read(1) == b"\n"
+
+
+class BinaryEventCodec(EventCodec):
+    """
+    Length-prefixed binary records with fixed per-class field layouts.
+    
+    Record layout (little endian)::
+    
+        uint32 length | uint8 type_id | uint8 flags | uint32 null_mask
+        [uint64 position] | fixed fields | (uint32 length, utf-8) per str
+    
+    UUIDs are stored as 16 raw bytes and datetimes as int64 microseconds
+    since the Unix epoch (naive UTC, like the domain events).
+    """
+    
+    name = "binary"
+    suffix = ".evb"
+    
+    _FRAME = struct.Struct("<I")
+    _HEADER = struct.Struct("<BBI")
+    _POSITION = struct.Struct("<Q")
+    _STR_LENGTH = struct.Struct("<I")
+    _HAS_POSITION = 0x01
+    _EPOCH = datetime(1970, 1, 1)
+    _FIXED_FORMATS = {UUID_FIELD: "16s", DATETIME_FIELD: "q", INT_FIELD: "q"}
+    
+    def __init__(self, registry: Optional[EventRegistry] = None):
+        super().__init__(registry)
+        self._fixed: Dict[int, struct.Struct] = {}
+        for layout in self.registry:
+            fmt = "".join(
+                self._FIXED_FORMATS[kind] for _, kind in layout.fields
+                if kind != STR_FIELD
+            )
+            self._fixed[layout.type_id] = struct.Struct("<" + fmt)
+    
+    def _to_micros(self, value: datetime) -> int:
+        """Convert a datetime to epoch microseconds"""
+        if value.tzinfo is not None:
+            value = value.astimezone(timezone.utc).replace(tzinfo=None)
+        return (value - self._EPOCH) // timedelta(microseconds=1)
+    
+    def encode(self, event: DomainEvent, position: Optional[int] = None) -> bytes:
+        layout = self.registry.by_name(event.event_type)
+        
+        null_mask = 0
+        fixed_values = []
+        strings = []
+        for bit, (name, kind) in enumerate(layout.fields):
+            value = getattr(event, name)
+            if value is None:
+                null_mask |= 1 << bit
+            if kind == STR_FIELD:
+                strings.append((value or "").encode("utf-8"))
+            elif kind == UUID_FIELD:
+                fixed_values.append(value.bytes if value is not None else bytes(16))
+            elif kind == DATETIME_FIELD:
+                fixed_values.append(self._to_micros(value) if value is not None else 0)
+            else:
+                fixed_values.append(value if value is not None else 0)
+        
+        flags = self._HAS_POSITION if position is not None else 0
+        parts = [self._HEADER.pack(layout.type_id, flags, null_mask)]
+        if position is not None:
+            parts.append(self._POSITION.pack(position))
+        parts.append(self._fixed[layout.type_id].pack(*fixed_values))
+        for data in strings:
+            parts.append(self._STR_LENGTH.pack(len(data)))
+            parts.append(data)
+        
+        payload = b"".join(parts)
+        return self._FRAME.pack(len(payload)) + payload
+    
+    def decode(self, record: bytes) -> Tuple[Optional[int], DomainEvent]:
+        cursor = self._FRAME.size
+        type_id, flags, null_mask = self._HEADER.unpack_from(record, cursor)
+        cursor += self._HEADER.size
+        
+        position = None
+        if flags & self._HAS_POSITION:
+            (position,) = self._POSITION.unpack_from(record, cursor)
+            cursor += self._POSITION.size
+        
+        layout = self.registry.by_id(type_id)
+        fixed = self._fixed[type_id]
+        fixed_values = iter(fixed.unpack_from(record, cursor))
+        cursor += fixed.size
+        
+        kwargs = {}
+        for bit, (name, kind) in enumerate(layout.fields):
+            if kind == STR_FIELD:
+                (length,) = self._STR_LENGTH.unpack_from(record, cursor)
+                cursor += self._STR_LENGTH.size
+                value = record[cursor:cursor + length].decode("utf-8")
+                cursor += length
+            else:
+                value = next(fixed_values)
+                if kind == UUID_FIELD:
+                    value = UUID(bytes=value)
+                elif kind == DATETIME_FIELD:
+                    value = self._EPOCH + timedelta(microseconds=value)
+            kwargs[name] = None if null_mask & (1 << bit) else value
+        
+        return position, layout.event_class(**kwargs)
+    
+    def iter_records(self, content: bytes) -> Iterator[Tuple[int, bytes]]:
+        offset = 0
+        size = len(content)
+        while offset + self._FRAME.size <= size:
+            (length,) = self._FRAME.unpack_from(content, offset)
+            end = offset + self._FRAME.size + length
+            if end > size:
+                # Torn (uncommitted) trailing record
+                return
+            yield offset, content[offset:end]
+            offset = end
+    
+    def is_record_start(self, file_path: Path, offset: int) -> bool:
+        with open(file_path, 'rb') as f:
+            size = f.seek(0, 2)
+            f.seek(offset)
+            head = f.read(self._FRAME.size + self._HEADER.size)
+        if len(head) < self._FRAME.size + self._HEADER.size:
+            return False
+        (length,) = self._FRAME.unpack_from(head)
+        type_id = head[self._FRAME.size]
+        return (
+            offset + self._FRAME.size + length <= size
+            and any(layout.type_id == type_id for layout in self.registry)
+        )
+
+
+CODECS = {
+    JsonEventCodec.name: JsonEventCodec,
+    BinaryEventCodec.name: BinaryEventCodec,
+}
+
+
+def get_codec(name: str, registry: Optional[EventRegistry] = None) -> EventCodec:
+    """
+    Create a codec by name.
+    
+    Args:
+        name: ``json`` or ``binary``
+        registry: Event registry (default: the inventory events)
+    """
+    codec_class = CODECS.get(name)
+    if codec_class is None:
+        raise ValueError(f"Unknown event codec: {name}")
+    return codec_class(registry)
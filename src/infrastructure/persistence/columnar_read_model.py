@@ -0,0 +1,208 @@
+"""Columnar snapshot of the inventory read model for analytical queries"""
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from uuid import UUID
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional
+    np = None
+
+from .loop_blocking import LoopBlockingMonitor
+
+
+NUMPY_AVAILABLE = np is not None
+
+
+class ColumnarReadModel:
+    """
+    Inventory cells as NumPy columns, for whole-catalog questions.
+    
+    Product and store ids are interned to dense integer codes; each cell
+    is one row of parallel arrays (product code, store code, available,
+    reserved, total, version) that grow by doubling. A dictionary maps
+    (product code, store code) to the row, so upserts are O(1), while
+    filters and rankings run vectorized over all rows:
+    - ``cells_below``: cells whose available stock is under a threshold
+    - ``top_products_by_reserved``: per-product reserved totals
+      (``bincount``) ranked with ``argpartition``
+    
+    Requires numpy (``pip install numpy``).
+    """
+    
+    def __init__(self, initial_capacity: int = 1024):
+        """
+        Initialize columnar model.
+        
+        Args:
+            initial_capacity: Rows allocated up front
+        
+        Raises:
+            ImportError: If numpy is not installed
+        """
+        if np is None:
+            raise ImportError("ColumnarReadModel requires numpy (pip install numpy)")
+        self._product_codes: Dict[str, int] = {}
+        self._product_ids: List[str] = []
+        self._store_codes: Dict[str, int] = {}
+        self._store_ids: List[str] = []
+        self._rows: Dict[Tuple[int, int], int] = {}
+        self._size = 0
+        self._allocate(max(initial_capacity, 1))
+        self._blocking = LoopBlockingMonitor()
+    
+    def _allocate(self, capacity: int) -> None:
+        """Create empty columns"""
+        self._product = np.zeros(capacity, dtype=np.int32)
+        self._store = np.zeros(capacity, dtype=np.int32)
+        self._available = np.zeros(capacity, dtype=np.int64)
+        self._reserved = np.zeros(capacity, dtype=np.int64)
+        self._total = np.zeros(capacity, dtype=np.int64)
+        self._version = np.zeros(capacity, dtype=np.int64)
+    
+    def _grow(self) -> None:
+        """Double the capacity of every column"""
+        capacity = len(self._product) * 2
+        for name in ('_product', '_store', '_available', '_reserved', '_total', '_version'):
+            column = getattr(self, name)
+            grown = np.zeros(capacity, dtype=column.dtype)
+            grown[:self._size] = column[:self._size]
+            setattr(self, name, grown)
+    
+    @staticmethod
+    def _intern(value: str, codes: Dict[str, int], ids: List[str]) -> int:
+        """Get the dense code of an id, assigning the next one if new"""
+        code = codes.get(value)
+        if code is None:
+            code = codes[value] = len(ids)
+            ids.append(value)
+        return code
+    
+    def upsert(
+        self,
+        product_id: UUID,
+        store_id: UUID,
+        available: int,
+        reserved: int,
+        version: int = 0
+    ) -> None:
+        """
+        Set the stock levels of a cell.
+        
+        Args:
+            product_id: Product identifier
+            store_id: Store identifier
+            available: Available quantity
+            reserved: Reserved quantity
+            version: Aggregate version the levels reflect
+        """
+        product = self._intern(str(product_id), self._product_codes, self._product_ids)
+        store = self._intern(str(store_id), self._store_codes, self._store_ids)
+        row = self._rows.get((product, store))
+        if row is None:
+            if self._size == len(self._product):
+                self._grow()
+            row = self._rows[(product, store)] = self._size
+            self._size += 1
+            self._product[row] = product
+            self._store[row] = store
+        self._available[row] = available
+        self._reserved[row] = reserved
+        self._total[row] = available + reserved
+        self._version[row] = version
+    
+    def load(self, entries: Iterable[Dict]) -> None:
+        """
+        Replace every cell with read-model entries.
+        
+        Args:
+            entries: Dictionaries with product_id, store_id, available,
+                reserved and (optionally) version
+        """
+        self.clear()
+        for entry in entries:
+            self.upsert(
+                entry['product_id'],
+                entry['store_id'],
+                entry['available'],
+                entry['reserved'],
+                entry.get('version', 0)
+            )
+    
+    def clear(self) -> None:
+        """Remove every cell and interned id"""
+        self._product_codes = {}
+        self._product_ids = []
+        self._store_codes = {}
+        self._store_ids = []
+        self._rows = {}
+        self._size = 0
+        self._allocate(len(self._product))
+    
+    def _cell(self, row: int) -> Dict[str, Any]:
+        """Convert a row to a read-model style entry"""
+        return {
+            'product_id': self._product_ids[self._product[row]],
+            'store_id': self._store_ids[self._store[row]],
+            'available': int(self._available[row]),
+            'reserved': int(self._reserved[row]),
+            'total': int(self._total[row]),
+            'version': int(self._version[row]),
+        }
+    
+    async def cells_below(self, threshold: int, limit: Optional[int] = None) -> List[Dict]:
+        """
+        Get cells whose available stock is below a threshold.
+        
+        Args:
+            threshold: Exclusive upper bound on available stock
+            limit: Maximum cells returned (the lowest stock first)
+        
+        Returns:
+            Matching cells, lowest available first
+        """
+        with self._blocking.measure("cells_below"):
+            available = self._available[:self._size]
+            rows = np.flatnonzero(available < threshold)
+            if limit is not None and limit < len(rows):
+                rows = rows[np.argpartition(available[rows], limit - 1)[:limit]]
+            rows = rows[np.argsort(available[rows], kind='stable')]
+            return [self._cell(row) for row in rows]
+    
+    async def top_products_by_reserved(self, limit: int) -> List[Dict]:
+        """
+        Get the products with the most stock reserved across all stores.
+        
+        Args:
+            limit: Number of products returned
+        
+        Returns:
+            Dictionaries with product_id and reserved, most reserved first
+        """
+        with self._blocking.measure("top_products_by_reserved"):
+            products = len(self._product_ids)
+            if limit <= 0 or products == 0:
+                return []
+            totals = np.bincount(
+                self._product[:self._size],
+                weights=self._reserved[:self._size],
+                minlength=products
+            ).astype(np.int64)
+            if limit < products:
+                top = np.argpartition(-totals, limit - 1)[:limit]
+            else:
+                top = np.arange(products)
+            top = top[np.argsort(-totals[top], kind='stable')]
+            return [
+                {'product_id': self._product_ids[code], 'reserved': int(totals[code])}
+                for code in top
+            ]
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get columnar model statistics"""
+        return {
+            'cells': self._size,
+            'capacity': len(self._product),
+            'products': len(self._product_ids),
+            'stores': len(self._store_ids),
+            'loop_blocking': self._blocking.get_stats(),
+        }
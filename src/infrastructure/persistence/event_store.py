@@ -1,56 +1,222 @@
-"""Event Store implementation using JSON file storage"""
+"""Event Store implementation using append-only segment files"""
 import asyncio
+import hashlib
 import json
 import os
-from datetime import datetime
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
 from pathlib import Path
-from typing import List, Optional
-from uuid import UUID
+from typing import Any, AsyncContextManager, AsyncIterator, Awaitable, Dict, Iterator, List, Optional
 
 import aiofiles
 
 from ...domain.events.base import DomainEvent
-from ...domain.events.inventory_events import (
-    StockAdded,
-    StockReserved,
-    ReservationCommitted,
-    ReservationReleased,
-    StockAdjusted,
-)
 from ...domain.exceptions.inventory_exceptions import ConcurrencyError
+from .codecs import EventCodec, JsonEventCodec
+from .group_commit import GroupCommitter
+from .lock_manager import StripedLockManager, file_lock
+from .offset_index import OffsetIndex, read_from
+
+
+_json_codec = JsonEventCodec()
+
+
+def deserialize_event(event_dict: dict) -> DomainEvent:
+    """Deserialize event from dictionary"""
+    return _json_codec.from_dict(event_dict)
+
+
+@dataclass
+class RecordedEvent:
+    """An event together with its position in the global log"""
+    position: int
+    event: DomainEvent
 
 
 class EventStore:
     """
-    Event Store implementation using JSON file storage.
+    Event Store implementation using append-only file storage.
+    
+    Each aggregate owns one segment file holding its serialized events
+    back to back (JSON Lines by default, or any other ``EventCodec``).
+    Segments are only ever opened in append mode, so the cost of a write
+    does not depend on the length of the history.
     
     Provides:
     - Append-only event log
     - Optimistic locking via version numbers
     - Event replay capability
+    - Migration of legacy ``.json`` array files
+    - Optional group commit: concurrent appends are flushed together
+      with one fsync per touched file per batch
+    - A sidecar offset index per segment, so tail reads seek straight to
+      the first requested version
+    - A global ordered log of every committed event ($all stream), read
+      in position order with ``read_all``
+    - Optional hash-sharded directory layout (``shard_depth`` levels of
+      two-hex-digit subdirectories), with online relocation of streams
+    - A bounded striped writer lock table with wait and contention stats
+    - Optional multi-process mode: ``fcntl`` advisory locks per lock stripe
+      and for the global log, with versions and log position re-read from
+      disk under the lock, so several worker processes can share a store
     """
     
-    def __init__(self, storage_path: str = "data/events"):
+    LEGACY_SUFFIX = ".json"
+    INDEX_SUFFIX = ".idx"
+    GLOBAL_LOG_DIR = "_all"
+    LOCK_DIR = ".locks"
+    
+    def __init__(
+        self, 
+        storage_path: str = "data/events",
+        group_commit: bool = False,
+        group_commit_window_ms: float = 2.0,
+        group_commit_max_batch: int = 64,
+        codec: Optional[EventCodec] = None,
+        shard_depth: int = 0,
+        lock_stripes: int = 1024,
+        multi_process: bool = False
+    ):
         """
         Initialize event store.
         
         Args:
             storage_path: Directory to store event files
+            group_commit: Batch concurrent appends into durable (fsynced)
+                group flushes instead of unsynced per-append writes
+            group_commit_window_ms: Maximum time an append waits for others
+                to join its batch
+            group_commit_max_batch: Appends that trigger an immediate flush
+            codec: Record format of segments and the global log
+                (default: JSON Lines). A store must be reopened with the
+                codec it was written with.
+            shard_depth: Levels of hash-prefix subdirectories for segment
+                files (0 keeps the flat layout, 2 gives ``ab/cd/...``)
+            lock_stripes: Size of the fixed writer lock table shared by
+                all aggregates (must match across processes)
+            multi_process: Coordinate with other processes using the same
+                directory (e.g. uvicorn workers) through file locks
         """
+        if not 0 <= shard_depth <= 4:
+            raise ValueError(f"shard_depth must be between 0 and 4: {shard_depth}")
+        self.shard_depth = shard_depth
+        self.codec = codec or JsonEventCodec()
         self.storage_path = Path(storage_path)
         self.storage_path.mkdir(parents=True, exist_ok=True)
-        self._locks = {}
+        self.multi_process = multi_process
+        lock_dir = self.storage_path / self.LOCK_DIR
+        self._locks = StripedLockManager(
+            stripes=lock_stripes, 
+            lock_dir=lock_dir if multi_process else None
+        )
+        self._global_lock_path = lock_dir / "global.lock"
+        self._group_committer = (
+            GroupCommitter(group_commit_window_ms, group_commit_max_batch)
+            if group_commit else None
+        )
+        # Current version per aggregate, populated lazily and kept up to
+        # date on every append
+        self._versions: Dict[str, int] = {}
+        # Resolved directory per aggregate (sharded layout only)
+        self._stream_dirs: Dict[str, Path] = {}
+        # Global log: last assigned position and last durable position
+        self._global_lock = asyncio.Lock()
+        self._global_position: Optional[int] = None
+        self._global_committed = 0
+    
+    def _lock(self, aggregate_id: str) -> AsyncContextManager[None]:
+        """Hold the writer lock for an aggregate"""
+        return self._locks.acquire(aggregate_id)
+    
+    @asynccontextmanager
+    async def _global_guard(self) -> AsyncIterator[None]:
+        """
+        Hold the global log lock.
+        
+        In multi-process mode the cached log position is dropped so it is
+        re-read from disk while other processes are locked out.
+        """
+        async with self._global_lock:
+            if not self.multi_process:
+                yield
+                return
+            async with file_lock(self._global_lock_path):
+                self._global_position = None
+                yield
+    
+    def _safe_id(self, aggregate_id: str) -> str:
+        """Get filesystem-safe name for an aggregate"""
+        return aggregate_id.replace(":", "_")
     
-    def _get_lock(self, aggregate_id: str) -> asyncio.Lock:
-        """Get or create lock for an aggregate"""
-        if aggregate_id not in self._locks:
-            self._locks[aggregate_id] = asyncio.Lock()
-        return self._locks[aggregate_id]
+    def _shard_dir(self, aggregate_id: str) -> Path:
+        """Get the directory an aggregate belongs in under the configured layout"""
+        if not self.shard_depth:
+            return self.storage_path
+        digest = hashlib.sha1(aggregate_id.encode("utf-8")).hexdigest()
+        return self.storage_path.joinpath(
+            *(digest[2 * level:2 * level + 2] for level in range(self.shard_depth))
+        )
+    
+    def _stream_dir(self, aggregate_id: str) -> Path:
+        """
+        Get the directory currently holding an aggregate's segment.
+        
+        Streams written before sharding was enabled stay readable and
+        appendable in the flat directory until they are relocated.
+        """
+        if not self.shard_depth:
+            return self.storage_path
+        
+        directory = self._stream_dirs.get(aggregate_id)
+        if directory is None:
+            directory = self._shard_dir(aggregate_id)
+            name = f"{self._safe_id(aggregate_id)}{self.codec.suffix}"
+            if (
+                not (directory / name).exists()
+                and (self.storage_path / name).exists()
+            ):
+                directory = self.storage_path
+            self._stream_dirs[aggregate_id] = directory
+        return directory
     
     def _event_file_path(self, aggregate_id: str) -> Path:
-        """Get file path for aggregate's events"""
-        safe_id = aggregate_id.replace(":", "_")
-        return self.storage_path / f"{safe_id}.json"
+        """Get segment file path for aggregate's events"""
+        path = self._stream_dir(aggregate_id) / f"{self._safe_id(aggregate_id)}{self.codec.suffix}"
+        if self.shard_depth and not path.exists() and aggregate_id in self._stream_dirs:
+            # The stream may have been relocated since it was resolved
+            del self._stream_dirs[aggregate_id]
+            path = self._stream_dir(aggregate_id) / path.name
+        return path
+    
+    def _index(self, aggregate_id: str) -> OffsetIndex:
+        """Get the offset index of an aggregate's segment"""
+        return OffsetIndex(
+            self._stream_dir(aggregate_id) / f"{self._safe_id(aggregate_id)}{self.INDEX_SUFFIX}",
+            self.codec
+        )
+    
+    @property
+    def _global_log_path(self) -> Path:
+        """Get path of the global ($all) log"""
+        return self.storage_path / self.GLOBAL_LOG_DIR / f"log{self.codec.suffix}"
+    
+    @property
+    def _global_index(self) -> OffsetIndex:
+        """Get the position index of the global log"""
+        return OffsetIndex(self._global_log_path.with_suffix(self.INDEX_SUFFIX), self.codec)
+    
+    def _legacy_file_path(self, aggregate_id: str) -> Path:
+        """Get path of the legacy JSON array file for an aggregate"""
+        return self.storage_path / f"{self._safe_id(aggregate_id)}{self.LEGACY_SUFFIX}"
+    
+    @staticmethod
+    def _record_offsets(records: List[bytes], base: int) -> List[int]:
+        """Get the offsets records will occupy when appended at ``base``"""
+        offsets = []
+        for record in records:
+            offsets.append(base)
+            base += len(record)
+        return offsets
     
     async def append_events(
         self, 
@@ -72,11 +238,8 @@ class EventStore:
         if not events:
             return
         
-        lock = self._get_lock(aggregate_id)
-        async with lock:
-            # Load current events
-            current_events = await self.load_events(aggregate_id)
-            current_version = len(current_events)
+        async with self._lock(aggregate_id):
+            current_version = await self._current_version(aggregate_id)
             
             # Check optimistic lock
             if current_version != expected_version:
@@ -85,23 +248,163 @@ class EventStore:
                     f"found {current_version}"
                 )
             
-            # Serialize events
-            event_dicts = [event.to_dict() for event in events]
+            # Convert a legacy array file before the first append to it
+            if self._legacy_file_path(aggregate_id).exists():
+                await self._migrate_legacy_file(self._legacy_file_path(aggregate_id))
             
-            # Append to file
+            # Serialize events, one record each
+            records = [self.codec.encode(event) for event in events]
             file_path = self._event_file_path(aggregate_id)
+            if not file_path.exists():
+                file_path.parent.mkdir(parents=True, exist_ok=True)
+            writes = [self._stage_write(file_path, b"".join(records))]
+            
+            # Extend the offset index; a stale one is rebuilt on next read
+            index = self._index(aggregate_id)
+            if index.is_current(current_version):
+                base = file_path.stat().st_size if file_path.exists() else 0
+                offsets = self._record_offsets(records, base)
+                writes.append(self._stage_write(index.path, index.encode(offsets)))
             
-            if file_path.exists():
-                async with aiofiles.open(file_path, 'r') as f:
-                    content = await f.read()
-                    stored_events = json.loads(content) if content else []
-            else:
-                stored_events = []
+            # Append to segment (never rewritten) and index, then publish to
+            # the global log; with group commit all land in one batch
+            if self._group_committer is None:
+                await asyncio.gather(*writes)
+                writes = []
+            last_position, global_writes = await self._stage_global_records(events)
+            await asyncio.gather(*writes, *global_writes)
             
-            stored_events.extend(event_dicts)
+            self._versions[aggregate_id] = current_version + len(events)
+            self._global_committed = max(self._global_committed, last_position)
+    
+    async def _stage_global_records(self, events: List[DomainEvent]):
+        """
+        Assign global positions to events and stage their log writes.
+        
+        Positions are assigned and writes submitted under the global lock
+        so the log is always in position order. Without group commit (or in
+        multi-process mode) the writes also complete under the lock; with
+        it, they are only queued (batches are flushed in submission order)
+        and awaited by the caller.
+        
+        Returns:
+            Tuple of (last assigned position, awaitables still to wait for)
+        """
+        async with self._global_guard():
+            position = await self._load_global_position()
+            log_path = self._global_log_path
+            
+            records = [
+                self.codec.encode(event, position + offset)
+                for offset, event in enumerate(events, start=1)
+            ]
+            base = log_path.stat().st_size if log_path.exists() else 0
+            index = self._global_index
+            offsets = self._record_offsets(records, base)
+            writes = [
+                self._stage_write(log_path, b"".join(records)),
+                self._stage_write(index.path, index.encode(offsets)),
+            ]
+            self._global_position = position + len(records)
             
-            async with aiofiles.open(file_path, 'w') as f:
-                await f.write(json.dumps(stored_events, indent=2))
+            # Other processes derive positions from the log on disk, so it
+            # must be complete before the file lock is released
+            if self.multi_process and self._group_committer is not None:
+                await self._group_committer.flush()
+            if self._group_committer is None or self.multi_process:
+                await asyncio.gather(*writes)
+                writes = []
+            
+            return self._global_position, writes
+    
+    async def _load_global_position(self) -> int:
+        """Get the last assigned global position, scanning the log on first use"""
+        if self._global_position is None:
+            log_path = self._global_log_path
+            log_path.parent.mkdir(parents=True, exist_ok=True)
+            
+            loop = asyncio.get_running_loop()
+            index = self._global_index
+            count = await loop.run_in_executor(None, index.recover, log_path)
+            self._global_position = count
+            self._global_committed = max(self._global_committed, count)
+        return self._global_position
+    
+    async def read_all(
+        self, 
+        from_position: int = 0, 
+        batch_size: int = 500
+    ) -> List[RecordedEvent]:
+        """
+        Read committed events across all aggregates in commit order.
+        
+        Args:
+            from_position: Last position the consumer has seen (exclusive)
+            batch_size: Maximum number of events to return
+        
+        Returns:
+            Up to ``batch_size`` events with positions after ``from_position``
+        """
+        async with self._global_guard():
+            await self._load_global_position()
+        head = self._global_committed
+        if from_position >= head:
+            return []
+        
+        log_path = self._global_log_path
+        index = self._global_index
+        end_position = min(from_position + batch_size, head)
+        start = index.lookup(from_position)
+        end = index.lookup(end_position) if end_position < head else None
+        if start is None or not self.codec.is_record_start(log_path, start):
+            start, end = 0, None
+        
+        loop = asyncio.get_running_loop()
+        content = await loop.run_in_executor(None, read_from, log_path, start, end)
+        
+        return [
+            RecordedEvent(position, event)
+            for position, event in self.codec.decode_all(content)
+            if from_position < position <= end_position
+        ]
+    
+    async def get_global_position(self) -> int:
+        """Get the position of the last committed event in the global log"""
+        async with self._global_guard():
+            await self._load_global_position()
+        return self._global_committed
+    
+    def _stage_write(self, file_path: Path, data: bytes) -> Awaitable[None]:
+        """
+        Start appending bytes to a file.
+        
+        With group commit the write is queued immediately and the returned
+        future resolves once its batch is durable.
+        """
+        if self._group_committer is not None:
+            return self._group_committer.submit(file_path, data)
+        return self._append_to_file(file_path, data)
+    
+    async def _append_to_file(self, file_path: Path, data: bytes) -> None:
+        """Append bytes to a file"""
+        async with aiofiles.open(file_path, 'ab') as f:
+            await f.write(data)
+    
+    async def close(self) -> None:
+        """Flush pending group-commit batches"""
+        if self._group_committer is not None:
+            await self._group_committer.flush()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get event store statistics"""
+        stats: Dict[str, Any] = {
+            'tracked_aggregates': len(self._versions),
+            'global_position': self._global_committed,
+            'locks': self._locks.get_stats(),
+        }
+        if self._group_committer is not None:
+            stats['group_commit'] = self._group_committer.get_stats()
+        return stats
     
     async def load_events(
         self, 
@@ -120,55 +423,212 @@ class EventStore:
         """
         file_path = self._event_file_path(aggregate_id)
         
-        if not file_path.exists():
+        if file_path.exists():
+            offset = 0
+            if from_version:
+                if from_version >= await self._current_version(aggregate_id):
+                    return []
+                offset = await self._tail_offset(aggregate_id, from_version)
+            
+            loop = asyncio.get_running_loop()
+            try:
+                content = await loop.run_in_executor(None, read_from, file_path, offset)
+            except FileNotFoundError:
+                # Relocated between resolution and read
+                content = await loop.run_in_executor(
+                    None, read_from, self._event_file_path(aggregate_id), offset
+                )
+            events = [event for _, event in self.codec.decode_all(content)]
+        elif self._legacy_file_path(aggregate_id).exists():
+            events = await self._load_legacy_events(self._legacy_file_path(aggregate_id))
+        else:
             return []
         
-        async with aiofiles.open(file_path, 'r') as f:
+        if from_version is None:
+            return events
+        return [event for event in events if event.version > from_version]
+    
+    async def _load_legacy_events(self, legacy_path: Path) -> List[DomainEvent]:
+        """Load events from a legacy JSON array file"""
+        async with aiofiles.open(legacy_path, 'r') as f:
             content = await f.read()
+        event_dicts = json.loads(content) if content else []
+        return [self._deserialize_event(event_dict) for event_dict in event_dicts]
+    
+    async def _tail_offset(self, aggregate_id: str, from_version: int) -> int:
+        """
+        Find where the events after ``from_version`` start in the segment.
+        
+        Rebuilds a stale index under the aggregate lock; falls back to the
+        start of the segment if the offset still cannot be trusted.
+        """
+        file_path = self._event_file_path(aggregate_id)
+        index = self._index(aggregate_id)
+        
+        for attempt in range(2):
+            if index.is_current(await self._current_version(aggregate_id)):
+                offset = index.lookup(from_version)
+                if offset is not None and self.codec.is_record_start(file_path, offset):
+                    return offset
+            if attempt == 0:
+                async with self._lock(aggregate_id):
+                    loop = asyncio.get_running_loop()
+                    await loop.run_in_executor(None, index.rebuild, file_path)
+        
+        return 0
+    
+    async def migrate_legacy_files(self) -> int:
+        """
+        Convert every legacy ``.json`` array file into a segment.
+        
+        Safe to run while the store is serving requests: each file is
+        converted under its aggregate lock.
+        
+        Returns:
+            Number of files migrated
+        """
+        migrated = 0
+        for legacy_path in sorted(self.storage_path.glob(f"*{self.LEGACY_SUFFIX}")):
+            async with aiofiles.open(legacy_path, 'r') as f:
+                content = await f.read()
             event_dicts = json.loads(content) if content else []
+            
+            if not event_dicts:
+                legacy_path.unlink()
+                continue
+            
+            aggregate_id = event_dicts[0]['aggregate_id']
+            async with self._lock(aggregate_id):
+                if legacy_path.exists():
+                    await self._migrate_legacy_file(legacy_path)
+                    migrated += 1
         
-        events = []
-        for event_dict in event_dicts:
-            event = self._deserialize_event(event_dict)
-            if from_version is None or event.version > from_version:
-                events.append(event)
+        return migrated
+    
+    async def _migrate_legacy_file(self, legacy_path: Path) -> None:
+        """Rewrite a legacy array file as a segment (caller holds the lock)"""
+        async with aiofiles.open(legacy_path, 'r') as f:
+            content = await f.read()
+        event_dicts = json.loads(content) if content else []
         
-        return events
+        events = [self._deserialize_event(event_dict) for event_dict in event_dicts]
+        if not events:
+            legacy_path.unlink()
+            return
+        
+        aggregate_id = events[0].aggregate_id
+        segment_path = self._event_file_path(aggregate_id)
+        segment_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = segment_path.with_name(segment_path.name + ".tmp")
+        async with aiofiles.open(tmp_path, 'wb') as f:
+            await f.write(b"".join(self.codec.encode(event) for event in events))
+            await f.flush()
+            os.fsync(f.fileno())
+        
+        os.replace(tmp_path, segment_path)
+        legacy_path.unlink()
+        self._index(aggregate_id).path.unlink(missing_ok=True)
+        
+        # Legacy events were never part of the global log
+        last_position, writes = await self._stage_global_records(events)
+        await asyncio.gather(*writes)
+        self._global_committed = max(self._global_committed, last_position)
     
-    def _deserialize_event(self, event_dict: dict) -> DomainEvent:
-        """Deserialize event from dictionary"""
-        event_type = event_dict['event_type']
-        
-        # Convert string UUIDs back to UUID objects
-        for key, value in event_dict.items():
-            if key.endswith('_id') and isinstance(value, str):
-                try:
-                    event_dict[key] = UUID(value)
-                except (ValueError, AttributeError):
-                    pass
-            elif key == 'timestamp' and isinstance(value, str):
-                event_dict[key] = datetime.fromisoformat(value)
-        
-        # Map event type to class
-        event_classes = {
-            'StockAdded': StockAdded,
-            'StockReserved': StockReserved,
-            'ReservationCommitted': ReservationCommitted,
-            'ReservationReleased': ReservationReleased,
-            'StockAdjusted': StockAdjusted,
-        }
+    async def relocate_streams(self) -> int:
+        """
+        Move every segment (and its index) to the directory the configured
+        shard layout assigns it.
         
-        event_class = event_classes.get(event_type)
-        if not event_class:
-            raise ValueError(f"Unknown event type: {event_type}")
+        Safe to run while the store is serving requests: each stream is
+        moved under its aggregate lock with atomic renames, and readers
+        re-resolve a stream that disappears from its old location.
         
-        # Remove event_type from dict before creating instance
-        event_dict_copy = event_dict.copy()
-        event_dict_copy.pop('event_type', None)
+        Returns:
+            Number of streams moved
+        """
+        moved = 0
+        for segment_path in list(self.iter_segment_paths()):
+            aggregate_id = await self._read_aggregate_id(segment_path)
+            if aggregate_id is None:
+                continue
+            
+            target_dir = self._shard_dir(aggregate_id)
+            if segment_path.parent == target_dir:
+                continue
+            
+            async with self._lock(aggregate_id):
+                target_path = target_dir / segment_path.name
+                if not segment_path.exists() or target_path.exists():
+                    continue
+                
+                target_dir.mkdir(parents=True, exist_ok=True)
+                index_path = segment_path.with_suffix(self.INDEX_SUFFIX)
+                if index_path.exists():
+                    os.replace(index_path, target_dir / index_path.name)
+                os.replace(segment_path, target_path)
+                self._stream_dirs.pop(aggregate_id, None)
+                moved += 1
         
-        return event_class(**event_dict_copy)
+        return moved
+    
+    async def iter_aggregate_ids(self) -> AsyncIterator[str]:
+        """Yield the id of every aggregate with a segment, in any layout"""
+        for segment_path in self.iter_segment_paths():
+            aggregate_id = await self._read_aggregate_id(segment_path)
+            if aggregate_id is not None:
+                yield aggregate_id
+    
+    def iter_segment_paths(self) -> Iterator[Path]:
+        """Walk all segment files, skipping the global log"""
+        global_dir = self.storage_path / self.GLOBAL_LOG_DIR
+        for segment_path in self.storage_path.rglob(f"*{self.codec.suffix}"):
+            if global_dir not in segment_path.parents:
+                yield segment_path
+    
+    async def _read_aggregate_id(self, segment_path: Path) -> Optional[str]:
+        """Read the aggregate id from a segment's first record"""
+        def read_first_event() -> Optional[DomainEvent]:
+            try:
+                with open(segment_path, 'rb') as f:
+                    chunk = f.read(4096)
+                    records = list(self.codec.iter_records(chunk))
+                    if not records:
+                        records = list(self.codec.iter_records(chunk + f.read()))
+            except FileNotFoundError:
+                return None
+            return self.codec.decode(records[0][1])[1] if records else None
+        
+        loop = asyncio.get_running_loop()
+        event = await loop.run_in_executor(None, read_first_event)
+        return event.aggregate_id if event is not None else None
+    
+    def _deserialize_event(self, event_dict: dict) -> DomainEvent:
+        """Deserialize event from dictionary"""
+        return deserialize_event(event_dict)
     
     async def get_current_version(self, aggregate_id: str) -> int:
         """Get current version of an aggregate"""
-        events = await self.load_events(aggregate_id)
-        return len(events)
+        return await self._current_version(aggregate_id)
+    
+    async def _current_version(self, aggregate_id: str) -> int:
+        """Look up an aggregate's version, counting its events on first use"""
+        version = self._versions.get(aggregate_id)
+        if version is None or self.multi_process:
+            version = await self._count_events(aggregate_id)
+            self._versions[aggregate_id] = version
+        return version
+    
+    async def _count_events(self, aggregate_id: str) -> int:
+        """Count stored events without deserializing them"""
+        file_path = self._event_file_path(aggregate_id)
+        
+        if file_path.exists():
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                None, self._index(aggregate_id).count_records, file_path
+            )
+        
+        if self._legacy_file_path(aggregate_id).exists():
+            return len(await self.load_events(aggregate_id))
+        
+        return 0
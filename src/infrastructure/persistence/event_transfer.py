@@ -0,0 +1,125 @@
+"""Streaming export and import of the global event log"""
+import asyncio
+from typing import BinaryIO, Dict, Iterator, List
+
+from ...domain.events.base import DomainEvent
+from .codecs import EventCodec
+
+
+async def export_events(
+    event_store,
+    output: BinaryIO,
+    codec: EventCodec,
+    batch_size: int = 1000
+) -> int:
+    """
+    Write every committed event, in global order, as codec records.
+    
+    Memory use is bounded by ``batch_size``: the log is paged through
+    with ``read_all`` and each page is written before the next is read.
+    
+    Args:
+        event_store: Any store exposing ``read_all``
+        output: Binary stream to write to
+        codec: Record format of the export (records carry positions)
+        batch_size: Events read per page
+    
+    Returns:
+        Number of events exported
+    """
+    position = 0
+    exported = 0
+    while True:
+        batch = await event_store.read_all(from_position=position, batch_size=batch_size)
+        if not batch:
+            return exported
+        
+        output.write(b"".join(codec.encode(r.event, r.position) for r in batch))
+        position = batch[-1].position
+        exported += len(batch)
+
+
+def iter_event_batches(
+    source: BinaryIO,
+    codec: EventCodec,
+    batch_size: int = 1000,
+    chunk_size: int = 1 << 20
+) -> Iterator[List[DomainEvent]]:
+    """
+    Decode an export stream chunk by chunk.
+    
+    Args:
+        source: Binary stream produced by ``export_events``
+        codec: Record format of the stream
+        batch_size: Events per yielded batch
+        chunk_size: Bytes read per chunk
+    
+    Yields:
+        Lists of up to ``batch_size`` events in stream order
+    
+    Raises:
+        ValueError: If the stream ends in the middle of a record
+    """
+    buffer = b""
+    batch: List[DomainEvent] = []
+    while True:
+        chunk = source.read(chunk_size)
+        buffer += chunk
+        
+        consumed = 0
+        for offset, record in codec.iter_records(buffer):
+            batch.append(codec.decode(record)[1])
+            consumed = offset + len(record)
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+        buffer = buffer[consumed:]
+        
+        if not chunk:
+            break
+    
+    if buffer.strip():
+        raise ValueError("Export stream ends with a truncated record")
+    if batch:
+        yield batch
+
+
+async def import_events(
+    event_store,
+    source: BinaryIO,
+    codec: EventCodec,
+    batch_size: int = 1000
+) -> int:
+    """
+    Append an export stream to a store without replaying commands.
+    
+    Each batch is split into per-aggregate runs that are appended with
+    one ``append_events`` call each, concurrently; batches are applied
+    in order, so every stream keeps its version order and the target's
+    global log keeps the source order up to reordering within a batch.
+    
+    Args:
+        event_store: Any store exposing ``append_events`` (should be empty)
+        source: Binary stream produced by ``export_events``
+        codec: Record format of the stream
+        batch_size: Events decoded and appended per round
+    
+    Returns:
+        Number of events imported
+    
+    Raises:
+        ConcurrencyError: If a stream already exists in the target
+    """
+    imported = 0
+    for batch in iter_event_batches(source, codec, batch_size):
+        streams: Dict[str, List[DomainEvent]] = {}
+        for event in batch:
+            streams.setdefault(event.aggregate_id, []).append(event)
+        
+        await asyncio.gather(*(
+            event_store.append_events(aggregate_id, events, events[0].version - 1)
+            for aggregate_id, events in streams.items()
+        ))
+        imported += len(batch)
+    
+    return imported
@@ -0,0 +1,147 @@
+"""Group commit for file appends with coalesced fsync"""
+import asyncio
+import os
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class GroupCommitter:
+    """
+    Batches appends from concurrent writers into one durable flush.
+    
+    Appends submitted within ``window_ms`` of the first pending one (or
+    until ``max_batch`` appends are waiting) are written together by a
+    single executor call. Every file touched by the batch is fsynced
+    exactly once, however many appends it received, and each caller's
+    awaitable resolves only when the whole batch is on disk.
+    
+    Trade-off: an individual append may wait up to ``window_ms`` longer,
+    in exchange for far fewer fsyncs under concurrent load.
+    """
+    
+    def __init__(self, window_ms: float = 2.0, max_batch: int = 64):
+        """
+        Initialize group committer.
+        
+        Args:
+            window_ms: How long the first append of a batch waits for others
+            max_batch: Flush immediately once this many appends are waiting
+        """
+        self.window_ms = window_ms
+        self.max_batch = max_batch
+        self._pending: List[Tuple[Path, bytes, asyncio.Future]] = []
+        self._timer: Optional[asyncio.Task] = None
+        self._flush_lock = asyncio.Lock()
+        self.batches = 0
+        self.appends = 0
+        self.fsyncs = 0
+    
+    def submit(self, file_path: Path, data: bytes) -> "asyncio.Future[None]":
+        """
+        Queue bytes to append to a file.
+        
+        Args:
+            file_path: File to append to
+            data: Bytes to append
+        
+        Returns:
+            Awaitable completing once the append is durable
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((file_path, data, future))
+        
+        if len(self._pending) >= self.max_batch:
+            if self._timer is not None:
+                self._timer.cancel()
+            self._timer = None
+            loop.create_task(self._flush())
+        elif self._timer is None:
+            self._timer = loop.create_task(self._flush_after_window())
+        
+        return future
+    
+    async def _flush_after_window(self) -> None:
+        """Flush once the batching window has elapsed"""
+        await asyncio.sleep(self.window_ms / 1000)
+        self._timer = None
+        await self._flush()
+    
+    async def flush(self) -> None:
+        """Flush all pending appends now (e.g. on shutdown)"""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        await self._flush()
+    
+    async def _flush(self) -> None:
+        """Write and fsync the pending batch, then wake its callers"""
+        # Batches are written strictly in submission order
+        async with self._flush_lock:
+            batch, self._pending = self._pending, []
+            if not batch:
+                return
+            
+            loop = asyncio.get_running_loop()
+            try:
+                fsyncs = await loop.run_in_executor(
+                    None, self._write_batch, [(path, data) for path, data, _ in batch]
+                )
+            except Exception as e:
+                for _, _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                return
+            
+            self.batches += 1
+            self.appends += len(batch)
+            self.fsyncs += fsyncs
+            for _, _, future in batch:
+                if not future.done():
+                    future.set_result(None)
+    
+    @staticmethod
+    def _write_batch(writes: List[Tuple[Path, bytes]]) -> int:
+        """
+        Append every write, fsyncing each touched file once.
+        
+        Returns:
+            Number of fsync calls issued
+        """
+        by_file: "OrderedDict[Path, List[bytes]]" = OrderedDict()
+        for file_path, data in writes:
+            by_file.setdefault(file_path, []).append(data)
+        
+        fsyncs = 0
+        new_dirs = set()
+        for file_path, chunks in by_file.items():
+            if not file_path.exists():
+                new_dirs.add(file_path.parent)
+            with open(file_path, 'ab') as f:
+                f.write(b"".join(chunks))
+                f.flush()
+                os.fsync(f.fileno())
+            fsyncs += 1
+        
+        # Make newly created files durable in their directories
+        for directory in new_dirs:
+            fd = os.open(directory, os.O_RDONLY)
+            try:
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+            fsyncs += 1
+        
+        return fsyncs
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get group commit statistics"""
+        return {
+            'batches': self.batches,
+            'appends': self.appends,
+            'fsyncs': self.fsyncs,
+            'pending': len(self._pending),
+            'window_ms': self.window_ms,
+            'max_batch': self.max_batch,
+        }
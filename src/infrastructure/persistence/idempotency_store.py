@@ -0,0 +1,212 @@
+"""Persistent dedup index for command idempotency keys"""
+import asyncio
+import json
+import os
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+import aiofiles
+
+
+class IdempotencyKeyReusedError(Exception):
+    """Raised when an idempotency key is replayed with a different command"""
+    pass
+
+
+@dataclass
+class IdempotencyRecord:
+    """Outcome of a completed command, keyed by its idempotency key"""
+    key: str
+    fingerprint: str
+    result: Any
+    expires_at: float
+    
+    def to_dict(self) -> dict:
+        """Convert to a JSON-serializable dictionary"""
+        return {
+            'key': self.key,
+            'fingerprint': self.fingerprint,
+            'result': self.result,
+            'expires_at': self.expires_at,
+        }
+    
+    @classmethod
+    def from_dict(cls, data: dict) -> "IdempotencyRecord":
+        """Create from dictionary"""
+        return cls(
+            key=data['key'],
+            fingerprint=data['fingerprint'],
+            result=data['result'],
+            expires_at=data['expires_at'],
+        )
+
+
+class IdempotencyStore:
+    """
+    Bounded, TTL-expiring index of completed commands.
+    
+    A retried command whose key is found returns the stored result
+    without touching the aggregate. Concurrent attempts with the same
+    key wait for the first one instead of executing twice. Failed
+    commands are not recorded, so they can be retried.
+    
+    Records are kept in insertion order (which is also expiry order),
+    so expiry and capacity eviction both drop from the oldest end.
+    They are persisted to an append-only JSON Lines file that is
+    compacted once it holds mostly superseded records.
+    
+    Results are stored as JSON (non-JSON values such as UUIDs as strings).
+    """
+    
+    def __init__(
+        self,
+        storage_path: str = "data/idempotency.jsonl",
+        ttl_seconds: float = 24 * 3600,
+        max_entries: int = 100_000
+    ):
+        """
+        Initialize idempotency store.
+        
+        Args:
+            storage_path: JSON Lines file persisting the index
+            ttl_seconds: How long a key is remembered
+            max_entries: Upper bound on remembered keys
+        """
+        self.storage_path = Path(storage_path)
+        self.storage_path.parent.mkdir(parents=True, exist_ok=True)
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._records: "OrderedDict[str, IdempotencyRecord]" = OrderedDict()
+        self._in_flight: Dict[str, asyncio.Event] = {}
+        self._load_lock = asyncio.Lock()
+        self._write_lock = asyncio.Lock()
+        self._loaded = False
+        self._logged_records = 0
+        self.hits = 0
+        self.misses = 0
+    
+    async def execute(
+        self,
+        key: str,
+        fingerprint: str,
+        operation: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """
+        Run an operation once per key.
+        
+        Args:
+            key: Idempotency key (scoped by the caller, e.g. per command type)
+            fingerprint: Digest of the command payload
+            operation: Executes the command and returns its result
+        
+        Returns:
+            The operation's result, or the stored result of an earlier run
+        
+        Raises:
+            IdempotencyKeyReusedError: If the key was used for another payload
+        """
+        while True:
+            record = await self.get(key)
+            if record is not None:
+                if record.fingerprint != fingerprint:
+                    raise IdempotencyKeyReusedError(
+                        f"Idempotency key {key!r} was already used for a different request"
+                    )
+                self.hits += 1
+                return record.result
+            
+            pending = self._in_flight.get(key)
+            if pending is None:
+                break
+            await pending.wait()
+        
+        self.misses += 1
+        done = asyncio.Event()
+        self._in_flight[key] = done
+        try:
+            result = await operation()
+            await self.put(IdempotencyRecord(
+                key=key,
+                fingerprint=fingerprint,
+                result=result,
+                expires_at=time.time() + self.ttl_seconds,
+            ))
+            return result
+        finally:
+            del self._in_flight[key]
+            done.set()
+    
+    async def get(self, key: str) -> Optional[IdempotencyRecord]:
+        """Look up an unexpired record"""
+        await self._ensure_loaded()
+        self._expire()
+        return self._records.get(key)
+    
+    async def put(self, record: IdempotencyRecord) -> None:
+        """Store a record, evicting the oldest beyond capacity"""
+        await self._ensure_loaded()
+        self._records[record.key] = record
+        self._records.move_to_end(record.key)
+        self._expire()
+        
+        line = json.dumps(record.to_dict(), default=str) + "\n"
+        async with self._write_lock:
+            async with aiofiles.open(self.storage_path, 'a') as f:
+                await f.write(line)
+            self._logged_records += 1
+            
+            if self._logged_records > 2 * len(self._records) + 1000:
+                await self._compact()
+    
+    def _expire(self) -> None:
+        """Drop expired records and records beyond capacity"""
+        now = time.time()
+        while self._records:
+            oldest = next(iter(self._records.values()))
+            if oldest.expires_at > now and len(self._records) <= self.max_entries:
+                break
+            self._records.popitem(last=False)
+    
+    async def _ensure_loaded(self) -> None:
+        """Read the persisted index on first use"""
+        if self._loaded:
+            return
+        async with self._load_lock:
+            if self._loaded:
+                return
+            if self.storage_path.exists():
+                async with aiofiles.open(self.storage_path, 'r') as f:
+                    async for line in f:
+                        # A line without its newline is a torn write
+                        if not line.endswith("\n"):
+                            continue
+                        record = IdempotencyRecord.from_dict(json.loads(line))
+                        self._records[record.key] = record
+                        self._records.move_to_end(record.key)
+                        self._logged_records += 1
+            self._expire()
+            self._loaded = True
+    
+    async def _compact(self) -> None:
+        """Rewrite the log with only the live records (caller holds the write lock)"""
+        tmp_path = self.storage_path.with_name(f"{self.storage_path.name}.{os.getpid()}.tmp")
+        async with aiofiles.open(tmp_path, 'w') as f:
+            await f.write("".join(
+                json.dumps(record.to_dict(), default=str) + "\n"
+                for record in self._records.values()
+            ))
+        os.replace(tmp_path, self.storage_path)
+        self._logged_records = len(self._records)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get idempotency index statistics"""
+        return {
+            'entries': len(self._records),
+            'max_entries': self.max_entries,
+            'hits': self.hits,
+            'misses': self.misses,
+            'in_flight': len(self._in_flight),
+        }
@@ -0,0 +1,147 @@
+"""Bounded striped lock table with wait-time and contention statistics"""
+import asyncio
+import fcntl
+import os
+import time
+import zlib
+from collections import Counter
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+
+@asynccontextmanager
+async def file_lock(path: Path) -> AsyncIterator[None]:
+    """
+    Hold an exclusive ``fcntl`` advisory lock on a file.
+    
+    The lock is first tried without blocking; only when another process
+    holds it does the blocking wait move to an executor thread, so the
+    event loop never stalls on it.
+    
+    Args:
+        path: Lock file (created if missing)
+    """
+    fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(None, fcntl.flock, fd, fcntl.LOCK_EX)
+        yield
+    finally:
+        # Closing the descriptor releases the lock
+        os.close(fd)
+
+
+class StripedLockManager:
+    """
+    Fixed-size table of asyncio locks shared by hashing keys onto stripes.
+    
+    Memory stays constant however many aggregates are touched. Two
+    aggregates that hash to the same stripe serialize against each other,
+    so ``stripes`` should comfortably exceed the number of concurrent
+    writers. Callers must not hold one key's lock while acquiring another.
+    
+    Every acquisition records how long it waited; acquisitions that found
+    their stripe already held count as contended, and the keys involved
+    are tallied so the hottest aggregates can be reported.
+    
+    With ``lock_dir`` set each stripe is also backed by an advisory file
+    lock, taken after the in-process lock, so processes sharing the
+    directory (and the same ``stripes``) exclude each other too.
+    """
+    
+    def __init__(
+        self, 
+        stripes: int = 1024, 
+        max_tracked_keys: int = 1000,
+        lock_dir: Optional[Path] = None
+    ):
+        """
+        Initialize lock manager.
+        
+        Args:
+            stripes: Number of locks in the table
+            max_tracked_keys: Upper bound on keys kept in the contention tally
+            lock_dir: Directory for cross-process stripe lock files
+                (None for in-process locking only)
+        """
+        if stripes < 1:
+            raise ValueError(f"stripes must be positive: {stripes}")
+        self.stripes = stripes
+        self.max_tracked_keys = max_tracked_keys
+        self.lock_dir = lock_dir
+        if lock_dir is not None:
+            lock_dir.mkdir(parents=True, exist_ok=True)
+        self._locks: List[asyncio.Lock] = [asyncio.Lock() for _ in range(stripes)]
+        self._contended_keys: Counter = Counter()
+        self.acquisitions = 0
+        self.contended = 0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+    
+    def stripe_of(self, key: str) -> int:
+        """Get the stripe a key maps to (stable across processes)"""
+        return zlib.crc32(key.encode("utf-8")) % self.stripes
+    
+    @asynccontextmanager
+    async def acquire(self, key: str) -> AsyncIterator[None]:
+        """
+        Hold the lock for a key.
+        
+        Args:
+            key: Key to lock (e.g. an aggregate id)
+        """
+        lock = self._locks[self.stripe_of(key)]
+        if lock.locked():
+            self.contended += 1
+            self._record_contention(key)
+        
+        started = time.perf_counter()
+        async with lock:
+            if self.lock_dir is None:
+                self._record_wait(started)
+                yield
+            else:
+                stripe_path = self.lock_dir / f"{self.stripe_of(key):05d}.lock"
+                async with file_lock(stripe_path):
+                    self._record_wait(started)
+                    yield
+    
+    def _record_wait(self, started: float) -> None:
+        """Account for a completed acquisition"""
+        waited = time.perf_counter() - started
+        self.acquisitions += 1
+        self.total_wait_seconds += waited
+        if waited > self.max_wait_seconds:
+            self.max_wait_seconds = waited
+    
+    def _record_contention(self, key: str) -> None:
+        """Tally a contended acquisition, keeping the tally bounded"""
+        self._contended_keys[key] += 1
+        if len(self._contended_keys) > 2 * self.max_tracked_keys:
+            self._contended_keys = Counter(
+                dict(self._contended_keys.most_common(self.max_tracked_keys))
+            )
+    
+    def get_stats(self, top_n: int = 10) -> Dict[str, Any]:
+        """
+        Get lock statistics.
+        
+        Args:
+            top_n: Number of most contended keys to include
+        """
+        return {
+            'stripes': self.stripes,
+            'held': sum(1 for lock in self._locks if lock.locked()),
+            'acquisitions': self.acquisitions,
+            'contended': self.contended,
+            'avg_wait_ms': (
+                self.total_wait_seconds * 1000 / self.acquisitions
+                if self.acquisitions else 0.0
+            ),
+            'max_wait_ms': self.max_wait_seconds * 1000,
+            'most_contended': self._contended_keys.most_common(top_n),
+        }
@@ -0,0 +1,51 @@
+"""Accounting of time spent on the event loop thread"""
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List
+
+
+class LoopBlockingMonitor:
+    """
+    Records how long synchronous sections hold the event loop.
+    
+    Wrap the code a coroutine runs between awaits in ``measure``; the
+    per-operation maximum is the bound that call adds to the latency of
+    every other request sharing the loop.
+    """
+    
+    def __init__(self):
+        """Initialize monitor"""
+        # operation -> [calls, total seconds, max seconds]
+        self._stats: Dict[str, List[float]] = {}
+    
+    @contextmanager
+    def measure(self, operation: str) -> Iterator[None]:
+        """
+        Time a synchronous section.
+        
+        Args:
+            operation: Name the time is accounted under
+        """
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            stats = self._stats.get(operation)
+            if stats is None:
+                stats = self._stats[operation] = [0, 0.0, 0.0]
+            stats[0] += 1
+            stats[1] += elapsed
+            if elapsed > stats[2]:
+                stats[2] = elapsed
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get calls, average and maximum blocking time per operation"""
+        return {
+            operation: {
+                'calls': int(calls),
+                'avg_ms': total * 1000 / calls,
+                'max_ms': longest * 1000,
+            }
+            for operation, (calls, total, longest) in self._stats.items()
+        }
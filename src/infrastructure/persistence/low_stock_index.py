@@ -0,0 +1,163 @@
+"""Index of cells below their low-stock threshold, with a crossing feed"""
+import heapq
+from bisect import bisect_right
+from typing import Any, Dict, Iterable, List, Optional
+from uuid import UUID
+
+from .threshold_registry import ThresholdRegistry
+
+
+class LowStockIndex:
+    """
+    Cells whose available stock is under their threshold.
+    
+    Only cells below their threshold are kept, so the index size is the
+    number of low cells, not the size of the catalog; listing the worst
+    ``k`` is a heap selection over them. Every update that moves a cell
+    across its threshold appends an alert, tagged with the global
+    position of the event that caused it, to a bounded feed that can be
+    read from any position in O(log n + changes).
+    
+    The index and feed are in memory: the index is reloaded from the
+    read model on startup, and the feed starts empty. Threshold changes
+    re-evaluate the index without emitting alerts.
+    """
+    
+    def __init__(self, registry: ThresholdRegistry, max_alerts: int = 10000):
+        """
+        Initialize index.
+        
+        Args:
+            registry: Thresholds to compare against
+            max_alerts: Most recent alerts kept in the feed
+        """
+        self.registry = registry
+        self.max_alerts = max_alerts
+        self._below: Dict[str, Dict[str, Any]] = {}
+        self._alerts: List[Dict[str, Any]] = []
+        self._alert_positions: List[int] = []
+    
+    @staticmethod
+    def _make_key(product_id: UUID, store_id: UUID) -> str:
+        """Create key for cell lookup"""
+        return f"{product_id}:{store_id}"
+    
+    def _evaluate(
+        self,
+        product_id: UUID,
+        store_id: UUID,
+        available: int
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Update a cell's membership in the index.
+        
+        Returns:
+            The cell's new entry if it crossed its threshold, otherwise None
+        """
+        key = self._make_key(product_id, store_id)
+        threshold = self.registry.threshold_for(product_id, store_id)
+        entry = {
+            'product_id': str(product_id),
+            'store_id': str(store_id),
+            'available': available,
+            'threshold': threshold,
+        }
+        was_low = key in self._below
+        is_low = threshold is not None and available < threshold
+        if is_low:
+            self._below[key] = entry
+        elif was_low:
+            del self._below[key]
+        return entry if is_low != was_low else None
+    
+    def load(self, entries: Iterable[Dict]) -> None:
+        """
+        Rebuild the index from read-model entries without emitting alerts.
+        
+        Args:
+            entries: Dictionaries with product_id, store_id and available
+        """
+        self._below = {}
+        self.reevaluate(entries)
+    
+    def reevaluate(self, entries: Iterable[Dict]) -> None:
+        """
+        Re-check cells after a threshold change, without emitting alerts.
+        
+        Args:
+            entries: Read-model entries of the affected cells
+        """
+        for entry in entries:
+            self._evaluate(entry['product_id'], entry['store_id'], entry['available'])
+    
+    def update(
+        self,
+        product_id: UUID,
+        store_id: UUID,
+        available: int,
+        position: int
+    ) -> None:
+        """
+        Record a cell's new available stock.
+        
+        Args:
+            product_id: Product identifier
+            store_id: Store identifier
+            available: Available quantity
+            position: Global position of the event that set it
+        """
+        crossed = self._evaluate(product_id, store_id, available)
+        if crossed is None:
+            return
+        
+        low = self._make_key(product_id, store_id) in self._below
+        self._alerts.append({**crossed, 'position': position, 'low': low})
+        self._alert_positions.append(position)
+        # Trim in bulk so appends stay amortized O(1)
+        if len(self._alerts) > 2 * self.max_alerts:
+            del self._alerts[:-self.max_alerts]
+            del self._alert_positions[:-self.max_alerts]
+    
+    def clear(self) -> None:
+        """Drop every cell and alert"""
+        self._below = {}
+        self._alerts = []
+        self._alert_positions = []
+    
+    async def get_below_threshold(self, limit: int = 100) -> List[Dict[str, Any]]:
+        """
+        Get the cells furthest below their threshold.
+        
+        Args:
+            limit: Number of cells returned
+        
+        Returns:
+            Cells ordered by available minus threshold, lowest first
+        """
+        return heapq.nsmallest(
+            limit,
+            self._below.values(),
+            key=lambda entry: entry['available'] - entry['threshold']
+        )
+    
+    async def get_alerts_since(self, position: int, limit: int = 1000) -> List[Dict[str, Any]]:
+        """
+        Get cells that crossed their threshold after a position.
+        
+        Args:
+            position: Global position already seen by the caller
+            limit: Maximum alerts returned (the oldest first)
+        
+        Returns:
+            Alerts in position order; ``low`` tells the direction
+        """
+        start = bisect_right(self._alert_positions, position)
+        return self._alerts[start:start + limit]
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get low-stock index statistics"""
+        return {
+            'below_threshold': len(self._below),
+            'alerts': len(self._alerts),
+            'thresholds': self.registry.get_stats(),
+        }
@@ -0,0 +1,160 @@
+"""Sidecar byte-offset index for append-only event segments"""
+import mmap
+import os
+import struct
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterable, Optional
+
+if TYPE_CHECKING:
+    from .codecs import EventCodec
+
+
+class OffsetIndex:
+    """
+    Maps aggregate versions to byte offsets in a segment file.
+    
+    Entry ``n`` (a little-endian uint64) holds the offset of the record
+    for version ``n + 1``, so the index for a stream at version ``v`` is
+    exactly ``8 * v`` bytes long. Any other length means the index is
+    stale (e.g. a crash between the segment and index writes) and must be
+    rebuilt from the segment.
+    """
+    
+    ENTRY = struct.Struct("<Q")
+    
+    def __init__(self, path: Path, codec: "EventCodec"):
+        """
+        Initialize index.
+        
+        Args:
+            path: Index file path
+            codec: Record format of the indexed segment
+        """
+        self.path = path
+        self.codec = codec
+    
+    def entry_count(self) -> int:
+        """Get number of complete entries in the index file"""
+        try:
+            return self.path.stat().st_size // self.ENTRY.size
+        except FileNotFoundError:
+            return 0
+    
+    def is_current(self, version: int) -> bool:
+        """Check the index covers exactly ``version`` records"""
+        try:
+            return self.path.stat().st_size == version * self.ENTRY.size
+        except FileNotFoundError:
+            return version == 0
+    
+    def lookup(self, version: int) -> Optional[int]:
+        """
+        Get the byte offset of the record following ``version``.
+        
+        Args:
+            version: Last version the caller already has
+        
+        Returns:
+            Offset of record ``version + 1`` or None if not indexed
+        """
+        try:
+            fd = os.open(self.path, os.O_RDONLY)
+        except FileNotFoundError:
+            return None
+        try:
+            data = os.pread(fd, self.ENTRY.size, version * self.ENTRY.size)
+        finally:
+            os.close(fd)
+        
+        if len(data) != self.ENTRY.size:
+            return None
+        return self.ENTRY.unpack(data)[0]
+    
+    @classmethod
+    def encode(cls, offsets: Iterable[int]) -> bytes:
+        """Encode offsets as index entries"""
+        return b"".join(cls.ENTRY.pack(offset) for offset in offsets)
+    
+    def verified_count(self, segment_path: Path) -> Optional[int]:
+        """
+        Get the record count of a segment if the index can vouch for it.
+        
+        The index is trusted when its last entry points at a record that
+        ends exactly at the end of the segment, which costs one short read
+        instead of a full scan. Never writes.
+        
+        Returns:
+            Number of records, or None if the index is missing or stale
+        """
+        size = segment_path.stat().st_size if segment_path.exists() else 0
+        count = self.entry_count()
+        if count == 0:
+            return 0 if size == 0 else None
+        
+        last = self.lookup(count - 1)
+        if last is None or last >= size:
+            return None
+        records = list(self.codec.iter_records(read_from(segment_path, last)))
+        if len(records) == 1 and len(records[0][1]) == size - last:
+            return count
+        return None
+    
+    def count_records(self, segment_path: Path) -> int:
+        """Count the records of a segment, scanning it if the index is stale"""
+        count = self.verified_count(segment_path)
+        if count is None:
+            count = len(self.codec.record_offsets(segment_path.read_bytes()))
+        return count
+    
+    def recover(self, segment_path: Path) -> int:
+        """
+        Count the records of a segment, rebuilding a stale index.
+        
+        Returns:
+            Number of records in the segment
+        """
+        count = self.verified_count(segment_path)
+        if count is None:
+            return self.rebuild(segment_path)
+        if count == 0 and not self.path.exists():
+            self.path.write_bytes(b"")
+        return count
+    
+    def rebuild(self, segment_path: Path) -> int:
+        """
+        Rewrite the index from a full scan of its segment.
+        
+        Returns:
+            Number of indexed records
+        """
+        content = segment_path.read_bytes() if segment_path.exists() else b""
+        offsets = self.codec.record_offsets(content)
+        
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        tmp_path.write_bytes(self.encode(offsets))
+        os.replace(tmp_path, self.path)
+        return len(offsets)
+
+
+def read_from(
+    file_path: Path, 
+    offset: int, 
+    end: Optional[int] = None,
+    mmap_threshold: int = 1 << 20
+) -> bytes:
+    """
+    Read a file from ``offset`` up to ``end`` (default: end of file).
+    
+    Ranges larger than ``mmap_threshold`` are read through a memory map
+    so the kernel pages in only the requested range.
+    """
+    with open(file_path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        end = size if end is None else min(end, size)
+        if offset >= end:
+            return b""
+        if end - offset < mmap_threshold:
+            f.seek(offset)
+            return f.read(end - offset)
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            return mapped[offset:end]
@@ -1,9 +1,18 @@
 """Read Model Repository for optimized queries"""
+import asyncio
 import json
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional, Set, Tuple
 from uuid import UUID
 
+from .loop_blocking import LoopBlockingMonitor
+
+
+logger = logging.getLogger(__name__)
+
 
 class ReadModelRepository:
     """
@@ -11,45 +20,109 @@ class ReadModelRepository:
     
     Maintains denormalized views optimized for queries.
     Updated by event handlers.
+    
+    The inventory view lives in memory and is the source of truth for
+    queries, so reads are dictionary lookups and updates never touch the
+    disk. Persistence is write-behind:
+    - ``flush`` appends the entries changed since the last flush to a
+      delta log (JSON Lines), periodically when the flusher is started
+    - ``checkpoint`` rewrites ``inventory.json`` atomically and starts a
+      new delta log generation, once enough deltas have accumulated
+    
+    On startup the checkpoint is loaded and the delta lines of the same
+    generation are replayed on top of it. Updates made after the last
+    flush are lost on a crash (the event store remains authoritative).
+    Entries are replaced, never mutated, so returned dictionaries are
+    stable snapshots.
+    
+    Secondary indexes from product to entry keys and from store to entry
+    keys answer product-wide and store-wide queries in O(k) for k
+    matching entries instead of scanning the whole view.
+    
+    All methods are coroutines. Their work on the event loop is limited
+    to in-memory lookups; serialization and file I/O of flushes and
+    checkpoints run on a dedicated single-thread executor. The time each
+    call holds the loop is recorded (``get_stats()['loop_blocking']``).
     """
     
-    def __init__(self, storage_path: str = "data/read_models"):
+    CHECKPOINT_FORMAT = 1
+    
+    def __init__(
+        self,
+        storage_path: str = "data/read_models",
+        flush_interval: float = 0.5,
+        checkpoint_threshold: int = 10000
+    ):
         """
         Initialize repository.
         
         Args:
             storage_path: Directory to store read models
+            flush_interval: Seconds between background delta flushes
+            checkpoint_threshold: Delta records that trigger a checkpoint
         """
         self.storage_path = Path(storage_path)
         self.storage_path.mkdir(parents=True, exist_ok=True)
         self._inventory_file = self.storage_path / "inventory.json"
-        self._ensure_file_exists()
-    
-    def _ensure_file_exists(self):
-        """Ensure the inventory file exists"""
-        if not self._inventory_file.exists():
-            self._inventory_file.write_text("{}")
-    
-    def _load_inventory(self) -> Dict:
-        """Load inventory from file"""
-        with open(self._inventory_file, 'r') as f:
-            return json.load(f)
+        self._delta_file = self.storage_path / "inventory.delta.jsonl"
+        self.flush_interval = flush_interval
+        self.checkpoint_threshold = checkpoint_threshold
+        
+        self._generation = 0
+        self._delta_records = 0
+        self._inventory: Dict[str, Dict] = self._load()
+        self._by_product: Dict[str, Set[str]] = {}
+        self._by_store: Dict[str, Set[str]] = {}
+        for key, entry in self._inventory.items():
+            self._index_entry(key, entry)
+        self._dirty: Set[str] = set()
+        self._flush_lock = asyncio.Lock()
+        self._flusher: Optional[asyncio.Task] = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="read-model-io")
+        self._blocking = LoopBlockingMonitor()
     
-    def _save_inventory(self, inventory: Dict):
-        """Save inventory to file"""
-        with open(self._inventory_file, 'w') as f:
-            json.dump(inventory, f, indent=2)
+    def _load(self) -> Dict[str, Dict]:
+        """Load the last checkpoint and replay its delta log"""
+        inventory: Dict[str, Dict] = {}
+        if self._inventory_file.exists():
+            with open(self._inventory_file, 'r') as f:
+                data = json.load(f)
+            if data.get('format') == self.CHECKPOINT_FORMAT:
+                self._generation = data['generation']
+                inventory = data['inventory']
+            else:
+                # Pre write-behind file: a flat key -> entry mapping
+                inventory = data
+        
+        if self._delta_file.exists():
+            with open(self._delta_file, 'r') as f:
+                for line in f:
+                    # A line without its newline is a torn write
+                    if not line.endswith("\n"):
+                        break
+                    delta = json.loads(line)
+                    if delta['generation'] == self._generation:
+                        inventory[delta['key']] = delta['entry']
+                        self._delta_records += 1
+        
+        return inventory
     
     def _make_key(self, product_id: UUID, store_id: UUID) -> str:
         """Create key for inventory lookup"""
         return f"{product_id}:{store_id}"
     
-    def update_stock(
-        self, 
-        product_id: UUID, 
+    def _index_entry(self, key: str, entry: Dict) -> None:
+        """Add an entry to the product and store indexes"""
+        self._by_product.setdefault(entry['product_id'], set()).add(key)
+        self._by_store.setdefault(entry['store_id'], set()).add(key)
+    
+    async def update_stock(
+        self,
+        product_id: UUID,
         store_id: UUID,
         available: int,
-        reserved: int
+        reserved: int,
+        version: int = 0
     ):
         """
         Update stock levels in read model.
@@ -59,23 +132,27 @@ class ReadModelRepository:
             store_id: Store identifier
             available: Available quantity
             reserved: Reserved quantity
+            version: Aggregate version the levels reflect
         """
-        inventory = self._load_inventory()
-        key = self._make_key(product_id, store_id)
-        
-        inventory[key] = {
-            'product_id': str(product_id),
-            'store_id': str(store_id),
-            'available': available,
-            'reserved': reserved,
-            'total': available + reserved
-        }
-        
-        self._save_inventory(inventory)
+        with self._blocking.measure("update_stock"):
+            key = self._make_key(product_id, store_id)
+            entry = {
+                'product_id': str(product_id),
+                'store_id': str(store_id),
+                'available': available,
+                'reserved': reserved,
+                'total': available + reserved,
+                'version': version
+            }
+            
+            if key not in self._inventory:
+                self._index_entry(key, entry)
+            self._inventory[key] = entry
+            self._dirty.add(key)
     
-    def get_stock(
-        self, 
-        product_id: UUID, 
+    async def get_stock(
+        self,
+        product_id: UUID,
         store_id: UUID
     ) -> Optional[Dict]:
         """
@@ -88,11 +165,10 @@ class ReadModelRepository:
         Returns:
             Stock information or None if not found
         """
-        inventory = self._load_inventory()
-        key = self._make_key(product_id, store_id)
-        return inventory.get(key)
+        with self._blocking.measure("get_stock"):
+            return self._inventory.get(self._make_key(product_id, store_id))
     
-    def get_product_inventory(self, product_id: UUID) -> List[Dict]:
+    async def get_product_inventory(self, product_id: UUID) -> List[Dict]:
         """
         Get inventory for a product across all stores.
         
@@ -102,19 +178,64 @@ class ReadModelRepository:
         Returns:
             List of stock information for each store
         """
-        inventory = self._load_inventory()
-        product_id_str = str(product_id)
+        with self._blocking.measure("get_product_inventory"):
+            return self._product_entries(product_id)
+    
+    def _product_entries(self, product_id: UUID) -> List[Dict]:
+        """Get every entry of a product through the product index"""
+        keys = self._by_product.get(str(product_id), ())
+        return [self._inventory[key] for key in keys]
+    
+    async def get_store_inventory(self, store_id: UUID) -> List[Dict]:
+        """
+        Get inventory for every product stocked at a store.
         
-        results = []
-        for key, data in inventory.items():
-            if data['product_id'] == product_id_str:
-                results.append(data)
+        Args:
+            store_id: Store identifier
         
-        return results
+        Returns:
+            List of stock information for each product
+        """
+        with self._blocking.measure("get_store_inventory"):
+            keys = self._by_store.get(str(store_id), ())
+            return [self._inventory[key] for key in keys]
     
-    def check_availability(
-        self, 
-        product_id: UUID, 
+    async def get_all_inventory(self) -> List[Dict]:
+        """
+        Get every entry of the view.
+        
+        Returns:
+            List of stock information for each product and store
+        """
+        with self._blocking.measure("get_all_inventory"):
+            return list(self._inventory.values())
+    
+    async def get_stores_with_available(
+        self,
+        product_id: UUID,
+        min_available: int
+    ) -> List[Dict]:
+        """
+        Get the stores holding at least ``min_available`` of a product.
+        
+        Args:
+            product_id: Product identifier
+            min_available: Minimum available quantity
+        
+        Returns:
+            Stock information per matching store, most available first
+        """
+        with self._blocking.measure("get_stores_with_available"):
+            matches = [
+                entry for entry in self._product_entries(product_id)
+                if entry['available'] >= min_available
+            ]
+            matches.sort(key=lambda entry: entry['available'], reverse=True)
+            return matches
+    
+    async def check_availability(
+        self,
+        product_id: UUID,
         store_id: UUID,
         required_quantity: int
     ) -> bool:
@@ -129,8 +250,154 @@ class ReadModelRepository:
         Returns:
             True if available, False otherwise
         """
-        stock = self.get_stock(product_id, store_id)
+        stock = await self.get_stock(product_id, store_id)
         if not stock:
             return False
         
         return stock['available'] >= required_quantity
+    
+    async def replace_all(self, entries: List[Dict]) -> None:
+        """
+        Replace the whole view in one checkpoint write.
+        
+        Args:
+            entries: Dictionaries with product_id, store_id, available,
+                reserved and version
+        """
+        with self._blocking.measure("replace_all"):
+            self._inventory = {}
+            self._by_product = {}
+            self._by_store = {}
+            self._dirty = set()
+            for entry in entries:
+                key = self._make_key(entry['product_id'], entry['store_id'])
+                stored = {
+                    'product_id': str(entry['product_id']),
+                    'store_id': str(entry['store_id']),
+                    'available': entry['available'],
+                    'reserved': entry['reserved'],
+                    'total': entry['available'] + entry['reserved'],
+                    'version': entry['version']
+                }
+                self._inventory[key] = stored
+                self._index_entry(key, stored)
+        await self.checkpoint()
+    
+    async def clear(self) -> None:
+        """Remove every entry and checkpoint the empty view"""
+        with self._blocking.measure("clear"):
+            self._inventory = {}
+            self._by_product = {}
+            self._by_store = {}
+            self._dirty = set()
+        await self.checkpoint()
+    
+    async def start(self) -> None:
+        """Start the background write-behind flusher"""
+        if self._flusher is None:
+            self._flusher = asyncio.create_task(self._run_flusher())
+    
+    async def stop(self) -> None:
+        """Stop the flusher and checkpoint everything in memory"""
+        if self._flusher is not None:
+            self._flusher.cancel()
+            try:
+                await self._flusher
+            except asyncio.CancelledError:
+                pass
+            self._flusher = None
+        # Nothing to write if the checkpoint already holds the whole view
+        if self._dirty or self._delta_records:
+            await self.checkpoint()
+        self._executor.shutdown(wait=True)
+    
+    async def _run_flusher(self) -> None:
+        """Flush deltas every ``flush_interval`` seconds"""
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await self.flush()
+            except OSError as e:
+                logger.error(f"Read model flush failed: {e}")
+    
+    async def flush(self) -> None:
+        """Append the entries changed since the last flush to the delta log"""
+        async with self._flush_lock:
+            if not self._dirty:
+                return
+            with self._blocking.measure("flush"):
+                keys, self._dirty = self._dirty, set()
+                # Entries are never mutated, so they can be encoded off the loop
+                deltas = [(key, self._inventory[key]) for key in keys]
+            
+            loop = asyncio.get_running_loop()
+            try:
+                await loop.run_in_executor(
+                    self._executor, self._append_delta, self._generation, deltas
+                )
+            except OSError:
+                self._dirty |= keys
+                raise
+            self._delta_records += len(keys)
+        
+        if self._delta_records >= self.checkpoint_threshold:
+            await self.checkpoint()
+    
+    async def checkpoint(self) -> None:
+        """Write the whole view to ``inventory.json`` and reset the delta log"""
+        async with self._flush_lock:
+            generation = self._generation + 1
+            with self._blocking.measure("checkpoint"):
+                checkpoint = {
+                    'format': self.CHECKPOINT_FORMAT,
+                    'generation': generation,
+                    # Entries are never mutated, so a shallow copy is a snapshot
+                    'inventory': dict(self._inventory),
+                }
+                dirty, self._dirty = self._dirty, set()
+            
+            loop = asyncio.get_running_loop()
+            try:
+                await loop.run_in_executor(self._executor, self._write_checkpoint, checkpoint)
+            except OSError:
+                self._dirty |= dirty
+                raise
+            self._generation = generation
+            self._delta_records = 0
+    
+    def _append_delta(self, generation: int, deltas: List[Tuple[str, Dict]]) -> None:
+        """Append delta lines to the log"""
+        lines = "".join(
+            json.dumps({'generation': generation, 'key': key, 'entry': entry}) + "\n"
+            for key, entry in deltas
+        )
+        with open(self._delta_file, 'a') as f:
+            f.write(lines)
+    
+    def _write_checkpoint(self, checkpoint: Dict[str, Any]) -> None:
+        """Atomically replace the checkpoint, then drop superseded deltas"""
+        tmp_path = self._inventory_file.with_name(
+            f"{self._inventory_file.name}.{os.getpid()}.tmp"
+        )
+        with open(tmp_path, 'w') as f:
+            json.dump(checkpoint, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self._inventory_file)
+        
+        # Deltas of older generations are ignored on load, so a crash
+        # before this truncation is harmless
+        with open(self._delta_file, 'w'):
+            pass
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get read model statistics"""
+        return {
+            'entries': len(self._inventory),
+            'products': len(self._by_product),
+            'stores': len(self._by_store),
+            'dirty': len(self._dirty),
+            'delta_records': self._delta_records,
+            'generation': self._generation,
+            'loop_blocking': self._blocking.get_stats(),
+        }
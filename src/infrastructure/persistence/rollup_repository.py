@@ -0,0 +1,173 @@
+"""Materialized stock rollups per store, per product and network-wide"""
+import asyncio
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Optional
+from uuid import UUID
+
+from .loop_blocking import LoopBlockingMonitor
+
+
+class StockRollupRepository:
+    """
+    Running stock totals, kept incrementally by a projection.
+    
+    Each rollup holds available and reserved quantities and the number
+    of product/store cells it covers; lookups are single dictionary
+    reads. The totals are persisted as one JSON snapshot together with
+    the global position they reflect, so the projection feeding them can
+    skip events that are redelivered after a restart.
+    """
+    
+    def __init__(self, storage_path: str = "data/read_models/rollups.json"):
+        """
+        Initialize repository.
+        
+        Args:
+            storage_path: JSON file holding the rollup snapshot
+        """
+        self.storage_path = Path(storage_path)
+        self.storage_path.parent.mkdir(parents=True, exist_ok=True)
+        self.position = 0
+        self._stores: Dict[str, Dict[str, int]] = {}
+        self._products: Dict[str, Dict[str, int]] = {}
+        self._network = self._new_rollup()
+        self._dirty = False
+        self._load()
+        self._write_lock = asyncio.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="rollup-io")
+        self._blocking = LoopBlockingMonitor()
+    
+    @staticmethod
+    def _new_rollup() -> Dict[str, int]:
+        """Create an empty rollup"""
+        return {'available': 0, 'reserved': 0, 'cells': 0}
+    
+    def _load(self) -> None:
+        """Load the last snapshot"""
+        if not self.storage_path.exists():
+            return
+        with open(self.storage_path, 'r') as f:
+            data = json.load(f)
+        self.position = data['position']
+        self._stores = data['stores']
+        self._products = data['products']
+        self._network = data['network']
+    
+    def apply_change(
+        self,
+        product_id: UUID,
+        store_id: UUID,
+        available_delta: int,
+        reserved_delta: int,
+        new_cell: bool = False
+    ) -> None:
+        """
+        Add a cell's stock change to its store, product and network rollups.
+        
+        Args:
+            product_id: Product identifier
+            store_id: Store identifier
+            available_delta: Change of the available quantity
+            reserved_delta: Change of the reserved quantity
+            new_cell: Whether this is the cell's first change
+        """
+        for rollup in (
+            self._stores.setdefault(str(store_id), self._new_rollup()),
+            self._products.setdefault(str(product_id), self._new_rollup()),
+            self._network,
+        ):
+            rollup['available'] += available_delta
+            rollup['reserved'] += reserved_delta
+            rollup['cells'] += int(new_cell)
+        self._dirty = True
+    
+    @staticmethod
+    def _view(rollup: Optional[Dict[str, int]]) -> Optional[Dict[str, int]]:
+        """Copy a rollup and add its total"""
+        if rollup is None:
+            return None
+        return {**rollup, 'total': rollup['available'] + rollup['reserved']}
+    
+    async def get_store_rollup(self, store_id: UUID) -> Optional[Dict[str, int]]:
+        """
+        Get stock totals of a store across all products.
+        
+        Args:
+            store_id: Store identifier
+        
+        Returns:
+            Rollup or None if the store has no stock history
+        """
+        return self._view(self._stores.get(str(store_id)))
+    
+    async def get_product_rollup(self, product_id: UUID) -> Optional[Dict[str, int]]:
+        """
+        Get stock totals of a product across all stores.
+        
+        Args:
+            product_id: Product identifier
+        
+        Returns:
+            Rollup or None if the product has no stock history
+        """
+        return self._view(self._products.get(str(product_id)))
+    
+    async def get_network_rollup(self) -> Dict[str, int]:
+        """Get stock totals across every store and product"""
+        return self._view(self._network)
+    
+    async def flush(self) -> None:
+        """Write the snapshot if anything changed since the last write"""
+        async with self._write_lock:
+            if not self._dirty:
+                return
+            with self._blocking.measure("flush"):
+                snapshot = json.dumps({
+                    'position': self.position,
+                    'stores': self._stores,
+                    'products': self._products,
+                    'network': self._network,
+                })
+                self._dirty = False
+            
+            loop = asyncio.get_running_loop()
+            try:
+                await loop.run_in_executor(self._executor, self._write_snapshot, snapshot)
+            except OSError:
+                self._dirty = True
+                raise
+    
+    def _write_snapshot(self, snapshot: str) -> None:
+        """Atomically replace the snapshot file"""
+        tmp_path = self.storage_path.with_name(f"{self.storage_path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, 'w') as f:
+            f.write(snapshot)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.storage_path)
+    
+    async def stop(self) -> None:
+        """Write pending changes and release the I/O thread"""
+        await self.flush()
+        self._executor.shutdown(wait=True)
+    
+    async def clear(self) -> None:
+        """Reset every rollup and the position"""
+        self.position = 0
+        self._stores = {}
+        self._products = {}
+        self._network = self._new_rollup()
+        self._dirty = True
+        await self.flush()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get rollup statistics"""
+        return {
+            'position': self.position,
+            'stores': len(self._stores),
+            'products': len(self._products),
+            'loop_blocking': self._blocking.get_stats(),
+        }
@@ -0,0 +1,204 @@
+"""Snapshot store for Inventory aggregates"""
+import json
+import os
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from uuid import UUID
+
+import aiofiles
+
+from ...domain.entities.inventory import Inventory, Reservation
+from ...domain.value_objects.stock_quantity import StockQuantity
+
+
+@dataclass
+class InventorySnapshot:
+    """Point-in-time state of an Inventory aggregate"""
+    aggregate_id: str
+    product_id: UUID
+    store_id: UUID
+    available: int
+    reserved: int
+    version: int
+    reservations: List[Dict[str, Any]] = field(default_factory=list)
+    
+    @classmethod
+    def from_inventory(cls, inventory: Inventory) -> "InventorySnapshot":
+        """Capture the state of an inventory aggregate"""
+        return cls(
+            aggregate_id=f"{inventory.product_id}:{inventory.store_id}",
+            product_id=inventory.product_id,
+            store_id=inventory.store_id,
+            available=inventory.available.value,
+            reserved=inventory.reserved.value,
+            version=inventory.version,
+            reservations=[
+                {
+                    'id': str(r.id),
+                    'quantity': r.quantity,
+                    'customer_id': str(r.customer_id),
+                    'created_at': r.created_at.isoformat(),
+                    'expires_at': r.expires_at.isoformat() if r.expires_at else None,
+                }
+                for r in inventory.reservations.values()
+            ],
+        )
+    
+    def to_inventory(self) -> Inventory:
+        """Restore an inventory aggregate from this snapshot"""
+        reservations = {}
+        for data in self.reservations:
+            reservation = Reservation(
+                id=UUID(data['id']),
+                quantity=data['quantity'],
+                customer_id=UUID(data['customer_id']),
+                created_at=datetime.fromisoformat(data['created_at']),
+                expires_at=(
+                    datetime.fromisoformat(data['expires_at'])
+                    if data['expires_at'] else None
+                ),
+            )
+            reservations[reservation.id] = reservation
+        
+        return Inventory(
+            product_id=self.product_id,
+            store_id=self.store_id,
+            available=StockQuantity(self.available),
+            reserved=StockQuantity(self.reserved),
+            version=self.version,
+            reservations=reservations,
+        )
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert snapshot to dictionary for serialization"""
+        return {
+            'aggregate_id': self.aggregate_id,
+            'product_id': str(self.product_id),
+            'store_id': str(self.store_id),
+            'available': self.available,
+            'reserved': self.reserved,
+            'version': self.version,
+            'reservations': self.reservations,
+        }
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "InventorySnapshot":
+        """Create snapshot from its serialized dictionary"""
+        return cls(
+            aggregate_id=data['aggregate_id'],
+            product_id=UUID(data['product_id']),
+            store_id=UUID(data['store_id']),
+            available=data['available'],
+            reserved=data['reserved'],
+            version=data['version'],
+            reservations=data.get('reservations', []),
+        )
+
+
+class SnapshotPolicy:
+    """Decides when a new snapshot should be written"""
+    
+    def should_snapshot(self, previous_version: int, current_version: int) -> bool:
+        """
+        Check whether an append moving the aggregate from previous_version
+        to current_version should be followed by a snapshot.
+        """
+        raise NotImplementedError
+
+
+class EveryNEventsPolicy(SnapshotPolicy):
+    """Snapshot each time the version crosses a multiple of N"""
+    
+    def __init__(self, every_n_events: int = 100):
+        if every_n_events <= 0:
+            raise ValueError("every_n_events must be positive")
+        self.every_n_events = every_n_events
+    
+    def should_snapshot(self, previous_version: int, current_version: int) -> bool:
+        return (
+            current_version // self.every_n_events
+            > previous_version // self.every_n_events
+        )
+
+
+class SnapshotStore:
+    """
+    Stores the latest snapshot of each aggregate as a JSON file.
+    
+    Command handlers restore from the snapshot and replay only the
+    events written after it.
+    """
+    
+    def __init__(
+        self, 
+        storage_path: str = "data/snapshots",
+        policy: Optional[SnapshotPolicy] = None
+    ):
+        """
+        Initialize snapshot store.
+        
+        Args:
+            storage_path: Directory to store snapshot files
+            policy: When to take snapshots (default: every 100 events)
+        """
+        self.storage_path = Path(storage_path)
+        self.storage_path.mkdir(parents=True, exist_ok=True)
+        self.policy = policy or EveryNEventsPolicy()
+    
+    def _snapshot_file_path(self, aggregate_id: str) -> Path:
+        """Get file path for aggregate's snapshot"""
+        safe_id = aggregate_id.replace(":", "_")
+        return self.storage_path / f"{safe_id}.snapshot.json"
+    
+    async def load(self, aggregate_id: str) -> Optional[InventorySnapshot]:
+        """
+        Load the latest snapshot of an aggregate.
+        
+        Args:
+            aggregate_id: Aggregate identifier
+        
+        Returns:
+            Latest snapshot or None if the aggregate has none
+        """
+        file_path = self._snapshot_file_path(aggregate_id)
+        if not file_path.exists():
+            return None
+        
+        async with aiofiles.open(file_path, 'r') as f:
+            content = await f.read()
+        
+        return InventorySnapshot.from_dict(json.loads(content)) if content else None
+    
+    async def save(self, snapshot: InventorySnapshot) -> None:
+        """
+        Replace the stored snapshot of an aggregate.
+        
+        Args:
+            snapshot: Snapshot to store
+        """
+        file_path = self._snapshot_file_path(snapshot.aggregate_id)
+        tmp_path = file_path.with_name(f"{file_path.name}.{os.getpid()}.tmp")
+        
+        async with aiofiles.open(tmp_path, 'w') as f:
+            await f.write(json.dumps(snapshot.to_dict()))
+        
+        os.replace(tmp_path, file_path)
+    
+    async def maybe_save(self, inventory: Inventory, previous_version: int) -> bool:
+        """
+        Snapshot the inventory if the policy asks for it.
+        
+        Args:
+            inventory: Aggregate after its new events were appended
+            previous_version: Version before the append
+        
+        Returns:
+            True if a snapshot was written
+        """
+        if not self.policy.should_snapshot(previous_version, inventory.version):
+            return False
+        
+        await self.save(InventorySnapshot.from_inventory(inventory))
+        return True
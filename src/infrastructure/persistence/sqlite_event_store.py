@@ -0,0 +1,205 @@
+"""Event Store implementation backed by SQLite (aiosqlite)"""
+import asyncio
+import json
+import sqlite3
+from pathlib import Path
+from typing import List, Optional
+
+import aiosqlite
+
+from ...domain.events.base import DomainEvent
+from ...domain.exceptions.inventory_exceptions import ConcurrencyError
+from .event_store import RecordedEvent, deserialize_event
+
+
+class SqliteEventStore:
+    """
+    Event Store implementation using a single SQLite database.
+    
+    Drop-in replacement for ``EventStore`` (same public interface) that
+    keeps every stream in one table instead of one file per aggregate:
+    - Optimistic locking enforced by a UNIQUE (aggregate_id, version) key
+    - WAL journal so readers never block the writer
+    - Version checks answered by a single indexed query
+    - Fixed SQL text, so sqlite3 reuses its prepared statements
+    - The autoincrement ``position`` column doubles as the global log
+    """
+    
+    _SCHEMA = """
+        CREATE TABLE IF NOT EXISTS events (
+            position INTEGER PRIMARY KEY AUTOINCREMENT,
+            aggregate_id TEXT NOT NULL,
+            version INTEGER NOT NULL,
+            event_type TEXT NOT NULL,
+            payload TEXT NOT NULL,
+            UNIQUE (aggregate_id, version)
+        )
+    """
+    _SELECT_VERSION = (
+        "SELECT COALESCE(MAX(version), 0) FROM events WHERE aggregate_id = ?"
+    )
+    _SELECT_EVENTS = (
+        "SELECT payload FROM events "
+        "WHERE aggregate_id = ? AND version > ? ORDER BY version"
+    )
+    _SELECT_ALL = (
+        "SELECT position, payload FROM events "
+        "WHERE position > ? ORDER BY position LIMIT ?"
+    )
+    _SELECT_POSITION = "SELECT COALESCE(MAX(position), 0) FROM events"
+    _INSERT_EVENT = (
+        "INSERT INTO events (aggregate_id, version, event_type, payload) "
+        "VALUES (?, ?, ?, ?)"
+    )
+    
+    def __init__(self, database_path: str = "data/events.db"):
+        """
+        Initialize event store.
+        
+        Args:
+            database_path: Path of the SQLite database file
+        """
+        self.database_path = Path(database_path)
+        self.database_path.parent.mkdir(parents=True, exist_ok=True)
+        self._connection: Optional[aiosqlite.Connection] = None
+        self._connect_lock = asyncio.Lock()
+        self._write_lock = asyncio.Lock()
+    
+    async def _get_connection(self) -> aiosqlite.Connection:
+        """Open the connection and create the schema on first use"""
+        if self._connection is None:
+            async with self._connect_lock:
+                if self._connection is None:
+                    connection = await aiosqlite.connect(str(self.database_path))
+                    await connection.execute("PRAGMA journal_mode=WAL")
+                    await connection.execute("PRAGMA synchronous=NORMAL")
+                    await connection.execute(self._SCHEMA)
+                    await connection.commit()
+                    self._connection = connection
+        return self._connection
+    
+    async def close(self) -> None:
+        """Close the database connection"""
+        if self._connection is not None:
+            await self._connection.close()
+            self._connection = None
+    
+    async def append_events(
+        self, 
+        aggregate_id: str, 
+        events: List[DomainEvent],
+        expected_version: int
+    ) -> None:
+        """
+        Append events to the event store with optimistic locking.
+        
+        Args:
+            aggregate_id: Aggregate identifier
+            events: List of events to append
+            expected_version: Expected current version (for concurrency control)
+        
+        Raises:
+            ConcurrencyError: If version conflict is detected
+        """
+        if not events:
+            return
+        
+        rows = [
+            (
+                aggregate_id,
+                expected_version + offset,
+                event.event_type,
+                json.dumps(event.to_dict(), separators=(",", ":")),
+            )
+            for offset, event in enumerate(events, start=1)
+        ]
+        
+        connection = await self._get_connection()
+        async with self._write_lock:
+            current_version = await self._fetch_version(connection, aggregate_id)
+            if current_version != expected_version:
+                raise ConcurrencyError(
+                    f"Version conflict: expected {expected_version}, "
+                    f"found {current_version}"
+                )
+            
+            try:
+                await connection.executemany(self._INSERT_EVENT, rows)
+                await connection.commit()
+            except sqlite3.IntegrityError as e:
+                # Another process won the race for this version
+                await connection.rollback()
+                raise ConcurrencyError(
+                    f"Version conflict: expected {expected_version}"
+                ) from e
+    
+    async def load_events(
+        self, 
+        aggregate_id: str,
+        from_version: Optional[int] = None
+    ) -> List[DomainEvent]:
+        """
+        Load events for an aggregate.
+        
+        Args:
+            aggregate_id: Aggregate identifier
+            from_version: Optional starting version (exclusive)
+        
+        Returns:
+            List of domain events
+        """
+        connection = await self._get_connection()
+        async with connection.execute(
+            self._SELECT_EVENTS, (aggregate_id, from_version or 0)
+        ) as cursor:
+            rows = await cursor.fetchall()
+        
+        return [deserialize_event(json.loads(payload)) for (payload,) in rows]
+    
+    async def read_all(
+        self, 
+        from_position: int = 0, 
+        batch_size: int = 500
+    ) -> List[RecordedEvent]:
+        """
+        Read committed events across all aggregates in commit order.
+        
+        Args:
+            from_position: Last position the consumer has seen (exclusive)
+            batch_size: Maximum number of events to return
+        
+        Returns:
+            Up to ``batch_size`` events with positions after ``from_position``
+        """
+        connection = await self._get_connection()
+        async with connection.execute(
+            self._SELECT_ALL, (from_position, batch_size)
+        ) as cursor:
+            rows = await cursor.fetchall()
+        
+        return [
+            RecordedEvent(position, deserialize_event(json.loads(payload)))
+            for position, payload in rows
+        ]
+    
+    async def get_global_position(self) -> int:
+        """Get the position of the last committed event in the global log"""
+        connection = await self._get_connection()
+        async with connection.execute(self._SELECT_POSITION) as cursor:
+            (position,) = await cursor.fetchone()
+        return position
+    
+    async def get_current_version(self, aggregate_id: str) -> int:
+        """Get current version of an aggregate"""
+        connection = await self._get_connection()
+        return await self._fetch_version(connection, aggregate_id)
+    
+    async def _fetch_version(
+        self, 
+        connection: aiosqlite.Connection, 
+        aggregate_id: str
+    ) -> int:
+        """Read the latest version from the (aggregate_id, version) index"""
+        async with connection.execute(self._SELECT_VERSION, (aggregate_id,)) as cursor:
+            (version,) = await cursor.fetchone()
+        return version
@@ -0,0 +1,284 @@
+"""Read Model Repository backed by SQLite (aiosqlite)"""
+import asyncio
+import sqlite3
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from uuid import UUID
+
+import aiosqlite
+
+from .loop_blocking import LoopBlockingMonitor
+
+
+class SqliteReadModelRepository:
+    """
+    Repository for read models stored in an indexed SQLite table.
+    
+    Drop-in replacement for ``ReadModelRepository`` (same public
+    interface):
+    - One row per product/store cell, written with an upsert
+    - Indexes on store_id, (product_id, available) and available, so
+      product-wide, store-wide and stock-level range queries are index
+      lookups rather than scans
+    - WAL journal so several reader processes can share the file while
+      one writer updates it
+    - All statements run on aiosqlite's connection thread; the event loop
+      only converts result rows (``get_stats()['loop_blocking']``)
+    """
+    
+    _SCHEMA = (
+        """
+        CREATE TABLE IF NOT EXISTS inventory (
+            product_id TEXT NOT NULL,
+            store_id TEXT NOT NULL,
+            available INTEGER NOT NULL,
+            reserved INTEGER NOT NULL,
+            total INTEGER NOT NULL,
+            version INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (product_id, store_id)
+        )
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_inventory_store ON inventory (store_id)",
+        (
+            "CREATE INDEX IF NOT EXISTS idx_inventory_product_available "
+            "ON inventory (product_id, available)"
+        ),
+        "CREATE INDEX IF NOT EXISTS idx_inventory_available ON inventory (available)",
+    )
+    _COLUMNS = "product_id, store_id, available, reserved, total, version"
+    _UPSERT = (
+        f"INSERT INTO inventory ({_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?) "
+        "ON CONFLICT (product_id, store_id) DO UPDATE SET "
+        "available = excluded.available, "
+        "reserved = excluded.reserved, "
+        "total = excluded.total, "
+        "version = excluded.version"
+    )
+    _SELECT_STOCK = (
+        f"SELECT {_COLUMNS} FROM inventory WHERE product_id = ? AND store_id = ?"
+    )
+    _SELECT_PRODUCT = f"SELECT {_COLUMNS} FROM inventory WHERE product_id = ?"
+    _SELECT_STORE = f"SELECT {_COLUMNS} FROM inventory WHERE store_id = ?"
+    _SELECT_ALL = f"SELECT {_COLUMNS} FROM inventory"
+    _SELECT_PRODUCT_AVAILABLE = (
+        f"SELECT {_COLUMNS} FROM inventory "
+        "WHERE product_id = ? AND available >= ? ORDER BY available DESC"
+    )
+    _COUNT = "SELECT COUNT(*) FROM inventory"
+    _CLEAR = "DELETE FROM inventory"
+    
+    def __init__(self, database_path: str = "data/read_models/inventory.db"):
+        """
+        Initialize repository.
+        
+        Args:
+            database_path: Path of the SQLite database file
+        """
+        self.database_path = Path(database_path)
+        self.database_path.parent.mkdir(parents=True, exist_ok=True)
+        self._connection: Optional[aiosqlite.Connection] = None
+        self._connect_lock = asyncio.Lock()
+        self._blocking = LoopBlockingMonitor()
+    
+    async def _get_connection(self) -> aiosqlite.Connection:
+        """Open the connection and create the schema on first use"""
+        if self._connection is None:
+            async with self._connect_lock:
+                if self._connection is None:
+                    connection = await aiosqlite.connect(str(self.database_path))
+                    connection.row_factory = sqlite3.Row
+                    await connection.execute("PRAGMA journal_mode=WAL")
+                    await connection.execute("PRAGMA synchronous=NORMAL")
+                    for statement in self._SCHEMA:
+                        await connection.execute(statement)
+                    await self._add_missing_columns(connection)
+                    await connection.commit()
+                    self._connection = connection
+        return self._connection
+    
+    async def _add_missing_columns(self, connection: aiosqlite.Connection) -> None:
+        """Upgrade tables created before the version column existed"""
+        async with connection.execute("PRAGMA table_info(inventory)") as cursor:
+            columns = {row['name'] for row in await cursor.fetchall()}
+        if 'version' not in columns:
+            await connection.execute(
+                "ALTER TABLE inventory ADD COLUMN version INTEGER NOT NULL DEFAULT 0"
+            )
+    
+    async def _fetch_all(self, sql: str, parameters: tuple) -> List[Dict]:
+        """Run a query and convert its rows to dictionaries"""
+        connection = await self._get_connection()
+        async with connection.execute(sql, parameters) as cursor:
+            rows = await cursor.fetchall()
+        with self._blocking.measure("rows"):
+            return [dict(row) for row in rows]
+    
+    async def update_stock(
+        self,
+        product_id: UUID,
+        store_id: UUID,
+        available: int,
+        reserved: int,
+        version: int = 0
+    ):
+        """
+        Update stock levels in read model.
+        
+        Args:
+            product_id: Product identifier
+            store_id: Store identifier
+            available: Available quantity
+            reserved: Reserved quantity
+            version: Aggregate version the levels reflect
+        """
+        connection = await self._get_connection()
+        await connection.execute(
+            self._UPSERT,
+            (
+                str(product_id), str(store_id), available, reserved,
+                available + reserved, version
+            )
+        )
+        await connection.commit()
+    
+    async def get_stock(
+        self,
+        product_id: UUID,
+        store_id: UUID
+    ) -> Optional[Dict]:
+        """
+        Get stock for a specific product and store.
+        
+        Args:
+            product_id: Product identifier
+            store_id: Store identifier
+        
+        Returns:
+            Stock information or None if not found
+        """
+        rows = await self._fetch_all(self._SELECT_STOCK, (str(product_id), str(store_id)))
+        return rows[0] if rows else None
+    
+    async def get_product_inventory(self, product_id: UUID) -> List[Dict]:
+        """
+        Get inventory for a product across all stores.
+        
+        Args:
+            product_id: Product identifier
+        
+        Returns:
+            List of stock information for each store
+        """
+        return await self._fetch_all(self._SELECT_PRODUCT, (str(product_id),))
+    
+    async def get_store_inventory(self, store_id: UUID) -> List[Dict]:
+        """
+        Get inventory for every product stocked at a store.
+        
+        Args:
+            store_id: Store identifier
+        
+        Returns:
+            List of stock information for each product
+        """
+        return await self._fetch_all(self._SELECT_STORE, (str(store_id),))
+    
+    async def get_all_inventory(self) -> List[Dict]:
+        """
+        Get every row of the table.
+        
+        Returns:
+            List of stock information for each product and store
+        """
+        return await self._fetch_all(self._SELECT_ALL, ())
+    
+    async def get_stores_with_available(
+        self,
+        product_id: UUID,
+        min_available: int
+    ) -> List[Dict]:
+        """
+        Get the stores holding at least ``min_available`` of a product.
+        
+        Args:
+            product_id: Product identifier
+            min_available: Minimum available quantity
+        
+        Returns:
+            Stock information per matching store, most available first
+        """
+        return await self._fetch_all(
+            self._SELECT_PRODUCT_AVAILABLE, (str(product_id), min_available)
+        )
+    
+    async def check_availability(
+        self,
+        product_id: UUID,
+        store_id: UUID,
+        required_quantity: int
+    ) -> bool:
+        """
+        Check if required quantity is available.
+        
+        Args:
+            product_id: Product identifier
+            store_id: Store identifier
+            required_quantity: Required quantity
+        
+        Returns:
+            True if available, False otherwise
+        """
+        stock = await self.get_stock(product_id, store_id)
+        if not stock:
+            return False
+        
+        return stock['available'] >= required_quantity
+    
+    async def replace_all(self, entries: List[Dict]) -> None:
+        """
+        Replace every row in one transaction.
+        
+        Args:
+            entries: Dictionaries with product_id, store_id, available,
+                reserved and version
+        """
+        connection = await self._get_connection()
+        await connection.execute(self._CLEAR)
+        await connection.executemany(self._UPSERT, (
+            (
+                str(entry['product_id']), str(entry['store_id']),
+                entry['available'], entry['reserved'],
+                entry['available'] + entry['reserved'], entry['version']
+            )
+            for entry in entries
+        ))
+        await connection.commit()
+    
+    async def clear(self) -> None:
+        """Remove every entry"""
+        connection = await self._get_connection()
+        await connection.execute(self._CLEAR)
+        await connection.commit()
+    
+    async def start(self) -> None:
+        """Nothing to start: every update is committed immediately"""
+    
+    async def flush(self) -> None:
+        """Nothing to flush: every update is committed immediately"""
+    
+    async def stop(self) -> None:
+        """Close the database connection"""
+        if self._connection is not None:
+            await self._connection.close()
+            self._connection = None
+    
+    async def count_entries(self) -> int:
+        """Count product/store cells"""
+        connection = await self._get_connection()
+        async with connection.execute(self._COUNT) as cursor:
+            (entries,) = await cursor.fetchone()
+        return entries
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get read model statistics"""
+        return {'loop_blocking': self._blocking.get_stats()}
@@ -0,0 +1,81 @@
+"""Registry of low-stock thresholds per product and per store"""
+import json
+import os
+from pathlib import Path
+from typing import Dict, Optional
+from uuid import UUID
+
+import aiofiles
+
+
+class ThresholdRegistry:
+    """
+    Low-stock thresholds (reorder points) for product/store cells.
+    
+    A threshold can be set per product or per store; a cell uses its
+    product's threshold if there is one, otherwise its store's. Lookups
+    are dictionary reads, and the registry is saved to one JSON file,
+    replaced atomically on every change.
+    """
+    
+    def __init__(self, storage_path: str = "data/thresholds.json"):
+        """
+        Initialize registry.
+        
+        Args:
+            storage_path: JSON file holding the thresholds
+        """
+        self.storage_path = Path(storage_path)
+        self.storage_path.parent.mkdir(parents=True, exist_ok=True)
+        self._products: Dict[str, int] = {}
+        self._stores: Dict[str, int] = {}
+        if self.storage_path.exists():
+            with open(self.storage_path, 'r') as f:
+                data = json.load(f)
+            self._products = data['products']
+            self._stores = data['stores']
+    
+    def threshold_for(self, product_id: UUID, store_id: UUID) -> Optional[int]:
+        """
+        Get the threshold that applies to a cell.
+        
+        Args:
+            product_id: Product identifier
+            store_id: Store identifier
+        
+        Returns:
+            Threshold, or None if neither the product nor the store has one
+        """
+        threshold = self._products.get(str(product_id))
+        if threshold is None:
+            threshold = self._stores.get(str(store_id))
+        return threshold
+    
+    async def set_product_threshold(self, product_id: UUID, threshold: Optional[int]) -> None:
+        """Set (or remove, with None) the threshold of a product"""
+        self._set(self._products, str(product_id), threshold)
+        await self._save()
+    
+    async def set_store_threshold(self, store_id: UUID, threshold: Optional[int]) -> None:
+        """Set (or remove, with None) the threshold of a store"""
+        self._set(self._stores, str(store_id), threshold)
+        await self._save()
+    
+    @staticmethod
+    def _set(thresholds: Dict[str, int], key: str, threshold: Optional[int]) -> None:
+        """Store or drop one threshold"""
+        if threshold is None:
+            thresholds.pop(key, None)
+        else:
+            thresholds[key] = threshold
+    
+    async def _save(self) -> None:
+        """Atomically replace the registry file"""
+        tmp_path = self.storage_path.with_name(f"{self.storage_path.name}.{os.getpid()}.tmp")
+        async with aiofiles.open(tmp_path, 'w') as f:
+            await f.write(json.dumps({'products': self._products, 'stores': self._stores}))
+        os.replace(tmp_path, self.storage_path)
+    
+    def get_stats(self) -> Dict[str, int]:
+        """Get registry statistics"""
+        return {'products': len(self._products), 'stores': len(self._stores)}
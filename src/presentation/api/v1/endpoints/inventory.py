@@ -1,7 +1,7 @@
 """Inventory API endpoints"""
-from fastapi import APIRouter, HTTPException, status, Depends
+from fastapi import APIRouter, HTTPException, Header, Query, status, Depends
 from uuid import UUID
-from typing import List
+from typing import List, Optional
 
 from ..schemas.inventory_schemas import (
     AddStockRequest,
@@ -10,6 +10,11 @@ from ..schemas.inventory_schemas import (
     ReleaseReservationRequest,
     CheckAvailabilityRequest,
     StockResponse,
+    StockRollupResponse,
+    ReservedProductResponse,
+    SetThresholdRequest,
+    LowStockCellResponse,
+    LowStockFeedResponse,
     AvailabilityResponse,
     ProductInventoryResponse,
 )
@@ -19,6 +24,7 @@ from .....domain.exceptions.inventory_exceptions import (
     ReservationNotFoundError,
     ConcurrencyError,
 )
+from .....infrastructure.persistence.idempotency_store import IdempotencyKeyReusedError
 
 router = APIRouter(prefix="/inventory", tags=["inventory"])
 
@@ -45,6 +51,7 @@ def set_inventory_service(service: InventoryService):
 @router.post("/stock", status_code=status.HTTP_201_CREATED)
 async def add_stock(
     request: AddStockRequest,
+    idempotency_key: Optional[str] = Header(default=None, max_length=255),
     service: InventoryService = Depends(get_inventory_service)
 ):
     """Add stock to inventory"""
@@ -53,9 +60,15 @@ async def add_stock(
             request.product_id,
             request.store_id,
             request.quantity,
-            request.reason
+            request.reason,
+            idempotency_key
         )
         return {"message": "Stock added successfully"}
+    except IdempotencyKeyReusedError as e:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=str(e)
+        )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -66,6 +79,7 @@ async def add_stock(
 @router.post("/reserve", status_code=status.HTTP_201_CREATED)
 async def reserve_stock(
     request: ReserveStockRequest,
+    idempotency_key: Optional[str] = Header(default=None, max_length=255),
     service: InventoryService = Depends(get_inventory_service)
 ):
     """Reserve stock"""
@@ -75,7 +89,8 @@ async def reserve_stock(
             request.store_id,
             request.quantity,
             request.customer_id,
-            request.ttl_minutes
+            request.ttl_minutes,
+            idempotency_key
         )
         return {
             "message": "Stock reserved successfully",
@@ -86,6 +101,11 @@ async def reserve_stock(
             status_code=status.HTTP_409_CONFLICT,
             detail=str(e)
         )
+    except IdempotencyKeyReusedError as e:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=str(e)
+        )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -96,6 +116,7 @@ async def reserve_stock(
 @router.post("/commit", status_code=status.HTTP_200_OK)
 async def commit_reservation(
     request: CommitReservationRequest,
+    idempotency_key: Optional[str] = Header(default=None, max_length=255),
     service: InventoryService = Depends(get_inventory_service)
 ):
     """Commit a reservation"""
@@ -104,7 +125,8 @@ async def commit_reservation(
             request.product_id,
             request.store_id,
             request.reservation_id,
-            request.order_id
+            request.order_id,
+            idempotency_key
         )
         return {"message": "Reservation committed successfully"}
     except ReservationNotFoundError as e:
@@ -112,6 +134,11 @@ async def commit_reservation(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=str(e)
         )
+    except IdempotencyKeyReusedError as e:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=str(e)
+        )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -122,6 +149,7 @@ async def commit_reservation(
 @router.post("/release", status_code=status.HTTP_200_OK)
 async def release_reservation(
     request: ReleaseReservationRequest,
+    idempotency_key: Optional[str] = Header(default=None, max_length=255),
     service: InventoryService = Depends(get_inventory_service)
 ):
     """Release a reservation"""
@@ -130,7 +158,8 @@ async def release_reservation(
             request.product_id,
             request.store_id,
             request.reservation_id,
-            request.reason
+            request.reason,
+            idempotency_key
         )
         return {"message": "Reservation released successfully"}
     except ReservationNotFoundError as e:
@@ -138,6 +167,11 @@ async def release_reservation(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=str(e)
         )
+    except IdempotencyKeyReusedError as e:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=str(e)
+        )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -185,15 +219,152 @@ async def check_availability(
 @router.get("/products/{product_id}", response_model=List[StockResponse])
 async def get_product_inventory(
     product_id: UUID,
+    min_available: Optional[int] = Query(
+        default=None, ge=0, description="Only stores with at least this much available"
+    ),
     service: InventoryService = Depends(get_inventory_service)
 ):
     """Get inventory for a product across all stores"""
-    inventory = await service.get_product_inventory(product_id)
+    inventory = await service.get_product_inventory(product_id, min_available)
     
-    if not inventory:
+    if not inventory and min_available is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Product not found"
         )
     
     return inventory
+
+
+@router.get("/stores/{store_id}", response_model=List[StockResponse])
+async def get_store_inventory(
+    store_id: UUID,
+    service: InventoryService = Depends(get_inventory_service)
+):
+    """Get inventory for every product at a store"""
+    inventory = await service.get_store_inventory(store_id)
+    
+    if not inventory:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Store not found"
+        )
+    
+    return inventory
+
+
+@router.get("/rollups/network", response_model=StockRollupResponse)
+async def get_network_rollup(
+    service: InventoryService = Depends(get_inventory_service)
+):
+    """Get stock totals across every store and product"""
+    return await service.get_network_rollup()
+
+
+@router.get("/rollups/stores/{store_id}", response_model=StockRollupResponse)
+async def get_store_rollup(
+    store_id: UUID,
+    service: InventoryService = Depends(get_inventory_service)
+):
+    """Get stock totals of a store across all products"""
+    rollup = await service.get_store_rollup(store_id)
+    
+    if rollup is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Store not found"
+        )
+    
+    return rollup
+
+
+@router.get("/rollups/products/{product_id}", response_model=StockRollupResponse)
+async def get_product_rollup(
+    product_id: UUID,
+    service: InventoryService = Depends(get_inventory_service)
+):
+    """Get stock totals of a product across all stores"""
+    rollup = await service.get_product_rollup(product_id)
+    
+    if rollup is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Product not found"
+        )
+    
+    return rollup
+
+
+def require_analytics(service: InventoryService) -> None:
+    """Reject analytics requests when the columnar read model is disabled"""
+    if not service.analytics_enabled:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Analytics require numpy to be installed"
+        )
+
+
+@router.get("/analytics/low-stock", response_model=List[StockResponse])
+async def get_low_stock_cells(
+    threshold: int = Query(description="Cells with available stock below this"),
+    limit: Optional[int] = Query(default=None, gt=0, description="Lowest stock cells only"),
+    service: InventoryService = Depends(get_inventory_service)
+):
+    """Get every product/store cell with available stock below a threshold"""
+    require_analytics(service)
+    return await service.get_low_stock_cells(threshold, limit)
+
+
+@router.get("/analytics/top-reserved", response_model=List[ReservedProductResponse])
+async def get_top_reserved_products(
+    limit: int = Query(default=100, gt=0, le=10000),
+    service: InventoryService = Depends(get_inventory_service)
+):
+    """Get the products with the most stock reserved across all stores"""
+    require_analytics(service)
+    return await service.get_top_reserved_products(limit)
+
+
+@router.put("/thresholds/products/{product_id}", status_code=status.HTTP_200_OK)
+async def set_product_threshold(
+    product_id: UUID,
+    request: SetThresholdRequest,
+    service: InventoryService = Depends(get_inventory_service)
+):
+    """Set the low-stock threshold of a product at every store"""
+    await service.set_product_threshold(product_id, request.threshold)
+    return {"message": "Threshold updated successfully"}
+
+
+@router.put("/thresholds/stores/{store_id}", status_code=status.HTTP_200_OK)
+async def set_store_threshold(
+    store_id: UUID,
+    request: SetThresholdRequest,
+    service: InventoryService = Depends(get_inventory_service)
+):
+    """Set the low-stock threshold of every product at a store"""
+    await service.set_store_threshold(store_id, request.threshold)
+    return {"message": "Threshold updated successfully"}
+
+
+@router.get("/low-stock", response_model=List[LowStockCellResponse])
+async def get_below_threshold(
+    limit: int = Query(default=100, gt=0, le=10000),
+    service: InventoryService = Depends(get_inventory_service)
+):
+    """Get the cells furthest below their low-stock threshold"""
+    return await service.get_below_threshold(limit)
+
+
+@router.get("/low-stock/alerts", response_model=LowStockFeedResponse)
+async def get_low_stock_alerts(
+    since: int = Query(default=0, ge=0, description="Last event position already seen"),
+    limit: int = Query(default=1000, gt=0, le=10000),
+    service: InventoryService = Depends(get_inventory_service)
+):
+    """Get the cells that crossed their low-stock threshold after a position"""
+    alerts = await service.get_low_stock_alerts(since, limit)
+    return {
+        "alerts": alerts,
+        "position": alerts[-1]["position"] if alerts else since
+    }
@@ -53,6 +53,49 @@ class StockResponse(BaseModel):
     total: int
 
 
+class StockRollupResponse(BaseModel):
+    """Response with stock totals of a store, a product or the network"""
+    available: int
+    reserved: int
+    total: int
+    cells: int
+
+
+class ReservedProductResponse(BaseModel):
+    """Response with a product's reserved stock across all stores"""
+    product_id: str
+    reserved: int
+
+
+class SetThresholdRequest(BaseModel):
+    """Request to set (or, with null, remove) a low-stock threshold"""
+    threshold: Optional[int] = Field(ge=0, description="Alert below this available stock")
+
+
+class LowStockCellResponse(BaseModel):
+    """Response with a cell below its low-stock threshold"""
+    product_id: str
+    store_id: str
+    available: int
+    threshold: int
+
+
+class LowStockAlertResponse(BaseModel):
+    """Response with a cell that crossed its low-stock threshold"""
+    position: int
+    product_id: str
+    store_id: str
+    available: int
+    threshold: Optional[int]
+    low: bool
+
+
+class LowStockFeedResponse(BaseModel):
+    """Response with threshold crossings after a position"""
+    alerts: List[LowStockAlertResponse]
+    position: int
+
+
 class AvailabilityResponse(BaseModel):
     """Response for availability check"""
     available: bool
@@ -3,6 +3,7 @@ import pytest
 from uuid import uuid4
 from httpx import AsyncClient, ASGITransport
 from main import app
+from src.infrastructure.persistence.columnar_read_model import NUMPY_AVAILABLE
 
 
 @pytest.fixture
@@ -15,6 +16,11 @@ async def client():
             yield ac
 
 
+async def wait_for_projections():
+    """Let the read model catch up with the commands sent so far"""
+    await app.state.projection_runner.catch_up()
+
+
 @pytest.mark.asyncio
 async def test_health_check(client):
     """Test health check endpoint"""
@@ -191,3 +197,109 @@ async def test_release_reservation_flow(client):
         "reason": "customer_cancelled"
     })
     assert response.status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_reserve_with_idempotency_key(client):
+    """Test a retried reservation with the same key is not applied twice"""
+    product_id = str(uuid4())
+    store_id = str(uuid4())
+    await client.post("/api/v1/inventory/stock", json={
+        "product_id": product_id,
+        "store_id": store_id,
+        "quantity": 10,
+        "reason": "restock"
+    })
+    
+    request = {
+        "product_id": product_id,
+        "store_id": store_id,
+        "quantity": 4,
+        "customer_id": str(uuid4())
+    }
+    headers = {"Idempotency-Key": str(uuid4())}
+    first = await client.post("/api/v1/inventory/reserve", json=request, headers=headers)
+    retry = await client.post("/api/v1/inventory/reserve", json=request, headers=headers)
+    
+    assert retry.status_code == 201
+    assert retry.json()["reservation_id"] == first.json()["reservation_id"]
+    
+    await wait_for_projections()
+    response = await client.get(f"/api/v1/inventory/products/{product_id}/stores/{store_id}")
+    assert response.json()["reserved"] == 4
+
+
+@pytest.mark.asyncio
+async def test_get_store_inventory(client):
+    """Test listing every product stocked at a store"""
+    store_id = str(uuid4())
+    product_ids = [str(uuid4()) for _ in range(2)]
+    for product_id in product_ids:
+        await client.post("/api/v1/inventory/stock", json={
+            "product_id": product_id,
+            "store_id": store_id,
+            "quantity": 5,
+            "reason": "restock"
+        })
+    
+    await wait_for_projections()
+    response = await client.get(f"/api/v1/inventory/stores/{store_id}")
+    assert response.status_code == 200
+    assert sorted(s["product_id"] for s in response.json()) == sorted(product_ids)
+    
+    response = await client.get(f"/api/v1/inventory/stores/{uuid4()}")
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_stock_rollups(client):
+    """Test store, product and network rollups follow stock changes"""
+    product_id = str(uuid4())
+    store_id = str(uuid4())
+    before = (await client.get("/api/v1/inventory/rollups/network")).json()
+    await client.post("/api/v1/inventory/stock", json={
+        "product_id": product_id,
+        "store_id": store_id,
+        "quantity": 7,
+        "reason": "restock"
+    })
+    await wait_for_projections()
+    
+    response = await client.get(f"/api/v1/inventory/rollups/products/{product_id}")
+    assert response.status_code == 200
+    assert response.json() == {"available": 7, "reserved": 0, "total": 7, "cells": 1}
+    
+    response = await client.get(f"/api/v1/inventory/rollups/stores/{store_id}")
+    assert response.json()["available"] == 7
+    
+    after = (await client.get("/api/v1/inventory/rollups/network")).json()
+    assert after["total"] - before["total"] == 7
+    
+    response = await client.get(f"/api/v1/inventory/rollups/stores/{uuid4()}")
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_low_stock_analytics(client):
+    """Test the columnar low-stock filter, or its absence without numpy"""
+    product_id = str(uuid4())
+    store_id = str(uuid4())
+    await client.post("/api/v1/inventory/stock", json={
+        "product_id": product_id,
+        "store_id": store_id,
+        "quantity": 3,
+        "reason": "restock"
+    })
+    await wait_for_projections()
+    
+    response = await client.get("/api/v1/inventory/analytics/low-stock", params={"threshold": 4})
+    if not NUMPY_AVAILABLE:
+        assert response.status_code == 503
+        return
+    assert response.status_code == 200
+    assert {"product_id": product_id, "store_id": store_id, "available": 3,
+            "reserved": 0, "total": 3} in response.json()
+    
+    response = await client.get("/api/v1/inventory/analytics/top-reserved", params={"limit": 5})
+    assert response.status_code == 200
+    assert len(response.json()) <= 5
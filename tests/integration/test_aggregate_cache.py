@@ -0,0 +1,55 @@
+"""Integration tests for the command-side aggregate cache"""
+import pytest
+from uuid import uuid4
+from src.application.commands.add_stock import AddStockCommand, AddStockHandler
+from src.domain.events.inventory_events import StockAdded
+from src.infrastructure.cache.aggregate_cache import AggregateCache
+from src.infrastructure.messaging.event_bus import EventBus
+from src.infrastructure.persistence.event_store import EventStore
+from src.infrastructure.persistence.read_model_repository import ReadModelRepository
+
+
+@pytest.fixture
+def handler(tmp_path):
+    """Create an AddStockHandler with an aggregate cache"""
+    return AddStockHandler(
+        EventStore(storage_path=str(tmp_path / "events")),
+        ReadModelRepository(storage_path=str(tmp_path / "read_models")),
+        EventBus(),
+        aggregate_cache=AggregateCache()
+    )
+
+
+@pytest.mark.asyncio
+async def test_back_to_back_commands_skip_replay(handler):
+    """Test a cached aggregate is reused without a rebuild"""
+    product_id, store_id = uuid4(), uuid4()
+    await handler.handle(AddStockCommand(product_id, store_id, 10, "restock"))
+    
+    def fail_rebuild(*args, **kwargs):
+        raise AssertionError("aggregate should come from the cache")
+    
+    handler._rebuild_from_events = fail_rebuild
+    await handler.handle(AddStockCommand(product_id, store_id, 5, "restock"))
+    
+    stock = await handler.read_model_repo.get_stock(product_id, store_id)
+    assert stock['available'] == 15
+    assert handler.aggregate_cache.get_stats()['hits'] == 1
+
+
+@pytest.mark.asyncio
+async def test_stale_cached_aggregate_is_rebuilt(handler):
+    """Test an aggregate behind the event store version is discarded"""
+    product_id, store_id = uuid4(), uuid4()
+    aggregate_id = f"{product_id}:{store_id}"
+    await handler.handle(AddStockCommand(product_id, store_id, 10, "restock"))
+    
+    # Another writer appends behind the cache's back
+    await handler.event_store.append_events(aggregate_id, [
+        StockAdded(aggregate_id=aggregate_id, quantity=7, reason="other", version=2)
+    ], 1)
+    
+    await handler.handle(AddStockCommand(product_id, store_id, 1, "restock"))
+    
+    stock = await handler.read_model_repo.get_stock(product_id, store_id)
+    assert stock['available'] == 18
@@ -0,0 +1,83 @@
+"""Integration tests for the columnar read model"""
+import pytest
+from uuid import uuid4
+
+pytest.importorskip("numpy")
+
+from src.application.commands.add_stock import AddStockCommand, AddStockHandler
+from src.application.commands.reserve_stock import ReserveStockCommand, ReserveStockHandler
+from src.application.projections.inventory_projection import InventoryProjection
+from src.application.projections.projection_runner import ProjectionRunner
+from src.infrastructure.messaging.event_bus import EventBus
+from src.infrastructure.persistence.checkpoint_store import ProjectionCheckpointStore
+from src.infrastructure.persistence.columnar_read_model import ColumnarReadModel
+from src.infrastructure.persistence.event_store import EventStore
+from src.infrastructure.persistence.read_model_repository import ReadModelRepository
+
+
+@pytest.mark.asyncio
+async def test_cells_below_threshold_lowest_first():
+    """Test the vectorized filter returns matching cells by available stock"""
+    columnar = ColumnarReadModel(initial_capacity=2)
+    store_id = uuid4()
+    products = [uuid4() for _ in range(5)]
+    for available, product_id in zip([8, 1, 15, 3, 0], products):
+        columnar.upsert(product_id, store_id, available, 0, 1)
+    columnar.upsert(products[0], store_id, 2, 6, 2)
+    
+    cells = await columnar.cells_below(5)
+    assert [cell['available'] for cell in cells] == [0, 1, 2, 3]
+    assert cells[2] == {
+        'product_id': str(products[0]),
+        'store_id': str(store_id),
+        'available': 2,
+        'reserved': 6,
+        'total': 8,
+        'version': 2,
+    }
+    assert [cell['available'] for cell in await columnar.cells_below(5, limit=2)] == [0, 1]
+    assert columnar.get_stats()['cells'] == 5
+
+
+@pytest.mark.asyncio
+async def test_top_products_by_reserved_sums_stores():
+    """Test products are ranked by reserved stock across all stores"""
+    columnar = ColumnarReadModel()
+    product_a, product_b, product_c = uuid4(), uuid4(), uuid4()
+    store_a, store_b = uuid4(), uuid4()
+    columnar.upsert(product_a, store_a, 0, 5)
+    columnar.upsert(product_a, store_b, 0, 5)
+    columnar.upsert(product_b, store_a, 0, 7)
+    columnar.upsert(product_c, store_b, 0, 1)
+    
+    top = await columnar.top_products_by_reserved(2)
+    assert top == [
+        {'product_id': str(product_a), 'reserved': 10},
+        {'product_id': str(product_b), 'reserved': 7},
+    ]
+    assert len(await columnar.top_products_by_reserved(10)) == 3
+
+
+@pytest.mark.asyncio
+async def test_projection_keeps_columnar_model_in_step(tmp_path):
+    """Test the inventory projection mirrors its writes into the columns"""
+    event_store = EventStore(storage_path=str(tmp_path / "events"))
+    read_model_repo = ReadModelRepository(storage_path=str(tmp_path / "read_models"))
+    args = (event_store, read_model_repo, EventBus())
+    product_id, store_id = uuid4(), uuid4()
+    await AddStockHandler(*args).handle(AddStockCommand(product_id, store_id, 10, "restock"))
+    
+    columnar = ColumnarReadModel()
+    columnar.load(await read_model_repo.get_all_inventory())
+    checkpoint_store = ProjectionCheckpointStore(str(tmp_path / "checkpoints.json"))
+    await checkpoint_store.save({"inventory": 1})
+    runner = ProjectionRunner(
+        event_store, [InventoryProjection(read_model_repo, columnar)], checkpoint_store
+    )
+    await ReserveStockHandler(*args, None, None, None, runner).handle(
+        ReserveStockCommand(product_id, store_id, 8, uuid4())
+    )
+    await runner.catch_up()
+    
+    cells = await columnar.cells_below(5)
+    assert [(cell['available'], cell['reserved']) for cell in cells] == [(2, 8)]
@@ -1,7 +1,11 @@
 """Integration tests for Event Store"""
+import asyncio
+import json
+import multiprocessing
 import pytest
 from uuid import uuid4
 from src.infrastructure.persistence.event_store import EventStore
+from src.infrastructure.persistence.codecs import BinaryEventCodec
 from src.domain.events.inventory_events import StockAdded
 from src.domain.exceptions.inventory_exceptions import ConcurrencyError
 
@@ -61,3 +65,261 @@ async def test_optimistic_locking():
     
     with pytest.raises(ConcurrencyError):
         await event_store.append_events(aggregate_id, [event2], 0)
+
+
+@pytest.mark.asyncio
+async def test_events_are_appended_as_json_lines():
+    """Test each event is stored as one line in the aggregate segment"""
+    event_store = EventStore(storage_path="data/test_events")
+    aggregate_id = f"{uuid4()}:{uuid4()}"
+    
+    for version in (1, 2):
+        event = StockAdded(
+            aggregate_id=aggregate_id,
+            product_id=uuid4(),
+            store_id=uuid4(),
+            quantity=version,
+            reason="test",
+            version=version
+        )
+        await event_store.append_events(aggregate_id, [event], version - 1)
+    
+    lines = event_store._event_file_path(aggregate_id).read_text().splitlines()
+    
+    assert len(lines) == 2
+    assert [e.quantity for e in await event_store.load_events(aggregate_id)] == [1, 2]
+
+
+@pytest.mark.asyncio
+async def test_migrate_legacy_json_files(tmp_path):
+    """Test legacy JSON array files are converted and stay appendable"""
+    event_store = EventStore(storage_path=str(tmp_path))
+    aggregate_id = f"{uuid4()}:{uuid4()}"
+    
+    legacy_event = StockAdded(
+        aggregate_id=aggregate_id,
+        product_id=uuid4(),
+        store_id=uuid4(),
+        quantity=10,
+        reason="legacy",
+        version=1
+    )
+    event_store._legacy_file_path(aggregate_id).write_text(
+        json.dumps([legacy_event.to_dict()], indent=2)
+    )
+    
+    assert len(await event_store.load_events(aggregate_id)) == 1
+    assert await event_store.migrate_legacy_files() == 1
+    assert not event_store._legacy_file_path(aggregate_id).exists()
+    
+    event = StockAdded(
+        aggregate_id=aggregate_id,
+        product_id=uuid4(),
+        store_id=uuid4(),
+        quantity=5,
+        reason="test",
+        version=2
+    )
+    await event_store.append_events(aggregate_id, [event], 1)
+    
+    events = await event_store.load_events(aggregate_id)
+    assert [e.quantity for e in events] == [10, 5]
+
+
+@pytest.mark.asyncio
+async def test_version_checks_do_not_reload_events():
+    """Test appends and version lookups use the in-memory version table"""
+    event_store = EventStore(storage_path="data/test_events")
+    aggregate_id = f"{uuid4()}:{uuid4()}"
+    
+    async def fail_load_events(*args, **kwargs):
+        raise AssertionError("events should not be deserialized")
+    
+    event_store.load_events = fail_load_events
+    
+    for version in (1, 2, 3):
+        event = StockAdded(
+            aggregate_id=aggregate_id,
+            quantity=1,
+            reason="test",
+            version=version
+        )
+        await event_store.append_events(aggregate_id, [event], version - 1)
+    
+    assert await event_store.get_current_version(aggregate_id) == 3
+    assert await EventStore(storage_path="data/test_events").get_current_version(
+        aggregate_id
+    ) == 3
+
+
+@pytest.mark.asyncio
+async def test_group_commit_batches_concurrent_appends(tmp_path):
+    """Test concurrent appends share batches and all become readable"""
+    event_store = EventStore(
+        storage_path=str(tmp_path),
+        group_commit=True,
+        group_commit_window_ms=20,
+        group_commit_max_batch=100
+    )
+    aggregate_ids = [f"{uuid4()}:{uuid4()}" for _ in range(10)]
+    
+    await asyncio.gather(*[
+        event_store.append_events(aggregate_id, [
+            StockAdded(aggregate_id=aggregate_id, quantity=1, reason="test", version=1)
+        ], 0)
+        for aggregate_id in aggregate_ids
+    ])
+    
+    stats = event_store.get_stats()['group_commit']
+    assert stats['batches'] < len(aggregate_ids)
+    for aggregate_id in aggregate_ids:
+        assert len(await EventStore(str(tmp_path)).load_events(aggregate_id)) == 1
+
+
+@pytest.mark.asyncio
+async def test_tail_reads_use_offset_index(tmp_path):
+    """Test tail loads seek via the index and survive a stale index"""
+    event_store = EventStore(storage_path=str(tmp_path))
+    aggregate_id = f"{uuid4()}:{uuid4()}"
+    
+    for version in range(1, 6):
+        event = StockAdded(
+            aggregate_id=aggregate_id,
+            quantity=version,
+            reason="test",
+            version=version
+        )
+        await event_store.append_events(aggregate_id, [event], version - 1)
+    
+    index = event_store._index(aggregate_id)
+    assert index.entry_count() == 5
+    
+    tail = await event_store.load_events(aggregate_id, from_version=3)
+    assert [e.version for e in tail] == [4, 5]
+    
+    # A lost index is rebuilt transparently
+    index.path.unlink()
+    tail = await event_store.load_events(aggregate_id, from_version=4)
+    assert [e.version for e in tail] == [5]
+    assert index.entry_count() == 5
+    assert await event_store.load_events(aggregate_id, from_version=5) == []
+
+
+@pytest.mark.asyncio
+async def test_read_all_returns_events_in_commit_order(tmp_path):
+    """Test the global log spans aggregates and is read in batches"""
+    event_store = EventStore(storage_path=str(tmp_path))
+    aggregate_a = f"{uuid4()}:{uuid4()}"
+    aggregate_b = f"{uuid4()}:{uuid4()}"
+    
+    for version, aggregate_id in enumerate([aggregate_a, aggregate_b, aggregate_a]):
+        expected = await event_store.get_current_version(aggregate_id)
+        event = StockAdded(
+            aggregate_id=aggregate_id,
+            quantity=version,
+            reason="test",
+            version=expected + 1
+        )
+        await event_store.append_events(aggregate_id, [event], expected)
+    
+    first = await event_store.read_all(from_position=0, batch_size=2)
+    assert [r.position for r in first] == [1, 2]
+    assert [r.event.aggregate_id for r in first] == [aggregate_a, aggregate_b]
+    
+    # A fresh store picks up the existing log
+    reopened = EventStore(storage_path=str(tmp_path))
+    rest = await reopened.read_all(from_position=first[-1].position, batch_size=2)
+    assert [(r.position, r.event.quantity) for r in rest] == [(3, 2)]
+    assert await reopened.get_global_position() == 3
+
+
+@pytest.mark.asyncio
+async def test_binary_codec_store(tmp_path):
+    """Test the event store works end to end with the binary codec"""
+    event_store = EventStore(storage_path=str(tmp_path), codec=BinaryEventCodec())
+    aggregate_id = f"{uuid4()}:{uuid4()}"
+    
+    for version in range(1, 4):
+        event = StockAdded(
+            aggregate_id=aggregate_id,
+            product_id=uuid4(),
+            quantity=version,
+            reason="test",
+            version=version
+        )
+        await event_store.append_events(aggregate_id, [event], version - 1)
+    
+    reopened = EventStore(storage_path=str(tmp_path), codec=BinaryEventCodec())
+    
+    assert reopened._event_file_path(aggregate_id).suffix == ".evb"
+    assert await reopened.get_current_version(aggregate_id) == 3
+    tail = await reopened.load_events(aggregate_id, from_version=1)
+    assert [e.quantity for e in tail] == [2, 3]
+    assert [r.position for r in await reopened.read_all()] == [1, 2, 3]
+
+
+@pytest.mark.asyncio
+async def test_sharded_layout_relocates_flat_streams(tmp_path):
+    """Test flat streams stay usable under sharding and relocate online"""
+    aggregate_id = f"{uuid4()}:{uuid4()}"
+    flat_store = EventStore(storage_path=str(tmp_path))
+    event = StockAdded(aggregate_id=aggregate_id, quantity=1, reason="test", version=1)
+    await flat_store.append_events(aggregate_id, [event], 0)
+    
+    sharded = EventStore(storage_path=str(tmp_path), shard_depth=2)
+    assert sharded._event_file_path(aggregate_id).parent == tmp_path
+    
+    assert await sharded.relocate_streams() == 1
+    segment_path = sharded._event_file_path(aggregate_id)
+    assert segment_path.parent == sharded._shard_dir(aggregate_id)
+    assert len(segment_path.parent.relative_to(tmp_path).parts) == 2
+    
+    event = StockAdded(aggregate_id=aggregate_id, quantity=2, reason="test", version=2)
+    await sharded.append_events(aggregate_id, [event], 1)
+    assert [e.quantity for e in await sharded.load_events(aggregate_id)] == [1, 2]
+    assert [a async for a in sharded.iter_aggregate_ids()] == [aggregate_id]
+    assert await sharded.relocate_streams() == 0
+
+
+def _append_from_worker(storage_path: str, aggregate_id: str, count: int) -> None:
+    """Append events one by one from a separate process, retrying conflicts"""
+    async def run() -> None:
+        event_store = EventStore(storage_path=storage_path, multi_process=True)
+        appended = 0
+        while appended < count:
+            version = await event_store.get_current_version(aggregate_id)
+            event = StockAdded(
+                aggregate_id=aggregate_id, quantity=1, reason="worker", version=version + 1
+            )
+            try:
+                await event_store.append_events(aggregate_id, [event], version)
+                appended += 1
+            except ConcurrencyError:
+                continue
+    
+    asyncio.run(run())
+
+
+def test_multi_process_appends_stay_consistent(tmp_path):
+    """Test worker processes sharing a store never lose or reorder events"""
+    aggregate_id = f"{uuid4()}:{uuid4()}"
+    context = multiprocessing.get_context("fork")
+    workers = [
+        context.Process(target=_append_from_worker, args=(str(tmp_path), aggregate_id, 20))
+        for _ in range(4)
+    ]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join(timeout=60)
+        assert worker.exitcode == 0
+    
+    async def verify() -> None:
+        event_store = EventStore(storage_path=str(tmp_path))
+        events = await event_store.load_events(aggregate_id)
+        assert [e.version for e in events] == list(range(1, 81))
+        
+        recorded = await event_store.read_all(batch_size=1000)
+        assert [r.position for r in recorded] == list(range(1, 81))
+    
+    asyncio.run(verify())
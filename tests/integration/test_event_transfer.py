@@ -0,0 +1,81 @@
+"""Integration tests for streaming event export and import"""
+import io
+import pytest
+from uuid import uuid4
+from src.infrastructure.persistence.codecs import BinaryEventCodec, JsonEventCodec
+from src.infrastructure.persistence.event_store import EventStore
+from src.infrastructure.persistence.event_transfer import (
+    export_events,
+    import_events,
+    iter_event_batches,
+)
+from src.infrastructure.persistence.sqlite_event_store import SqliteEventStore
+from src.domain.events.inventory_events import StockAdded
+
+
+async def populate(event_store, aggregate_ids, versions: int) -> None:
+    """Interleave appends across aggregates"""
+    for version in range(1, versions + 1):
+        for aggregate_id in aggregate_ids:
+            event = StockAdded(
+                aggregate_id=aggregate_id,
+                quantity=version,
+                reason="test",
+                version=version
+            )
+            await event_store.append_events(aggregate_id, [event], version - 1)
+
+
+@pytest.mark.asyncio
+async def test_export_to_ndjson_and_import_into_sqlite(tmp_path):
+    """Test a file store can be cloned into the SQLite store"""
+    source = EventStore(storage_path=str(tmp_path / "events"))
+    aggregate_ids = [f"{uuid4()}:{uuid4()}" for _ in range(3)]
+    await populate(source, aggregate_ids, versions=4)
+    
+    stream = io.BytesIO()
+    assert await export_events(source, stream, JsonEventCodec(), batch_size=5) == 12
+    assert stream.getvalue().count(b"\n") == 12
+    
+    target = SqliteEventStore(database_path=str(tmp_path / "events.db"))
+    stream.seek(0)
+    assert await import_events(target, stream, JsonEventCodec(), batch_size=5) == 12
+    
+    for aggregate_id in aggregate_ids:
+        events = await target.load_events(aggregate_id)
+        assert [e.quantity for e in events] == [1, 2, 3, 4]
+    assert await target.get_global_position() == 12
+    await target.close()
+
+
+@pytest.mark.asyncio
+async def test_binary_stream_round_trip(tmp_path):
+    """Test binary exports decode across chunk boundaries"""
+    source = EventStore(storage_path=str(tmp_path / "source"))
+    aggregate_ids = [f"{uuid4()}:{uuid4()}" for _ in range(2)]
+    await populate(source, aggregate_ids, versions=5)
+    
+    codec = BinaryEventCodec()
+    stream = io.BytesIO()
+    await export_events(source, stream, codec)
+    
+    stream.seek(0)
+    batches = list(iter_event_batches(stream, codec, batch_size=4, chunk_size=7))
+    assert [len(batch) for batch in batches] == [4, 4, 2]
+    
+    target = EventStore(storage_path=str(tmp_path / "target"), group_commit=True)
+    stream.seek(0)
+    await import_events(target, stream, codec)
+    await target.close()
+    
+    for aggregate_id in aggregate_ids:
+        assert await target.get_current_version(aggregate_id) == 5
+
+
+def test_truncated_stream_is_rejected():
+    """Test a stream cut mid-record raises instead of dropping events"""
+    event = StockAdded(aggregate_id="a:b", quantity=1, reason="test", version=1)
+    stream = io.BytesIO(JsonEventCodec().encode(event, 1)[:-5])
+    
+    with pytest.raises(ValueError):
+        list(iter_event_batches(stream, JsonEventCodec()))
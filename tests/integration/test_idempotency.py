@@ -0,0 +1,100 @@
+"""Integration tests for command idempotency keys"""
+import asyncio
+import pytest
+from uuid import uuid4
+from src.application.commands.add_stock import AddStockCommand, AddStockHandler
+from src.application.commands.reserve_stock import ReserveStockCommand, ReserveStockHandler
+from src.infrastructure.messaging.event_bus import EventBus
+from src.infrastructure.persistence.event_store import EventStore
+from src.infrastructure.persistence.idempotency_store import (
+    IdempotencyKeyReusedError,
+    IdempotencyStore,
+)
+from src.infrastructure.persistence.read_model_repository import ReadModelRepository
+
+
+def make_handlers(tmp_path, idempotency_store):
+    """Create add/reserve handlers sharing stores"""
+    dependencies = (
+        EventStore(storage_path=str(tmp_path / "events")),
+        ReadModelRepository(storage_path=str(tmp_path / "read_models")),
+        EventBus(),
+    )
+    return (
+        AddStockHandler(*dependencies, idempotency_store=idempotency_store),
+        ReserveStockHandler(*dependencies, idempotency_store=idempotency_store),
+    )
+
+
+@pytest.mark.asyncio
+async def test_retried_reservation_returns_original_result(tmp_path):
+    """Test a retry returns the first reservation without loading the aggregate"""
+    idempotency_store = IdempotencyStore(storage_path=str(tmp_path / "idempotency.jsonl"))
+    add_handler, reserve_handler = make_handlers(tmp_path, idempotency_store)
+    product_id, store_id = uuid4(), uuid4()
+    await add_handler.handle(AddStockCommand(product_id, store_id, 10, "restock"))
+    
+    command = ReserveStockCommand(product_id, store_id, 3, uuid4(), idempotency_key="retry-1")
+    reservation_id = await reserve_handler.handle(command)
+    
+    async def fail_load(*args, **kwargs):
+        raise AssertionError("a retried command must not load the aggregate")
+    
+    reserve_handler._load_inventory = fail_load
+    assert await reserve_handler.handle(command) == reservation_id
+    assert await reserve_handler.event_store.get_current_version(
+        f"{product_id}:{store_id}"
+    ) == 2
+    
+    # The index survives a restart
+    restarted = IdempotencyStore(storage_path=str(tmp_path / "idempotency.jsonl"))
+    _, reserve_handler = make_handlers(tmp_path, restarted)
+    reserve_handler._load_inventory = fail_load
+    assert await reserve_handler.handle(command) == reservation_id
+
+
+@pytest.mark.asyncio
+async def test_concurrent_retries_execute_once(tmp_path):
+    """Test simultaneous attempts with one key run the command once"""
+    idempotency_store = IdempotencyStore(storage_path=str(tmp_path / "idempotency.jsonl"))
+    add_handler, _ = make_handlers(tmp_path, idempotency_store)
+    product_id, store_id = uuid4(), uuid4()
+    command = AddStockCommand(product_id, store_id, 5, "restock", idempotency_key="k")
+    
+    await asyncio.gather(*(add_handler.handle(command) for _ in range(3)))
+    
+    stock = await add_handler.read_model_repo.get_stock(product_id, store_id)
+    assert stock['available'] == 5
+    assert idempotency_store.get_stats()['hits'] == 2
+
+
+@pytest.mark.asyncio
+async def test_key_reuse_with_different_payload_is_rejected(tmp_path):
+    """Test a key cannot be replayed for a different command"""
+    idempotency_store = IdempotencyStore(storage_path=str(tmp_path / "idempotency.jsonl"))
+    add_handler, _ = make_handlers(tmp_path, idempotency_store)
+    product_id, store_id = uuid4(), uuid4()
+    
+    await add_handler.handle(AddStockCommand(product_id, store_id, 5, "restock", "k"))
+    with pytest.raises(IdempotencyKeyReusedError):
+        await add_handler.handle(AddStockCommand(product_id, store_id, 6, "restock", "k"))
+
+
+@pytest.mark.asyncio
+async def test_index_is_bounded_and_expires(tmp_path):
+    """Test capacity eviction and TTL expiry"""
+    idempotency_store = IdempotencyStore(
+        storage_path=str(tmp_path / "idempotency.jsonl"), max_entries=2
+    )
+    for key in ("a", "b", "c"):
+        await idempotency_store.execute(key, "f", lambda: asyncio.sleep(0, result=key))
+    
+    assert await idempotency_store.get("a") is None
+    assert (await idempotency_store.get("c")).result == "c"
+    
+    short_lived = IdempotencyStore(
+        storage_path=str(tmp_path / "short.jsonl"), ttl_seconds=0.01
+    )
+    await short_lived.execute("d", "f", lambda: asyncio.sleep(0, result="d"))
+    await asyncio.sleep(0.02)
+    assert await short_lived.get("d") is None
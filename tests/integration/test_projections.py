@@ -0,0 +1,172 @@
+"""Integration tests for the projection runner"""
+import pytest
+from uuid import uuid4
+from src.application.commands.add_stock import AddStockCommand, AddStockHandler
+from src.application.commands.reserve_stock import ReserveStockCommand, ReserveStockHandler
+from src.application.projections.inventory_projection import InventoryProjection
+from src.application.projections.projection_runner import ProjectionRunner
+from src.application.projections.rebuild import rebuild_read_model
+from src.application.projections.rollup_projection import StockRollupProjection
+from src.infrastructure.messaging.event_bus import EventBus
+from src.infrastructure.persistence.checkpoint_store import ProjectionCheckpointStore
+from src.infrastructure.persistence.event_store import EventStore
+from src.infrastructure.persistence.read_model_repository import ReadModelRepository
+from src.infrastructure.persistence.rollup_repository import StockRollupRepository
+
+
+@pytest.fixture
+def stores(tmp_path):
+    """Create event store, read model and checkpoints in a temporary directory"""
+    event_store = EventStore(storage_path=str(tmp_path / "events"))
+    read_model_repo = ReadModelRepository(storage_path=str(tmp_path / "read_models"))
+    checkpoint_store = ProjectionCheckpointStore(str(tmp_path / "checkpoints.json"))
+    return event_store, read_model_repo, checkpoint_store
+
+
+def make_runner(event_store, read_model_repo, checkpoint_store, **kwargs):
+    """Create a runner maintaining the inventory projection"""
+    return ProjectionRunner(
+        event_store, [InventoryProjection(read_model_repo)], checkpoint_store, **kwargs
+    )
+
+
+@pytest.mark.asyncio
+async def test_handlers_only_append_and_runner_projects(stores):
+    """Test the read model and subscribers are fed by the runner"""
+    event_store, read_model_repo, checkpoint_store = stores
+    event_bus = EventBus()
+    published = []
+    
+    async def record(event):
+        published.append(event.event_type)
+    
+    event_bus.subscribe("StockAdded", record)
+    event_bus.subscribe("StockReserved", record)
+    runner = make_runner(event_store, read_model_repo, checkpoint_store, event_bus=event_bus)
+    args = (event_store, read_model_repo, event_bus, None, None, None, runner)
+    product_id, store_id = uuid4(), uuid4()
+    
+    await AddStockHandler(*args).handle(AddStockCommand(product_id, store_id, 10, "restock"))
+    await ReserveStockHandler(*args).handle(ReserveStockCommand(product_id, store_id, 3, uuid4()))
+    assert await read_model_repo.get_stock(product_id, store_id) is None
+    assert published == []
+    
+    assert await runner.catch_up() == 2
+    stock = await read_model_repo.get_stock(product_id, store_id)
+    assert (stock['available'], stock['reserved'], stock['version']) == (7, 3, 2)
+    assert published == ["StockAdded", "StockReserved"]
+    assert await checkpoint_store.load() == {"inventory": 2}
+
+
+@pytest.mark.asyncio
+async def test_restart_catches_up_from_checkpoint(stores):
+    """Test a new runner resumes after its checkpoint without recounting"""
+    event_store, read_model_repo, checkpoint_store = stores
+    args = (event_store, read_model_repo, EventBus())
+    product_id, store_id = uuid4(), uuid4()
+    
+    await AddStockHandler(*args).handle(AddStockCommand(product_id, store_id, 10, "restock"))
+    await make_runner(event_store, read_model_repo, checkpoint_store).catch_up()
+    
+    await AddStockHandler(*args).handle(AddStockCommand(product_id, store_id, 5, "restock"))
+    runner = make_runner(event_store, read_model_repo, checkpoint_store, batch_size=1)
+    await runner.start()
+    await runner.stop()
+    
+    assert (await read_model_repo.get_stock(product_id, store_id))['available'] == 15
+    assert runner.events_processed == 1
+
+
+@pytest.mark.asyncio
+async def test_redelivered_events_are_skipped(stores):
+    """Test events already reflected in an entry are not applied twice"""
+    event_store, read_model_repo, checkpoint_store = stores
+    product_id, store_id = uuid4(), uuid4()
+    await AddStockHandler(event_store, read_model_repo, EventBus()).handle(
+        AddStockCommand(product_id, store_id, 10, "restock")
+    )
+    
+    runner = make_runner(event_store, read_model_repo, checkpoint_store)
+    await runner.catch_up()
+    # Crash after the read model was written but before the checkpoint
+    await checkpoint_store.save({"inventory": 0})
+    await make_runner(event_store, read_model_repo, checkpoint_store).catch_up()
+    
+    assert (await read_model_repo.get_stock(product_id, store_id))['available'] == 10
+
+
+@pytest.mark.asyncio
+async def test_projection_without_checkpoint_is_rebuilt(stores):
+    """Test a first run discards the read model and replays the whole log"""
+    event_store, read_model_repo, checkpoint_store = stores
+    product_id, store_id = uuid4(), uuid4()
+    await AddStockHandler(event_store, read_model_repo, EventBus()).handle(
+        AddStockCommand(product_id, store_id, 10, "restock")
+    )
+    await read_model_repo.update_stock(uuid4(), store_id, 99, 0)
+    
+    await make_runner(event_store, read_model_repo, checkpoint_store).catch_up()
+    
+    inventory = await read_model_repo.get_store_inventory(store_id)
+    assert [entry['available'] for entry in inventory] == [10]
+
+
+@pytest.mark.asyncio
+async def test_parallel_rebuild_replaces_read_model(stores, tmp_path):
+    """Test a rebuild folds every stream across workers and moves the checkpoint"""
+    event_store, read_model_repo, checkpoint_store = stores
+    args = (event_store, read_model_repo, EventBus())
+    store_id = uuid4()
+    product_ids = [uuid4() for _ in range(5)]
+    for product_id in product_ids:
+        await AddStockHandler(*args).handle(AddStockCommand(product_id, store_id, 10, "restock"))
+        await ReserveStockHandler(*args).handle(
+            ReserveStockCommand(product_id, store_id, 4, uuid4())
+        )
+    
+    rebuilt = ReadModelRepository(storage_path=str(tmp_path / "rebuilt"))
+    await rebuilt.update_stock(uuid4(), store_id, 99, 0)
+    report = await rebuild_read_model(
+        event_store, rebuilt, checkpoint_store, workers=2, partition_size=2
+    )
+    
+    assert (report.aggregates, report.events, report.partitions) == (5, 10, 3)
+    assert report.events_per_second > 0
+    inventory = await rebuilt.get_store_inventory(store_id)
+    assert sorted(entry['product_id'] for entry in inventory) == sorted(map(str, product_ids))
+    assert all((e['available'], e['reserved'], e['version']) == (6, 4, 2) for e in inventory)
+    assert await checkpoint_store.load() == {"inventory": 10}
+    
+    reopened = ReadModelRepository(storage_path=str(tmp_path / "rebuilt"))
+    assert len(await reopened.get_store_inventory(store_id)) == 5
+
+
+@pytest.mark.asyncio
+async def test_rollups_track_store_product_and_network_totals(stores, tmp_path):
+    """Test rollups are updated per event and survive redelivery"""
+    event_store, read_model_repo, checkpoint_store = stores
+    args = (event_store, read_model_repo, EventBus())
+    product_id = uuid4()
+    store_a, store_b = uuid4(), uuid4()
+    await AddStockHandler(*args).handle(AddStockCommand(product_id, store_a, 10, "restock"))
+    await AddStockHandler(*args).handle(AddStockCommand(product_id, store_b, 5, "restock"))
+    await ReserveStockHandler(*args).handle(ReserveStockCommand(product_id, store_a, 4, uuid4()))
+    
+    rollup_path = str(tmp_path / "rollups.json")
+    runner = ProjectionRunner(
+        event_store, [StockRollupProjection(StockRollupRepository(rollup_path))], checkpoint_store
+    )
+    await runner.catch_up()
+    # Crash after the rollups were saved but before the checkpoint
+    await checkpoint_store.save({"rollups": 1})
+    rollup_repo = StockRollupRepository(rollup_path)
+    await ProjectionRunner(
+        event_store, [StockRollupProjection(rollup_repo)], checkpoint_store
+    ).catch_up()
+    
+    assert await rollup_repo.get_product_rollup(product_id) == {
+        'available': 11, 'reserved': 4, 'total': 15, 'cells': 2
+    }
+    assert (await rollup_repo.get_store_rollup(store_a))['reserved'] == 4
+    assert (await rollup_repo.get_network_rollup())['total'] == 15
+    assert await rollup_repo.get_store_rollup(uuid4()) is None
@@ -0,0 +1,112 @@
+"""Integration tests for the write-behind read model"""
+import json
+import pytest
+from uuid import uuid4
+from src.infrastructure.persistence.read_model_repository import ReadModelRepository
+
+
+@pytest.mark.asyncio
+async def test_updates_are_served_from_memory_and_flushed_as_deltas(tmp_path):
+    """Test updates skip the checkpoint file until a checkpoint"""
+    repo = ReadModelRepository(storage_path=str(tmp_path))
+    product_id, store_id = uuid4(), uuid4()
+    
+    await repo.update_stock(product_id, store_id, 10, 2)
+    await repo.update_stock(product_id, store_id, 8, 4)
+    assert (await repo.get_stock(product_id, store_id))['total'] == 12
+    assert not (tmp_path / "inventory.json").exists()
+    
+    await repo.flush()
+    lines = (tmp_path / "inventory.delta.jsonl").read_text().splitlines()
+    assert len(lines) == 1
+    
+    reopened = ReadModelRepository(storage_path=str(tmp_path))
+    assert (await reopened.get_stock(product_id, store_id))['available'] == 8
+
+
+@pytest.mark.asyncio
+async def test_checkpoint_supersedes_delta_log(tmp_path):
+    """Test a checkpoint resets the deltas and stale deltas are ignored"""
+    repo = ReadModelRepository(storage_path=str(tmp_path), checkpoint_threshold=2)
+    product_id = uuid4()
+    store_a, store_b = uuid4(), uuid4()
+    
+    await repo.update_stock(product_id, store_a, 1, 0)
+    await repo.flush()
+    stale_delta = (tmp_path / "inventory.delta.jsonl").read_text()
+    
+    await repo.update_stock(product_id, store_a, 5, 0)
+    await repo.update_stock(product_id, store_b, 7, 0)
+    await repo.flush()
+    assert repo.get_stats()['generation'] == 1
+    assert (tmp_path / "inventory.delta.jsonl").read_text() == ""
+    
+    # A crash between checkpoint and truncation leaves old deltas behind
+    (tmp_path / "inventory.delta.jsonl").write_text(stale_delta)
+    reopened = ReadModelRepository(storage_path=str(tmp_path))
+    assert (await reopened.get_stock(product_id, store_a))['available'] == 5
+    assert len(await reopened.get_product_inventory(product_id)) == 2
+
+
+@pytest.mark.asyncio
+async def test_loads_flat_inventory_file(tmp_path):
+    """Test the pre write-behind inventory.json format is still read"""
+    product_id, store_id = uuid4(), uuid4()
+    (tmp_path / "inventory.json").write_text(json.dumps({
+        f"{product_id}:{store_id}": {
+            'product_id': str(product_id),
+            'store_id': str(store_id),
+            'available': 3,
+            'reserved': 0,
+            'total': 3
+        }
+    }))
+    
+    repo = ReadModelRepository(storage_path=str(tmp_path))
+    assert (await repo.get_stock(product_id, store_id))['available'] == 3
+
+
+@pytest.mark.asyncio
+async def test_product_and_store_indexes(tmp_path):
+    """Test product-wide and store-wide queries use the secondary indexes"""
+    repo = ReadModelRepository(storage_path=str(tmp_path))
+    product_a, product_b = uuid4(), uuid4()
+    store_x, store_y = uuid4(), uuid4()
+    
+    await repo.update_stock(product_a, store_x, 1, 0)
+    await repo.update_stock(product_a, store_y, 2, 0)
+    await repo.update_stock(product_b, store_x, 3, 0)
+    await repo.update_stock(product_b, store_x, 4, 0)
+    
+    assert sorted(e['available'] for e in await repo.get_product_inventory(product_a)) == [1, 2]
+    assert sorted(e['available'] for e in await repo.get_store_inventory(store_x)) == [1, 4]
+    assert await repo.get_store_inventory(uuid4()) == []
+    assert repo.get_stats()['stores'] == 2
+
+
+@pytest.mark.asyncio
+async def test_stores_with_available(tmp_path):
+    """Test filtering a product's stores by available stock"""
+    repo = ReadModelRepository(storage_path=str(tmp_path))
+    product_id = uuid4()
+    for available in (2, 8, 5):
+        await repo.update_stock(product_id, uuid4(), available, 0)
+    
+    matches = await repo.get_stores_with_available(product_id, 5)
+    assert [m['available'] for m in matches] == [8, 5]
+
+
+@pytest.mark.asyncio
+async def test_loop_blocking_is_recorded(tmp_path):
+    """Test each call's time on the event loop is measured and bounded"""
+    repo = ReadModelRepository(storage_path=str(tmp_path))
+    product_id = uuid4()
+    for _ in range(100):
+        await repo.update_stock(product_id, uuid4(), 1, 0)
+    await repo.get_product_inventory(product_id)
+    await repo.stop()
+    
+    blocking = repo.get_stats()['loop_blocking']
+    assert blocking['update_stock']['calls'] == 100
+    assert blocking['update_stock']['max_ms'] < 50
+    assert blocking['checkpoint']['calls'] == 1
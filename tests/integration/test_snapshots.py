@@ -0,0 +1,84 @@
+"""Integration tests for aggregate snapshots"""
+import pytest
+from uuid import uuid4
+from src.application.commands.add_stock import AddStockCommand, AddStockHandler
+from src.application.commands.reserve_stock import ReserveStockCommand, ReserveStockHandler
+from src.application.commands.commit_reservation import (
+    CommitReservationCommand,
+    CommitReservationHandler,
+)
+from src.infrastructure.messaging.event_bus import EventBus
+from src.infrastructure.persistence.event_store import EventStore
+from src.infrastructure.persistence.read_model_repository import ReadModelRepository
+from src.infrastructure.persistence.snapshot_store import SnapshotStore, EveryNEventsPolicy
+
+
+@pytest.fixture
+def stores(tmp_path):
+    """Create event, read model and snapshot stores in a temporary directory"""
+    event_store = EventStore(storage_path=str(tmp_path / "events"))
+    read_model_repo = ReadModelRepository(storage_path=str(tmp_path / "read_models"))
+    snapshot_store = SnapshotStore(
+        storage_path=str(tmp_path / "snapshots"),
+        policy=EveryNEventsPolicy(every_n_events=2)
+    )
+    return event_store, read_model_repo, snapshot_store
+
+
+def test_every_n_events_policy():
+    """Test policy fires when the version crosses a multiple of N"""
+    policy = EveryNEventsPolicy(every_n_events=10)
+    
+    assert not policy.should_snapshot(0, 9)
+    assert policy.should_snapshot(9, 10)
+    assert policy.should_snapshot(8, 12)
+    assert not policy.should_snapshot(10, 19)
+
+
+@pytest.mark.asyncio
+async def test_rebuild_uses_snapshot_and_tail_events(stores):
+    """Test handlers restore from a snapshot and replay only the tail"""
+    event_store, read_model_repo, snapshot_store = stores
+    args = (event_store, read_model_repo, EventBus(), snapshot_store)
+    product_id, store_id = uuid4(), uuid4()
+    aggregate_id = f"{product_id}:{store_id}"
+    
+    await AddStockHandler(*args).handle(
+        AddStockCommand(product_id, store_id, 10, "restock")
+    )
+    reservation_id = await ReserveStockHandler(*args).handle(
+        ReserveStockCommand(product_id, store_id, 4, uuid4())
+    )
+    await AddStockHandler(*args).handle(
+        AddStockCommand(product_id, store_id, 5, "restock")
+    )
+    
+    snapshot = await snapshot_store.load(aggregate_id)
+    assert snapshot.version == 2
+    assert snapshot.available == 6
+    assert len(snapshot.reservations) == 1
+    
+    requested_versions = []
+    load_events = event_store.load_events
+    
+    async def spy_load_events(aggregate_id, from_version=None):
+        requested_versions.append(from_version)
+        return await load_events(aggregate_id, from_version)
+    
+    event_store.load_events = spy_load_events
+    
+    # The reservation only exists in the snapshot, not in the tail
+    await CommitReservationHandler(*args).handle(
+        CommitReservationCommand(product_id, store_id, reservation_id, uuid4())
+    )
+    
+    assert requested_versions == [2]
+    assert await read_model_repo.get_stock(product_id, store_id) == {
+        'product_id': str(product_id),
+        'store_id': str(store_id),
+        'available': 11,
+        'reserved': 0,
+        'total': 11,
+        'version': 4,
+    }
+    assert (await snapshot_store.load(aggregate_id)).version == 4
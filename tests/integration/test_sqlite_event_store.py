@@ -0,0 +1,74 @@
+"""Integration tests for SQLite Event Store"""
+import pytest
+from uuid import uuid4
+from src.infrastructure.persistence.sqlite_event_store import SqliteEventStore
+from src.domain.events.inventory_events import StockAdded, StockReserved
+from src.domain.exceptions.inventory_exceptions import ConcurrencyError
+
+
+@pytest.fixture
+async def event_store(tmp_path):
+    """Create a SQLite event store in a temporary directory"""
+    store = SqliteEventStore(database_path=str(tmp_path / "events.db"))
+    yield store
+    await store.close()
+
+
+@pytest.mark.asyncio
+async def test_append_and_load_events(event_store):
+    """Test appending and loading events"""
+    aggregate_id = f"{uuid4()}:{uuid4()}"
+    
+    events = [
+        StockAdded(aggregate_id=aggregate_id, quantity=10, reason="test", version=1),
+        StockReserved(
+            aggregate_id=aggregate_id,
+            reservation_id=uuid4(),
+            customer_id=uuid4(),
+            quantity=4,
+            version=2
+        ),
+    ]
+    await event_store.append_events(aggregate_id, events, 0)
+    
+    loaded = await event_store.load_events(aggregate_id)
+    
+    assert [e.event_type for e in loaded] == ["StockAdded", "StockReserved"]
+    assert loaded[1].reservation_id == events[1].reservation_id
+    assert await event_store.get_current_version(aggregate_id) == 2
+    assert len(await event_store.load_events(aggregate_id, from_version=1)) == 1
+
+
+@pytest.mark.asyncio
+async def test_optimistic_locking(event_store):
+    """Test optimistic locking detects conflicts"""
+    aggregate_id = f"{uuid4()}:{uuid4()}"
+    
+    event1 = StockAdded(aggregate_id=aggregate_id, quantity=10, reason="t1", version=1)
+    await event_store.append_events(aggregate_id, [event1], 0)
+    
+    event2 = StockAdded(aggregate_id=aggregate_id, quantity=5, reason="t2", version=2)
+    with pytest.raises(ConcurrencyError):
+        await event_store.append_events(aggregate_id, [event2], 0)
+    
+    assert await event_store.get_current_version(aggregate_id) == 1
+
+
+@pytest.mark.asyncio
+async def test_read_all_returns_events_in_commit_order(event_store):
+    """Test the position column serves as the global log"""
+    aggregate_a = f"{uuid4()}:{uuid4()}"
+    aggregate_b = f"{uuid4()}:{uuid4()}"
+    
+    await event_store.append_events(aggregate_a, [
+        StockAdded(aggregate_id=aggregate_a, quantity=1, reason="t", version=1)
+    ], 0)
+    await event_store.append_events(aggregate_b, [
+        StockAdded(aggregate_id=aggregate_b, quantity=2, reason="t", version=1)
+    ], 0)
+    
+    records = await event_store.read_all(from_position=0, batch_size=10)
+    
+    assert [r.event.aggregate_id for r in records] == [aggregate_a, aggregate_b]
+    assert await event_store.read_all(from_position=records[0].position) == records[1:]
+    assert await event_store.get_global_position() == records[-1].position
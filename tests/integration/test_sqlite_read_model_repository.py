@@ -0,0 +1,72 @@
+"""Integration tests for SqliteReadModelRepository"""
+import pytest
+from uuid import uuid4
+from src.application.commands.add_stock import AddStockCommand, AddStockHandler
+from src.infrastructure.messaging.event_bus import EventBus
+from src.infrastructure.persistence.event_store import EventStore
+from src.infrastructure.persistence.sqlite_read_model_repository import (
+    SqliteReadModelRepository,
+)
+
+
+@pytest.fixture
+def repo(tmp_path):
+    """Create a repository in a temporary database"""
+    return SqliteReadModelRepository(database_path=str(tmp_path / "inventory.db"))
+
+
+@pytest.mark.asyncio
+async def test_upsert_and_lookups(repo):
+    """Test updates replace the row and indexed lookups find it"""
+    product_id, store_id = uuid4(), uuid4()
+    
+    await repo.update_stock(product_id, store_id, 10, 0)
+    await repo.update_stock(product_id, store_id, 7, 3, version=2)
+    
+    assert await repo.get_stock(product_id, store_id) == {
+        'product_id': str(product_id),
+        'store_id': str(store_id),
+        'available': 7,
+        'reserved': 3,
+        'total': 10,
+        'version': 2
+    }
+    assert len(await repo.get_product_inventory(product_id)) == 1
+    assert len(await repo.get_store_inventory(store_id)) == 1
+    assert await repo.get_stock(uuid4(), store_id) is None
+    assert await repo.check_availability(product_id, store_id, 7)
+    assert await repo.count_entries() == 1
+
+
+@pytest.mark.asyncio
+async def test_stores_with_available_range_query(repo):
+    """Test the range query uses the (product_id, available) index"""
+    product_id = uuid4()
+    for available in (1, 5, 9):
+        await repo.update_stock(product_id, uuid4(), available, 0)
+    await repo.update_stock(uuid4(), uuid4(), 50, 0)
+    
+    matches = await repo.get_stores_with_available(product_id, 5)
+    assert [m['available'] for m in matches] == [9, 5]
+    
+    connection = await repo._get_connection()
+    async with connection.execute(
+        "EXPLAIN QUERY PLAN " + repo._SELECT_PRODUCT_AVAILABLE, (str(product_id), 5)
+    ) as cursor:
+        plan = await cursor.fetchall()
+    assert "idx_inventory_product_available" in " ".join(row[3] for row in plan)
+
+
+@pytest.mark.asyncio
+async def test_handlers_accept_sqlite_read_model(tmp_path, repo):
+    """Test the repository is a drop-in read model for command handlers"""
+    handler = AddStockHandler(
+        EventStore(storage_path=str(tmp_path / "events")), repo, EventBus()
+    )
+    product_id, store_id = uuid4(), uuid4()
+    
+    await handler.handle(AddStockCommand(product_id, store_id, 4, "restock"))
+    await repo.stop()
+    
+    reopened = SqliteReadModelRepository(database_path=str(tmp_path / "inventory.db"))
+    assert (await reopened.get_stock(product_id, store_id))['available'] == 4
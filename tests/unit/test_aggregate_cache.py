@@ -0,0 +1,52 @@
+"""Unit tests for AggregateCache"""
+from uuid import uuid4
+from src.domain.entities.inventory import Inventory
+from src.infrastructure.cache.aggregate_cache import AggregateCache
+
+
+def make_inventory(reservations: int = 0) -> Inventory:
+    """Create an inventory with the given number of open reservations"""
+    inventory = Inventory(product_id=uuid4(), store_id=uuid4())
+    inventory.add_stock(100, "restock")
+    for _ in range(reservations):
+        inventory.reserve_stock(1, uuid4())
+    inventory.clear_events()
+    return inventory
+
+
+def test_take_checks_out_entry():
+    """Test taking an aggregate removes it until it is put back"""
+    cache = AggregateCache()
+    inventory = make_inventory()
+    cache.put("a", inventory)
+    
+    assert cache.take("a") is inventory
+    assert cache.take("a") is None
+    assert cache.get_stats()['hits'] == 1
+    assert cache.get_stats()['misses'] == 1
+
+
+def test_lru_eviction_by_size():
+    """Test least recently used aggregate is evicted at capacity"""
+    cache = AggregateCache(max_size=2)
+    cache.put("a", make_inventory())
+    cache.put("b", make_inventory())
+    cache.put("a", cache.take("a"))
+    cache.put("c", make_inventory())
+    
+    assert cache.take("b") is None
+    assert cache.take("a") is not None
+    assert cache.get_stats()['evictions'] == 1
+
+
+def test_eviction_by_weight_and_trim():
+    """Test weight bound and explicit trimming"""
+    cache = AggregateCache(max_weight=5)
+    cache.put("a", make_inventory(reservations=2))
+    cache.put("b", make_inventory(reservations=2))
+    
+    assert cache.get_stats()['size'] == 1
+    
+    cache.put("c", make_inventory())
+    assert cache.trim(0) == 2
+    assert cache.get_stats()['weight'] == 0
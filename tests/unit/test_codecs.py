@@ -0,0 +1,86 @@
+"""Unit tests for event codecs"""
+import pytest
+from datetime import datetime, timedelta
+from uuid import uuid4
+from src.domain.events.inventory_events import StockAdded, StockReserved
+from src.infrastructure.persistence.codecs import (
+    BinaryEventCodec,
+    JsonEventCodec,
+    default_registry,
+    get_codec,
+)
+
+
+def make_reserved() -> StockReserved:
+    """Create a fully populated StockReserved event"""
+    return StockReserved(
+        aggregate_id="p:s",
+        product_id=uuid4(),
+        store_id=uuid4(),
+        reservation_id=uuid4(),
+        customer_id=uuid4(),
+        quantity=3,
+        expires_at=datetime(2030, 1, 1, 12, 30, 15, 123456),
+        version=7,
+    )
+
+
+@pytest.mark.parametrize("codec", [JsonEventCodec(), BinaryEventCodec()])
+def test_round_trip(codec):
+    """Test events survive encoding with and without a position"""
+    event = make_reserved()
+    
+    assert codec.decode(codec.encode(event)) == (None, event)
+    assert codec.decode(codec.encode(event, position=42)) == (42, event)
+
+
+@pytest.mark.parametrize("codec", [JsonEventCodec(), BinaryEventCodec()])
+def test_none_fields_and_torn_records(codec):
+    """Test None values round trip and a partial trailing record is skipped"""
+    event = StockAdded(aggregate_id="p:s", quantity=1, reason="ação", version=1)
+    content = codec.encode(event) + codec.encode(event)
+    
+    records = codec.decode_all(content + codec.encode(event)[:-1])
+    
+    assert [e for _, e in records] == [event, event]
+    assert event.product_id is None
+    assert codec.record_offsets(content, base=10) == [10, 10 + len(content) // 2]
+
+
+def test_binary_records_are_smaller():
+    """Test the binary layout is more compact than JSON"""
+    event = make_reserved()
+    
+    assert len(BinaryEventCodec().encode(event)) < len(JsonEventCodec().encode(event)) / 2
+
+
+def test_registry_and_lookup():
+    """Test registry exposes stable type ids and rejects duplicates"""
+    assert default_registry.by_name("StockReserved").type_id == 2
+    assert default_registry.by_id(1).event_class is StockAdded
+    
+    with pytest.raises(ValueError):
+        default_registry.register(StockAdded, 1)
+    with pytest.raises(ValueError):
+        get_codec("xml")
+    
+    assert isinstance(get_codec("binary"), BinaryEventCodec)
+
+
+def test_compiled_json_decoder():
+    """Test generated decoders build typed events without mutating input"""
+    codec = JsonEventCodec()
+    event = make_reserved()
+    event_dict = event.to_dict()
+    snapshot = dict(event_dict)
+    
+    decoded = codec.from_dict(event_dict)
+    
+    assert decoded == event
+    assert isinstance(decoded.expires_at, datetime)
+    assert event_dict == snapshot
+    assert codec._decoders["StockReserved"].__name__ == "decode_StockReserved"
+    
+    # Records missing optional fields fall back to the dataclass defaults
+    del event_dict["expires_at"]
+    assert codec.from_dict(event_dict).expires_at is None